@@ -0,0 +1,105 @@
+"""
+fetch_load.py
+Load test of the Binance fetch layer against the local fake server.
+
+Starts spectre.fake_binance with the given latency and weight limit, points
+SPECTRE_BINANCE_BASE_URL at it, and fetches `--lookback-days` of candles for
+`--symbols` synthetic symbols from `--workers` threads. It reports throughput,
+the status codes the server returned, and how many symbols failed. No network
+access is needed. The client's weight limiter is given the server's limit and
+window, unless --no-limiter is passed to compare against unpaced fetching:
+
+    python benchmarks/fetch_load.py --symbols 200 --workers 16 --latency-ms 30 --weight-limit 1200
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from spectre.binance_public import BINANCE_BASE_URL_ENV, fetch_candle_series
+from spectre.fake_binance import FakeBinanceConfig, FakeBinanceServer
+from spectre.rate_limit import WeightLimiter, set_shared_limiter
+
+
+def run(n_symbols: int, lookback_days: int, workers: int, config: FakeBinanceConfig) -> Dict[str, Any]:
+    symbols = [f"S{k:04d}USDT" for k in range(n_symbols)]
+    errors: List[str] = []
+
+    def fetch(symbol: str) -> int:
+        try:
+            return len(fetch_candle_series(symbol, lookback_days))
+        except Exception as e:  # noqa: BLE001 - counted and reported
+            errors.append(f"{symbol}: {e}")
+            return 0
+
+    saved = os.environ.get(BINANCE_BASE_URL_ENV)
+    with FakeBinanceServer(config) as server:
+        os.environ[BINANCE_BASE_URL_ENV] = server.base_url
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                bars = sum(pool.map(fetch, symbols))
+            elapsed = time.perf_counter() - start
+        finally:
+            if saved is None:
+                os.environ.pop(BINANCE_BASE_URL_ENV, None)
+            else:
+                os.environ[BINANCE_BASE_URL_ENV] = saved
+        stats = server.stats
+    requests_made = sum(stats["requests"].values())
+    return {
+        "symbols": n_symbols,
+        "workers": workers,
+        "elapsed_s": elapsed,
+        "requests": requests_made,
+        "requests_per_s": requests_made / elapsed if elapsed > 0 else 0.0,
+        "bars": bars,
+        "status": dict(sorted(stats["status"].items())),
+        "max_in_flight": stats["max_in_flight"],
+        "failed_symbols": len(errors),
+        "first_error": errors[0] if errors else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the Binance fetch layer against a local fake server")
+    parser.add_argument("--symbols", type=int, default=100, help="Number of synthetic symbols to fetch")
+    parser.add_argument("--lookback-days", type=int, default=365)
+    parser.add_argument("--workers", type=int, default=8, help="Fetch threads")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--weight-limit", type=int, default=6000, help="Request weight per window (0 = unlimited)")
+    parser.add_argument("--window-s", type=float, default=60.0)
+    parser.add_argument("--no-limiter", action="store_true", help="Fetch without the client-side weight limiter")
+    args = parser.parse_args(argv)
+
+    config = FakeBinanceConfig(
+        latency_s=args.latency_ms / 1000.0,
+        jitter_s=args.jitter_ms / 1000.0,
+        weight_limit=args.weight_limit or None,
+        window_s=args.window_s,
+        history_bars=max(args.lookback_days + 10, 100),
+    )
+    if args.no_limiter or not args.weight_limit:
+        set_shared_limiter(None)
+    else:
+        set_shared_limiter(WeightLimiter(args.weight_limit, window_s=args.window_s))
+    report = run(args.symbols, args.lookback_days, args.workers, config)
+    print(f"{report['symbols']} symbols, {report['workers']} workers: {report['elapsed_s']:.2f}s, "
+          f"{report['requests']} requests ({report['requests_per_s']:.1f}/s), max {report['max_in_flight']} in flight")
+    print(f"Status codes: {report['status']}")
+    if report["failed_symbols"]:
+        print(f"FAILED: {report['failed_symbols']} symbol(s), e.g. {report['first_error']}")
+        return 1
+    print("FETCH LOAD OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
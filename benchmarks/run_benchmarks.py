@@ -0,0 +1,249 @@
+"""
+run_benchmarks.py
+Timing benchmarks for every pipeline pass on synthetic universes.
+
+Generates deterministic candles for each (symbols, bars) combination and
+times the facts, decision, execution-plan and simulator functions. Network
+calls in build_execution_plan are replaced with fixed prices and rules, as
+in tests/_helpers.py. Results are written as JSON so runs can be compared
+across commits:
+
+    python benchmarks/run_benchmarks.py --symbols 10,100 --bars 30,300 --out bench_before.json
+    python benchmarks/run_benchmarks.py --symbols 10,100 --bars 30,300 --compare bench_before.json
+
+With --compare, exits 1 if any case is slower than the baseline by more
+than --threshold (default 0.20, i.e. 20%). --workers N adds process-pool
+cases for the per-symbol vols and the correlation matrix (spectre.parallel),
+named e.g. compute_correlation_matrix[workers=8].
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+import spectre.execution_plan as ep
+from spectre.artifact_io import load_json, write_json
+from spectre.candles import CandleSeries
+from spectre.compute import compute_correlation, compute_correlation_matrix, compute_realised_vol_annualised
+from spectre.decision_rules import build_decision_packet
+from spectre.facts_pack import build_facts_pack
+from spectre.parallel import map_series
+from spectre.simulator_stub import simulate_execution_plan
+
+RESULTS_VERSION = 1
+DEFAULT_SYMBOLS = "10,100"
+DEFAULT_BARS = "30,300"
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.20
+DAY_MS = 86_400_000
+START_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+
+
+def synthetic_universe(n_symbols: int, n_bars: int, seed: int = 0) -> Dict[str, CandleSeries]:
+    """
+    Daily candles for `n_symbols` symbols with `n_bars` returns each
+    (n_bars + 1 candles): one market factor plus idiosyncratic noise, so the
+    correlation matrix is realistic rather than diagonal.
+    """
+    rng = random.Random(seed)
+    market = [rng.gauss(0, 0.02) for _ in range(n_bars)]
+    times = [START_MS + i * DAY_MS for i in range(n_bars + 1)]
+    universe = {}
+    for k in range(n_symbols):
+        beta = 0.5 + rng.random()
+        noise = 0.01 + 0.02 * rng.random()
+        price = 10.0 + 100.0 * rng.random()
+        closes = [price]
+        for m in market:
+            price *= math.exp(beta * m + rng.gauss(0, noise))
+            closes.append(price)
+        universe[f"S{k:04d}USDT"] = CandleSeries(
+            times, closes, [c * 1.01 for c in closes], [c * 0.99 for c in closes], closes, [1000.0] * len(closes)
+        )
+    return universe
+
+
+@contextlib.contextmanager
+def offline_execution_plan(prices: Dict[str, float]) -> Iterator[None]:
+    """Serve build_execution_plan fixed prices and exchange rules instead of calling Binance."""
+    def fake_fetch_ticker_prices():
+        return dict(prices)
+
+    def fake_fetch_exchange_info(symbols):
+        return {
+            s: {"step_size": 1e-8, "min_qty": 1e-8, "min_notional": 5.0, "base_asset": s[:-4], "quote_asset": "USDT"}
+            for s in symbols
+        }
+
+    saved = ep.fetch_ticker_prices, ep.fetch_exchange_info
+    ep.fetch_ticker_prices = fake_fetch_ticker_prices
+    ep.fetch_exchange_info = fake_fetch_exchange_info
+    try:
+        yield
+    finally:
+        ep.fetch_ticker_prices, ep.fetch_exchange_info = saved
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> Tuple[List[float], Any]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def bench_case(n_symbols: int, n_bars: int, repeat: int = DEFAULT_REPEAT, workers: int = 1) -> List[Dict[str, Any]]:
+    """Time each pass once per repeat on one synthetic universe; returns one row per function."""
+    universe = synthetic_universe(n_symbols, n_bars)
+    symbols = list(universe)
+    rows: List[Dict[str, Any]] = []
+
+    def record(name: str, fn: Callable[[], Any]) -> Any:
+        timings, result = _time(fn, repeat)
+        rows.append({
+            "case": name,
+            "symbols": n_symbols,
+            "bars": n_bars,
+            "best_s": min(timings),
+            "median_s": statistics.median(timings),
+        })
+        return result
+
+    vols = record("compute_realised_vol_annualised", lambda: {s: compute_realised_vol_annualised(c) for s, c in universe.items()})
+    corr_symbols, corr_matrix, sample_size = record("compute_correlation_matrix", lambda: compute_correlation_matrix(universe))
+    if workers > 1:
+        record(f"compute_realised_vol_annualised[workers={workers}]",
+               lambda: map_series(compute_realised_vol_annualised, universe, workers))
+        record(f"compute_correlation_matrix[workers={workers}]", lambda: compute_correlation(universe, workers=workers))
+    facts = record("build_facts_pack", lambda: build_facts_pack(
+        symbols, n_bars, universe, vols, corr_symbols, corr_matrix, sample_size, as_of_utc="2024-01-01T00:00:00Z"
+    ))
+    decision = record("build_decision_packet", lambda: build_decision_packet(facts))
+
+    # Force an actionable decision so the plan does the full per-symbol work.
+    decision = dict(decision, strategy_mode="trend", allowed_symbols=symbols, blocked_symbols=[], max_gross_exposure=1.0)
+    budget = 10.0 * n_symbols
+    prices = {s: universe[s].c[-1] for s in symbols}
+    saved_budget = os.environ.get("SPECTRE_BUDGET_QUOTE")
+    os.environ["SPECTRE_BUDGET_QUOTE"] = str(budget)
+    try:
+        with offline_execution_plan(prices):
+            plan = record("build_execution_plan", lambda: ep.build_execution_plan(facts, decision, "facts.json", "decision.json"))
+    finally:
+        if saved_budget is None:
+            os.environ.pop("SPECTRE_BUDGET_QUOTE", None)
+        else:
+            os.environ["SPECTRE_BUDGET_QUOTE"] = saved_budget
+    record("simulate_execution_plan", lambda: simulate_execution_plan(plan, {"balances": {"USDT": budget}}))
+    return rows
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(symbol_counts: List[int], bar_counts: List[int], repeat: int = DEFAULT_REPEAT, log: Callable[[str], None] = print,
+        workers: int = 1) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    for n_symbols in symbol_counts:
+        for n_bars in bar_counts:
+            log(f"Benchmarking {n_symbols} symbols x {n_bars} bars ...")
+            results.extend(bench_case(n_symbols, n_bars, repeat, workers))
+    return {
+        "version": RESULTS_VERSION,
+        "created_utc": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "workers": workers,
+        "results": results,
+    }
+
+
+def _key(row: Dict[str, Any]) -> Tuple[str, int, int]:
+    return row["case"], row["symbols"], row["bars"]
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Match rows by (case, symbols, bars) and compare best times. Returns one
+    row per matched case with the ratio current / baseline and whether it
+    regressed by more than `threshold`.
+    """
+    base = {_key(r): r for r in baseline.get("results", [])}
+    rows = []
+    for r in current["results"]:
+        b = base.get(_key(r))
+        if b is None or b["best_s"] <= 0:
+            continue
+        ratio = r["best_s"] / b["best_s"]
+        rows.append({**r, "baseline_s": b["best_s"], "ratio": ratio, "regressed": ratio > 1.0 + threshold})
+    return rows
+
+
+def _int_list(text: str) -> List[int]:
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time every pipeline pass on synthetic universes")
+    parser.add_argument("--symbols", default=DEFAULT_SYMBOLS, help=f"Comma-separated symbol counts (default: {DEFAULT_SYMBOLS})")
+    parser.add_argument("--bars", default=DEFAULT_BARS, help=f"Comma-separated return counts per symbol (default: {DEFAULT_BARS})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Runs per case; the best time is compared")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Also time the process-pool vol and correlation paths with this many workers")
+    parser.add_argument("--out", default=None, help="Write results JSON here")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before a case counts as a regression (default: 0.20 = 20%%)")
+    args = parser.parse_args(argv)
+
+    bars = _int_list(args.bars)
+    if min(bars) < 30:
+        print("--bars must be at least 30 (the correlation pass needs 30 returns)")
+        return 2
+    report = run(_int_list(args.symbols), bars, args.repeat, workers=args.workers)
+
+    if args.out:
+        write_json(args.out, report)
+        print(f"Results written to {args.out}")
+
+    print(f"{'case':<44} {'symbols':>7} {'bars':>6} {'best ms':>10} {'median ms':>10}")
+    for r in report["results"]:
+        print(f"{r['case']:<44} {r['symbols']:>7} {r['bars']:>6} {r['best_s'] * 1000:>10.2f} {r['median_s'] * 1000:>10.2f}")
+
+    if args.compare:
+        rows = compare(report, load_json(args.compare), args.threshold)
+        regressions = [r for r in rows if r["regressed"]]
+        print(f"\nCompared {len(rows)} case(s) with {args.compare} (threshold {args.threshold:.0%})")
+        for r in rows:
+            flag = "REGRESSION" if r["regressed"] else ""
+            print(f"{r['case']:<44} {r['symbols']:>7} {r['bars']:>6} {r['ratio']:>8.2f}x {flag}")
+        if regressions:
+            print(f"BENCHMARK REGRESSION: {len(regressions)} case(s) slower than baseline")
+            return 1
+        print("BENCHMARKS OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
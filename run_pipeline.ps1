@@ -16,26 +16,18 @@ if ($LASTEXITCODE -ne 0 -or -not $pythonPrefix -or $pythonPrefix.Trim() -ne $env
     Write-Error "ERROR: venv not active. Run: & .\\.venv\\Scripts\\Activate.ps1"; exit 1
 }
 
-# 3. Run pipeline steps, stop on error
-Write-Host "[1/4] Validating examples..."
-python .\scripts\validate_examples.py
-if ($LASTEXITCODE -ne 0) { exit $LASTEXITCODE }
-
-Write-Host "[2/4] Building facts_pack.json..."
+# 3. Run all passes in a single process, stop on error
 $env:PYTHONPATH = "src"
-python .\scripts\build_facts_pack.py --symbols BTCUSDT,ETHUSDT --lookback-days 365 --out artifacts\facts_pack.json
-if ($LASTEXITCODE -ne 0) { exit $LASTEXITCODE }
-
-Write-Host "[3/4] Building decision_packet.json..."
-python .\scripts\build_decision_packet.py --in artifacts\facts_pack.json --out artifacts\decision_packet.json
-if ($LASTEXITCODE -ne 0) { exit $LASTEXITCODE }
-
-Write-Host "[4/4] Building execution_plan.json..."
-python .\scripts\build_execution_plan.py --facts artifacts\facts_pack.json --decision artifacts\decision_packet.json --out artifacts\execution_plan.json
+# Set $env:SPECTRE_SCREEN_TOP to screen the exchange and run on the N most liquid USDT symbols instead
+if ($env:SPECTRE_SCREEN_TOP) {
+    $symbolArgs = @("--screen-top", $env:SPECTRE_SCREEN_TOP)
+} else {
+    $symbolArgs = @("--symbols", "BTCUSDT,ETHUSDT")
+}
+python -m spectre.pipeline @symbolArgs --lookback-days 365 --out-dir artifacts
 if ($LASTEXITCODE -ne 0) { exit $LASTEXITCODE }
 
 # 4. Print summary
-Write-Host "`nPIPELINE OK`n" -ForegroundColor Green
 Write-Host "Artifacts in artifacts/:"
 Get-ChildItem -File -Path artifacts | Select-Object Name,Length,LastWriteTime | Format-Table
 
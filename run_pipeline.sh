@@ -12,27 +12,19 @@ export PYTHONPATH="src"
 
 # Optionally set SPECTRE_BUDGET_QUOTE to override the default budget (e.g., SPECTRE_BUDGET_QUOTE=8 ./run_pipeline.sh)
 
-echo "[1/4] Validating examples..."
-python scripts/validate_examples.py
-
-echo "[2/4] Building facts_pack.json..."
-python scripts/build_facts_pack.py \
-  --symbols BTCUSDT,ETHUSDT \
+# Optionally set SPECTRE_SCREEN_TOP to screen the exchange and run on the N most liquid USDT symbols
+# instead of BTCUSDT,ETHUSDT (e.g., SPECTRE_SCREEN_TOP=10 ./run_pipeline.sh)
+if [ -n "${SPECTRE_SCREEN_TOP:-}" ]; then
+  SYMBOL_ARGS=(--screen-top "$SPECTRE_SCREEN_TOP")
+else
+  SYMBOL_ARGS=(--symbols BTCUSDT,ETHUSDT)
+fi
+
+# All passes run in one process; artifacts are passed in memory and written once at the end.
+python -m spectre.pipeline \
+  "${SYMBOL_ARGS[@]}" \
   --lookback-days 365 \
-  --out artifacts/facts_pack.json
-
-echo "[3/4] Building decision_packet.json..."
-python scripts/build_decision_packet.py \
-  --in artifacts/facts_pack.json \
-  --out artifacts/decision_packet.json
+  --out-dir artifacts
 
-echo "[4/4] Building execution_plan.json..."
-python scripts/build_execution_plan.py \
-  --facts artifacts/facts_pack.json \
-  --decision artifacts/decision_packet.json \
-  --out artifacts/execution_plan.json
-
-echo
-echo "PIPELINE OK"
 echo
 ls -la artifacts
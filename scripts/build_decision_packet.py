@@ -3,57 +3,60 @@ build_decision_packet.py
 Builds a deterministic decision packet from a facts pack.
 """
 import argparse
-import json
 import sys
-import os
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
+from spectre.artifact_io import load_json, write_json
 from spectre.decision_rules import build_decision_packet
+from spectre.models import FactsPack
+from spectre.schema_registry import get_validator, validate_decision_packet, DECISION_PACKET
+from spectre.profiling import profile_pass
+from spectre.telemetry import collect, format_summary
 
 def main():
     parser = argparse.ArgumentParser(description="Build deterministic decision packet.")
     parser.add_argument("--in", dest="in_path", required=True, help="Input facts pack JSON path")
     parser.add_argument("--out", dest="out_path", required=True, help="Output decision packet JSON path")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print per-stage timings and add them as the packet's telemetry section")
     args = parser.parse_args()
 
-    # Load facts pack
-    try:
-        with open(args.in_path, "r", encoding="utf-8") as f:
-            facts_pack = json.load(f)
-    except Exception as e:
-        print(f"ERROR: Failed to load facts pack: {e}", file=sys.stderr)
-        sys.exit(1)
+    with collect(args.profile) as profile, profile_pass("build_decision_packet"):
+        # Load facts pack
+        try:
+            facts_pack = load_json(args.in_path, FactsPack)
+        except Exception as e:
+            print(f"ERROR: Failed to load facts pack: {e}", file=sys.stderr)
+            sys.exit(1)
 
-    # Build decision packet
-    try:
-        decision_packet = build_decision_packet(facts_pack)
-    except Exception as e:
-        print(f"ERROR: Failed to build decision packet: {e}", file=sys.stderr)
-        sys.exit(1)
+        # Build decision packet
+        try:
+            decision_packet = build_decision_packet(facts_pack)
+        except Exception as e:
+            print(f"ERROR: Failed to build decision packet: {e}", file=sys.stderr)
+            sys.exit(1)
 
-    # Load schema
-    schema_path = os.path.join(os.path.dirname(__file__), "..", "schemas", "decision_packet.schema.json")
-    schema_path = os.path.abspath(schema_path)
-    try:
-        with open(schema_path, "r", encoding="utf-8") as f:
-            schema = json.load(f)
-    except Exception as e:
-        print(f"ERROR: Failed to load schema: {e}", file=sys.stderr)
-        sys.exit(1)
+        # Load schema (compiled once by the registry)
+        try:
+            get_validator(DECISION_PACKET)
+        except Exception as e:
+            print(f"ERROR: Failed to load schema: {e}", file=sys.stderr)
+            sys.exit(1)
 
-    # Validate
-    try:
-        validate(instance=decision_packet, schema=schema)
-    except ValidationError as e:
-        print(f"ERROR: Decision packet validation failed: {e.message}", file=sys.stderr)
-        sys.exit(2)
+        # Validate
+        try:
+            validate_decision_packet(decision_packet)
+        except ValidationError as e:
+            print(f"ERROR: Decision packet validation failed: {e.message}", file=sys.stderr)
+            sys.exit(2)
 
-    # Write output
-    try:
-        with open(args.out_path, "w", encoding="utf-8") as f:
-            json.dump(decision_packet, f, indent=2, ensure_ascii=False)
-    except Exception as e:
-        print(f"ERROR: Failed to write output: {e}", file=sys.stderr)
-        sys.exit(1)
+        # Write output
+        if profile is not None:
+            decision_packet["telemetry"] = profile.summary()
+        try:
+            write_json(args.out_path, decision_packet)
+        except Exception as e:
+            print(f"ERROR: Failed to write output: {e}", file=sys.stderr)
+            sys.exit(1)
 
     # Print summary
     print("DECISION PACKET VALID")
@@ -62,6 +65,9 @@ def main():
     print(f"Strategy mode: {decision_packet['strategy_mode']}")
     print(f"Allowed symbols: {decision_packet['allowed_symbols']}")
     print(f"Blocked symbols: {decision_packet['blocked_symbols']}")
+    if profile is not None:
+        for line in format_summary(profile.summary()):
+            print(line)
 
 if __name__ == "__main__":
     main()
@@ -1,50 +1,71 @@
 import argparse
-import json
 import os
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from spectre import execution_plan
+from spectre.artifact_io import load_json, write_json
+from spectre.models import DecisionPacket, FactsPack
+from spectre.rebalance import DEFAULT_TURNOVER_THRESHOLD
+from spectre.sizing import SIZING_MODES
+from spectre.profiling import profile_pass
+from spectre.telemetry import collect, format_summary
+from spectre.venues import venue_from_spec
 
 try:
     import jsonschema
 except ImportError:
     print("jsonschema is required. Please install with: pip install jsonschema")
     sys.exit(1)
+from spectre.schema_registry import validate_execution_plan
 
 def main():
     parser = argparse.ArgumentParser(description="Build a dry-run execution plan (no trading)")
     parser.add_argument("--facts", required=True, help="Path to facts_pack.json")
     parser.add_argument("--decision", required=True, help="Path to decision_packet.json")
     parser.add_argument("--out", required=True, help="Path to output execution_plan.json")
+    parser.add_argument("--sizing", choices=SIZING_MODES, default=None,
+                        help="Notional allocation: equal (default), inverse_vol or risk_parity (overrides SPECTRE_SIZING)")
+    parser.add_argument("--portfolio-state", default=None,
+                        help="portfolio_state.json with current balances; orders become BUY/SELL deltas against it")
+    parser.add_argument("--turnover-threshold", type=float, default=DEFAULT_TURNOVER_THRESHOLD,
+                        help=f"With --portfolio-state, skip trades smaller than this fraction of the budget (default: {DEFAULT_TURNOVER_THRESHOLD})")
+    parser.add_argument("--venue", default="binance", metavar="SPEC",
+                        help="Venue for prices and exchange rules: binance (default) or file:DIR (rules.json and prices.json)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print per-stage timings, requests and bytes, and add them as the plan's telemetry section")
     args = parser.parse_args()
+    try:
+        venue = venue_from_spec(args.venue)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
 
-    with open(args.facts, "r", encoding="utf-8") as f:
-        facts_pack = json.load(f)
-    with open(args.decision, "r", encoding="utf-8") as f:
-        decision_packet = json.load(f)
-
+    with collect(args.profile) as profile, profile_pass("build_execution_plan"):
+        facts_pack = load_json(args.facts, FactsPack)
+        decision_packet = load_json(args.decision, DecisionPacket)
+        portfolio_state = load_json(args.portfolio_state) if args.portfolio_state else None
 
-    plan = execution_plan.build_execution_plan(
-        facts_pack, decision_packet, args.facts, args.decision
-    )
 
-    schema_path = Path(__file__).parent.parent / "schemas" / "execution_plan.schema.json"
-    with open(schema_path, "r", encoding="utf-8") as f:
-        schema = json.load(f)
+        plan = execution_plan.build_execution_plan(
+            facts_pack, decision_packet, args.facts, args.decision, sizing=args.sizing,
+            portfolio_state=portfolio_state, portfolio_state_path=args.portfolio_state,
+            turnover_threshold=args.turnover_threshold, venue=venue,
+        )
 
-    try:
-        jsonschema.validate(plan, schema)
-    except jsonschema.ValidationError as e:
-        print("EXECUTION PLAN INVALID")
-        print(e)
-        sys.exit(1)
+        try:
+            validate_execution_plan(plan)
+        except jsonschema.ValidationError as e:
+            print("EXECUTION PLAN INVALID")
+            print(e)
+            sys.exit(1)
 
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(plan, f, indent=2)
+        if profile is not None:
+            plan["telemetry"] = profile.summary()
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(out_path, plan)
 
     action = plan["plan"]["action"]
     orders = plan["plan"]["orders"]
@@ -57,9 +78,15 @@ def main():
     print("EXECUTION PLAN VALID")
     print(f"Action: {action}, Orders: {num_orders}, Avg price used: {avg_price:.4f}, Refusals: {num_refusals}")
     print(f"Exchange rules fetched for {num_rules} symbol(s)")
+    if "rebalance" in plan:
+        sells = sum(1 for o in orders if o["side"] == "SELL")
+        print(f"Rebalance: {num_orders - sells} BUY, {sells} SELL, {len(plan['rebalance']['suppressed'])} suppressed")
     if num_refusals > 0:
         first_refusal = plan["refusals"][0]
         print(f"First refusal: {first_refusal['code']} ({first_refusal['symbol']})")
+    if profile is not None:
+        for line in format_summary(profile.summary()):
+            print(line)
 
 if __name__ == "__main__":
     main()
@@ -1,92 +1,72 @@
-import os
 import sys
 import argparse
-import json
-from jsonschema import validate, Draft202012Validator, ValidationError
-from spectre.binance_public import fetch_daily_candles
-from spectre.compute import compute_realised_vol_annualised, compute_correlation_matrix, InsufficientDataError
-from spectre.facts_pack import build_facts_pack
-
-SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'schemas', 'facts_pack.schema.json')
-ARTIFACTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'artifacts')
+from spectre.artifact_io import write_json
+from spectre.pipeline import PipelineError, add_facts_arguments, build_facts, facts_options_from_args, stream_facts
+from spectre.profiling import profile_pass
+from spectre.telemetry import collect, format_summary
+from spectre.universe import load_symbols_file
 
 
 def main():
     parser = argparse.ArgumentParser(description="Build facts pack from Binance public data.")
-    parser.add_argument('--symbols', required=True, help='Comma-separated symbols (e.g. BTCUSDT,ETHUSDT)')
+    symbol_source = parser.add_mutually_exclusive_group(required=True)
+    symbol_source.add_argument('--symbols', help='Comma-separated symbols (e.g. BTCUSDT,ETHUSDT)')
+    symbol_source.add_argument('--symbols-file', help='universe.json from build_universe.py, or a text file of symbols')
     parser.add_argument('--lookback-days', type=int, required=True, help='Number of days to look back')
     parser.add_argument('--out', required=True, help='Output path for facts pack JSON')
+    add_facts_arguments(parser)
+    parser.add_argument('--stream', action='store_true',
+                        help='Write compact JSON symbol by symbol instead of building the whole pack in memory '
+                             '(gzip/zstd compressed when --out ends in .gz/.zst)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print per-stage timings, requests and bytes, and add them as the pack\'s telemetry section')
     args = parser.parse_args()
 
-    symbols = [s.strip() for s in args.symbols.split(',') if s.strip()]
+    if args.symbols_file:
+        try:
+            symbols = load_symbols_file(args.symbols_file)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Failed to read symbols file: {e}")
+            sys.exit(1)
+    else:
+        symbols = [s.strip() for s in args.symbols.split(',') if s.strip()]
+    if not symbols:
+        print("ERROR: No symbols to build a facts pack for")
+        sys.exit(1)
     lookback_days = args.lookback_days
     out_path = args.out
     from pathlib import Path
     Path(out_path).parent.mkdir(parents=True, exist_ok=True)
 
-    candles_by_symbol = {}
-    for symbol in symbols:
+    with collect(args.profile) as profile, profile_pass("build_facts_pack"):
+        # Fetch, compute and validate (shared with `python -m spectre.pipeline`)
         try:
-            candles = fetch_daily_candles(symbol, lookback_days)
-        except Exception as e:
-            print(f"ERROR: Failed to fetch candles for {symbol}: {e}")
-            sys.exit(1)
-        if not candles:
-            print(f"ERROR: No candles returned for {symbol}")
+            options = facts_options_from_args(args)
+            if args.stream:
+                candle_counts, sample_size = stream_facts(symbols, lookback_days, out_path, options, profile)
+            else:
+                facts_pack, sample_size = build_facts(symbols, lookback_days, options)
+                candle_counts = {s: len(c) for s, c in facts_pack["market_data"]["candles"].items()}
+        except PipelineError as e:
+            print(f"ERROR: {e}")
             sys.exit(1)
-        candles_by_symbol[symbol] = candles
-
-    vol_by_symbol = {}
-    for symbol, candles in candles_by_symbol.items():
-        try:
-            vol = compute_realised_vol_annualised(candles)
-        except InsufficientDataError as e:
-            print(f"ERROR: {symbol}: {e}")
-            sys.exit(1)
-        vol_by_symbol[symbol] = vol
-
-    try:
-        corr_symbols, corr_matrix, sample_size = compute_correlation_matrix(candles_by_symbol)
-    except InsufficientDataError as e:
-        print(f"ERROR: {e}")
-        sys.exit(1)
-
-    warnings = None
-    # If sample_size < lookback_days, warn
-    if sample_size < lookback_days:
-        warnings = [f"Aligned sample size reduced to {sample_size} due to timestamp intersection."]
-
-    facts_pack = build_facts_pack(
-        symbols=symbols,
-        lookback_days=lookback_days,
-        candles_by_symbol=candles_by_symbol,
-        vol_by_symbol=vol_by_symbol,
-        corr_symbols=corr_symbols,
-        corr_matrix=corr_matrix,
-        sample_size=sample_size,
-        provenance_note="/api/v3/klines",
-        warnings=warnings
-    )
-
-    # Validate
-    with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
-        schema = json.load(f)
-    validator = Draft202012Validator(schema)
-    try:
-        validator.validate(facts_pack)
-    except ValidationError as e:
-        print(f"ERROR: Facts pack failed schema validation: {e.message}")
-        sys.exit(1)
 
-    # Write
-    with open(out_path, 'w', encoding='utf-8') as f:
-        json.dump(facts_pack, f, indent=2)
+        # Write
+        if not args.stream:
+            if profile is not None:
+                facts_pack["telemetry"] = profile.summary()
+            write_json(out_path, facts_pack)
 
     print("FACTS PACK VALID")
     print(f"Symbols: {', '.join(symbols)}")
     for symbol in symbols:
-        print(f"  {symbol}: {len(candles_by_symbol[symbol])} candles")
+        print(f"  {symbol}: {candle_counts[symbol]} candles")
     print(f"Sample size used for returns/correlation: {sample_size}")
+    print(f"Interval: {options.interval}" + (f" (resampled from {options.fetch_interval})" if options.fetch_interval else ""))
+    print(f"Validation mode: {options.validation_mode}")
+    if profile is not None:
+        for line in format_summary(profile.summary()):
+            print(line)
     sys.exit(0)
 
 if __name__ == "__main__":
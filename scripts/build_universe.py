@@ -0,0 +1,55 @@
+"""
+build_universe.py
+Screens every Binance spot symbol (two bulk requests) and writes a ranked
+symbol list for build_facts_pack.py --symbols-file.
+"""
+import argparse
+import sys
+from pathlib import Path
+from spectre.artifact_io import write_json
+from spectre.universe import UniverseCriteria, build_universe
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen Binance spot symbols into a ranked universe.")
+    parser.add_argument("--out", default="artifacts/universe.json", help="Output path for the universe JSON")
+    parser.add_argument("--quote", default="USDT", help="Quote asset (default: USDT)")
+    parser.add_argument("--min-quote-volume", type=float, default=10_000_000.0,
+                        help="Minimum 24h quote volume (default: 10,000,000)")
+    parser.add_argument("--min-trades", type=int, default=0, help="Minimum 24h trade count")
+    parser.add_argument("--max-spread-bps", type=float, default=None, help="Maximum bid/ask spread in basis points")
+    parser.add_argument("--top", type=int, default=20, help="Keep the N most liquid symbols (0 = keep all)")
+    parser.add_argument("--exclude", default="", help="Comma-separated symbols to leave out (e.g. USDCUSDT)")
+    parser.add_argument("--include-leveraged", action="store_true", help="Keep leveraged tokens")
+    args = parser.parse_args()
+
+    criteria = UniverseCriteria(
+        quote_asset=args.quote,
+        min_quote_volume=args.min_quote_volume,
+        min_trade_count=args.min_trades,
+        max_spread_bps=args.max_spread_bps,
+        exclude_leveraged=not args.include_leveraged,
+        exclude=tuple(s.strip() for s in args.exclude.split(",") if s.strip()),
+        top_n=args.top or None,
+    )
+    try:
+        universe = build_universe(criteria)
+    except Exception as e:
+        print(f"ERROR: Failed to screen universe: {e}")
+        sys.exit(1)
+
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    write_json(args.out, universe)
+
+    counts = universe["counts"]
+    print("UNIVERSE OK")
+    print(f"Symbols on exchange: {counts['exchange']}, {args.quote} trading: {counts['listed']}, "
+          f"liquid: {counts['liquid']}, selected: {counts['selected']}")
+    for row in universe["symbols"]:
+        print(f"  {row['rank']:>3}. {row['symbol']}: 24h quote volume {row['quote_volume']:,.0f}")
+    print(f"Written to {args.out}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+import_binance_archive.py
+Imports locally downloaded Binance public data kline archives
+(e.g. BTCUSDT-1d-2024-01.zip) into a local candle store.
+"""
+import argparse
+import sys
+from pathlib import Path
+from spectre.archive_import import import_archives
+from spectre.candle_store import CandleStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import Binance kline archive zips into a local candle store.")
+    parser.add_argument("--store", required=True, help="Candle store directory (e.g. artifacts/candles)")
+    parser.add_argument("archives", nargs="+", help="Archive zip files or directories containing them")
+    args = parser.parse_args()
+
+    paths = []
+    for a in args.archives:
+        p = Path(a)
+        paths.extend(sorted(p.glob("*.zip")) if p.is_dir() else [p])
+
+    report = import_archives(paths, CandleStore(args.store))
+
+    for symbol, interval, month, rows in report.imported:
+        print(f"IMPORTED {symbol} {interval} {month}: {rows} candles")
+    for name, reason in report.rejected:
+        print(f"REJECTED {name}: {reason}", file=sys.stderr)
+    print(f"Imported {len(report.imported)} symbol-month(s), rejected {len(report.rejected)}")
+    sys.exit(1 if report.rejected else 0)
+
+if __name__ == "__main__":
+    main()
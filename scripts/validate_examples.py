@@ -1,16 +1,16 @@
 import os
 import sys
 import json
-from jsonschema import validate, Draft202012Validator, Draft7Validator, ValidationError
+from jsonschema import ValidationError
+from spectre.schema_registry import get_validator, FACTS_PACK, DECISION_PACKET
 
-SCHEMA_DIR = os.path.join(os.path.dirname(__file__), '..', 'schemas')
 EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), '..', 'examples')
 
 FILES = [
-    ("facts_pack.valid.json", "facts_pack.schema.json", True),
-    ("facts_pack.invalid.json", "facts_pack.schema.json", False),
-    ("decision_packet.valid.json", "decision_packet.schema.json", True),
-    ("decision_packet.invalid.json", "decision_packet.schema.json", False),
+    ("facts_pack.valid.json", FACTS_PACK, True),
+    ("facts_pack.invalid.json", FACTS_PACK, False),
+    ("decision_packet.valid.json", DECISION_PACKET, True),
+    ("decision_packet.invalid.json", DECISION_PACKET, False),
 ]
 
 
@@ -19,21 +19,13 @@ def load_json(path):
         return json.load(f)
 
 
-def get_validator(schema):
-    # Use Draft 2020-12 if available, else Draft 7
-    if schema.get("$schema", "").endswith("2020-12/schema"):
-        return Draft202012Validator(schema)
-    return Draft7Validator(schema)
-
-
 def main():
     any_fail = False
-    for example_file, schema_file, should_pass in FILES:
+    for example_file, schema_name, should_pass in FILES:
         example_path = os.path.join(EXAMPLES_DIR, example_file)
-        schema_path = os.path.join(SCHEMA_DIR, schema_file)
         data = load_json(example_path)
-        schema = load_json(schema_path)
-        validator = get_validator(schema)
+        # Draft 2020-12 if declared, else Draft 7 (compiled once per schema)
+        validator = get_validator(schema_name)
         try:
             validator.validate(data)
             if should_pass:
@@ -0,0 +1,139 @@
+"""
+archive_import.py
+Import Binance public data kline archives into the local candle store.
+
+Accepts the monthly and daily spot kline zips published at
+data.binance.vision, e.g. BTCUSDT-1d-2024-01.zip or BTCUSDT-1h-2024-01-15.zip.
+Each zip holds one CSV (open_time, open, high, low, close, volume, ...; newer
+files may carry a header row and microsecond timestamps). Every CSV is
+streamed out of the zip, decoded column-wise, merged with what the store
+already holds for that symbol-month, validated, and only then committed.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import math
+import re
+import zipfile
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+from spectre.candle_store import CandleStore, month_of
+from spectre.resample import bucket_start, interval_ms
+
+ARCHIVE_NAME = re.compile(
+    r"^(?P<symbol>[A-Z0-9]+)-(?P<interval>\d+[mhdw])-(?P<month>\d{4}-\d{2})(?:-(?P<day>\d{2}))?\.zip$"
+)
+
+# Open times above this are in microseconds (Binance spot archives from 2025 on).
+_MICROSECOND_THRESHOLD = 10**14
+
+
+class ArchiveError(Exception):
+    pass
+
+
+@dataclass
+class ImportReport:
+    imported: List[Tuple[str, str, str, int]] = field(default_factory=list)  # symbol, interval, month, rows
+    rejected: List[Tuple[str, str]] = field(default_factory=list)  # archive name, reason
+
+
+def parse_archive_name(path: str | Path) -> Tuple[str, str, str]:
+    m = ARCHIVE_NAME.match(Path(path).name)
+    if not m:
+        raise ArchiveError(f"Not a Binance kline archive name: {Path(path).name}")
+    try:
+        interval_ms(m.group("interval"))
+    except ValueError as e:
+        raise ArchiveError(str(e)) from e
+    return m.group("symbol"), m.group("interval"), m.group("month")
+
+
+def read_archive(path: str | Path) -> List[list]:
+    """Decode the kline CSV inside a zip into rows [open_ms, o, h, l, c, v]."""
+    name = Path(path).name
+    # Typed columns filled row by row as the CSV is read: no string copy of the month is kept.
+    t, o, h, l, c, v = array("q"), array("d"), array("d"), array("d"), array("d"), array("d")
+    with zipfile.ZipFile(path) as zf:
+        names = [n for n in zf.namelist() if n.endswith(".csv")]
+        if len(names) != 1:
+            raise ArchiveError(f"{name}: expected exactly one CSV, found {len(names)}")
+        with zf.open(names[0]) as raw:
+            try:
+                _read_rows(csv.reader(io.TextIOWrapper(raw, encoding="utf-8", newline="")), name, (t, o, h, l, c, v))
+            except (UnicodeDecodeError, csv.Error) as e:
+                raise ArchiveError(f"{name}: unreadable CSV: {e}") from e
+    return [list(r) for r in zip(t, o, h, l, c, v)]
+
+
+def _read_rows(reader, name: str, columns: Tuple[array, ...]) -> None:
+    t, o, h, l, c, v = columns
+    scale = None
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < 6:
+            raise ArchiveError(f"{name}: expected at least 6 columns, found {len(row)}")
+        if scale is None and not row[0].isdigit():
+            continue  # Header row
+        try:
+            open_time = int(row[0])
+            if scale is None:
+                scale = 1000 if open_time > _MICROSECOND_THRESHOLD else 1
+            t.append(open_time // scale)
+            o.append(float(row[1]))
+            h.append(float(row[2]))
+            l.append(float(row[3]))
+            c.append(float(row[4]))
+            v.append(float(row[5]))
+        except ValueError as e:
+            raise ArchiveError(f"{name}: malformed value: {e}") from e
+
+
+def validate_month(rows: List[list], interval: str, month: str) -> None:
+    """Raise ArchiveError unless `rows` is a clean, ordered kline series inside `month`."""
+    prev = None
+    for r in rows:
+        t, o, h, l, c, v = r
+        if month_of(t) != month:
+            raise ArchiveError(f"{month}: candle at {t} is outside the month")
+        if bucket_start(t, interval) != t:
+            raise ArchiveError(f"{month}: candle at {t} is not aligned to {interval}")
+        if prev is not None and t <= prev:
+            raise ArchiveError(f"{month}: timestamps not strictly increasing at {t}")
+        prev = t
+        if not all(math.isfinite(x) for x in (o, h, l, c, v)):
+            raise ArchiveError(f"{month}: non-finite value at {t}")
+        if v < 0 or l > min(o, c) or h < max(o, c) or l <= 0:
+            raise ArchiveError(f"{month}: inconsistent OHLCV at {t}")
+
+
+def _merge(existing: List[list], new: List[list]) -> List[list]:
+    by_t = {r[0]: r for r in existing}
+    by_t.update((r[0], r) for r in new)
+    return [by_t[t] for t in sorted(by_t)]
+
+
+def import_archives(paths: Iterable[str | Path], store: CandleStore) -> ImportReport:
+    """
+    Import each archive into `store`. Archives are processed one at a time,
+    so memory is bounded by one symbol-month. A bad archive is reported in
+    `rejected` and leaves the store untouched for that month.
+    """
+    report = ImportReport()
+    for path in sorted(Path(p) for p in paths):
+        try:
+            symbol, interval, month = parse_archive_name(path)
+            rows = read_archive(path)
+            merged = _merge(store.read_month(symbol, interval, month), rows)
+            validate_month(merged, interval, month)
+        except (ArchiveError, zipfile.BadZipFile, OSError) as e:
+            report.rejected.append((path.name, str(e)))
+            continue
+        store.write_month(symbol, interval, month, merged)
+        report.imported.append((symbol, interval, month, len(merged)))
+    return report
@@ -0,0 +1,65 @@
+"""
+artifact_io.py
+Reading and writing JSON artifacts, with optional compression.
+
+Compression is chosen from the file suffix: ".gz" uses gzip, ".zst" uses
+zstandard (optional dependency), anything else is plain UTF-8 text.
+Documents are parsed and encoded as bytes by spectre.json_backend.
+"""
+from __future__ import annotations
+
+import gzip
+import io
+from pathlib import Path
+from typing import IO, Any, Dict, Optional
+
+from spectre import json_backend
+from spectre.telemetry import span
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstandard is required for .zst artifacts. Please install with: pip install zstandard")
+    return zstandard
+
+
+def open_artifact(path: str | Path, mode: str = "r") -> IO:
+    """Open an artifact as text ("r", "w") or bytes ("rb", "wb")."""
+    if mode not in ("r", "w", "rb", "wb"):
+        raise ValueError(f"Unsupported mode: {mode}")
+    p = Path(path)
+    binary = mode.endswith("b")
+    mode = mode[0]
+    if p.suffix == ".gz":
+        return gzip.open(p, mode + "b") if binary else gzip.open(p, mode + "t", encoding="utf-8")
+    if p.suffix == ".zst":
+        zstd = _zstandard()
+        raw = open(p, mode + "b")
+        if mode == "r":
+            stream = zstd.ZstdDecompressor().stream_reader(raw, closefd=True)
+        else:
+            stream = zstd.ZstdCompressor().stream_writer(raw, closefd=True)
+        return stream if binary else io.TextIOWrapper(stream, encoding="utf-8")
+    return open(p, mode + "b") if binary else open(p, mode, encoding="utf-8")
+
+
+def load_json(path: str | Path, model: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Read a JSON artifact. `model` (a spectre.models type) is used as the
+    decode target when the msgspec backend is active.
+    """
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"File not found: {p}")
+    with span("json.load"), open_artifact(p, "rb") as f:
+        return json_backend.loads(f.read(), model)
+
+
+def write_json(path: str | Path, doc: Dict[str, Any], *, indent: bool = True) -> None:
+    """Write a JSON artifact (two-space indented unless indent=False)."""
+    with span("json.write"):
+        data = json_backend.dumps(doc, indent=indent)
+        with open_artifact(path, "wb") as f:
+            f.write(data)
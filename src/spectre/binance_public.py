@@ -1,14 +1,76 @@
-import requests
-from datetime import datetime, timezone
-from dateutil import parser
+import os
+import time
+from urllib.parse import urlsplit
 
+from spectre.candles import CandleSeries
+from spectre.resample import bars_for_lookback, can_resample, interval_ms, resample_series
+from spectre.metrics import observe_http
+from spectre.rate_limit import RETRIES_ON_429, record_response, shared_limiter, throttle
+from spectre.telemetry import span
 
-BINANCE_EXCHANGE_INFO_API = "https://api.binance.com/api/v3/exchangeInfo"
-BINANCE_API = "https://api.binance.com/api/v3/klines"
+
+BINANCE_BASE_URL = "https://api.binance.com"
+# Point every call at another host, e.g. the local stand-in from spectre.fake_binance.
+BINANCE_BASE_URL_ENV = "SPECTRE_BINANCE_BASE_URL"
+EXCHANGE_INFO_PATH = "/api/v3/exchangeInfo"
+KLINES_PATH = "/api/v3/klines"
+TICKER_24HR_PATH = "/api/v3/ticker/24hr"
+TICKER_PRICE_PATH = "/api/v3/ticker/price"
+
+BINANCE_EXCHANGE_INFO_API = BINANCE_BASE_URL + EXCHANGE_INFO_PATH
+BINANCE_API = BINANCE_BASE_URL + KLINES_PATH
+BINANCE_TICKER_24HR_API = BINANCE_BASE_URL + TICKER_24HR_PATH
+
+
+def api_url(path):
+    """Full URL for an API path on the configured host (SPECTRE_BINANCE_BASE_URL, default api.binance.com)."""
+    return (os.environ.get(BINANCE_BASE_URL_ENV) or BINANCE_BASE_URL).rstrip("/") + path
 
 import decimal
 from decimal import Decimal
 
+
+def _requests():
+    # requests is imported on first use; module attribute `requests` resolves
+    # to it too, so callers can still patch bp.requests.get.
+    module = globals().get("requests")
+    if module is None:
+        import requests as module
+        globals()["requests"] = module
+    return module
+
+
+def __getattr__(name):
+    if name == "requests":
+        return _requests()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _get(endpoint, url, **kwargs):
+    # Every Binance call goes through here: paced by the shared weight limiter,
+    # and attributed per endpoint by --profile and the metrics. A 429 is retried
+    # once the limiter's Retry-After block has passed (not retried with the
+    # limiter disabled); anything else, including 418 (a ban), is returned for
+    # the caller's raise_for_status.
+    path = urlsplit(url).path
+    for attempt in range(RETRIES_ON_429 + 1):
+        throttle(path, kwargs.get("params"))
+        start = time.perf_counter()
+        with span(f"http.binance.{endpoint}") as s:
+            try:
+                resp = _requests().get(url, timeout=10, **kwargs)
+            except Exception:
+                observe_http(endpoint, "error", time.perf_counter() - start)
+                raise
+            s.add_request(len(getattr(resp, "content", b"") or b""))
+        status = getattr(resp, "status_code", "unknown")
+        observe_http(endpoint, status, time.perf_counter() - start)
+        record_response(resp)
+        if status != 429 or shared_limiter() is None:
+            break
+    return resp
+
+
 def fetch_exchange_info(symbols: list[str]) -> dict:
     """
     Fetch exchange info for given symbols from Binance public API.
@@ -17,12 +79,12 @@ def fetch_exchange_info(symbols: list[str]) -> dict:
     """
     if not symbols:
         return {}
-    url = BINANCE_EXCHANGE_INFO_API
+    url = api_url(EXCHANGE_INFO_PATH)
     import json as _json
     # Binance expects no spaces in the symbols param
     symbols_param = _json.dumps(symbols, separators=(',', ':'))
     params = {"symbols": symbols_param}
-    resp = requests.get(url, params=params, timeout=10)
+    resp = _get("exchangeInfo", url, params=params)
     resp.raise_for_status()
     data = resp.json()
     result = {}
@@ -73,41 +135,111 @@ def fetch_exchange_info(symbols: list[str]) -> dict:
     return result
 
 
-def fetch_daily_candles(symbol, lookback_days):
-    candles = []
+def fetch_exchange_symbols():
+    """Raw exchangeInfo entries for every symbol on the exchange, in one call."""
+    resp = _get("exchangeInfo", api_url(EXCHANGE_INFO_PATH))
+    resp.raise_for_status()
+    return resp.json().get("symbols", [])
+
+
+def fetch_ticker_24hr():
+    """Rolling 24h ticker statistics for every symbol, in one call."""
+    resp = _get("ticker_24hr", api_url(TICKER_24HR_PATH))
+    resp.raise_for_status()
+    return resp.json()
+
+
+def fetch_ticker_prices():
+    """Latest price of every symbol, in one call: {symbol: price}."""
+    resp = _get("ticker_price", api_url(TICKER_PRICE_PATH))
+    resp.raise_for_status()
+    return {item["symbol"]: float(item["price"]) for item in resp.json()}
+
+
+def fetch_klines(symbol, interval, limit):
+    """
+    Fetch the most recent `limit` raw klines for `symbol` at `interval`,
+    paging backwards 1000 rows at a time. Rows are returned oldest first.
+    """
+    interval_ms(interval)  # reject unknown intervals before hitting the API
+    pages = []
     max_limit = 1000
     end_time = None
     fetched = 0
-    while fetched < lookback_days:
-        limit = min(max_limit, lookback_days - fetched)
+    while fetched < limit:
+        page_limit = min(max_limit, limit - fetched)
         params = {
             "symbol": symbol,
-            "interval": "1d",
-            "limit": limit
+            "interval": interval,
+            "limit": page_limit
         }
         if end_time:
             params["endTime"] = end_time
-        resp = requests.get(BINANCE_API, params=params, timeout=10)
+        resp = _get("klines", api_url(KLINES_PATH), params=params)
         resp.raise_for_status()
         data = resp.json()
         if not data:
             break
-        for k in data:
-            t = datetime.utcfromtimestamp(k[0] / 1000).replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
-            candle = {
-                "t": t,
-                "o": float(k[1]),
-                "h": float(k[2]),
-                "l": float(k[3]),
-                "c": float(k[4]),
-                "v": float(k[5])
-            }
-            candles.append(candle)
+        pages.append(data)
         # Pagination: set end_time to one ms before earliest candle
         end_time = data[0][0] - 1 if data else None
         fetched += len(data)
-        if len(data) < limit:
+        if len(data) < page_limit:
             break
-    # Return most recent N candles
-    candles = sorted(candles, key=lambda x: x["t"], reverse=True)[:lookback_days]
-    return list(reversed(candles))
+    # Each page is ascending and older than the one before it, so the pages
+    # only need to be joined in reverse; no sort.
+    rows = [row for page in reversed(pages) for row in page]
+    return rows[-limit:]
+
+
+def klines_to_candles(rows):
+    return CandleSeries.from_klines(rows).to_candles()
+
+
+def fetch_series_by_interval(symbol, intervals, lookback_days, fetch_interval):
+    """
+    Fetch `lookback_days` of `fetch_interval` bars once and resample them
+    locally into each of `intervals` (e.g. 4h and 1d from 1h), instead of
+    issuing a separate request per interval. Returns {interval: CandleSeries}.
+    """
+    for interval in intervals:
+        if not can_resample(fetch_interval, interval):
+            raise ValueError(f"Cannot build {interval} candles from {fetch_interval} bars")
+    # One extra coarsest bucket of source bars so the oldest bucket is complete.
+    coarsest = max(interval_ms(i) for i in intervals)
+    limit = max(bars_for_lookback(lookback_days, i) * (interval_ms(i) // interval_ms(fetch_interval)) for i in intervals)
+    series = CandleSeries.from_klines(fetch_klines(symbol, fetch_interval, limit + coarsest // interval_ms(fetch_interval)))
+    return {
+        interval: resample_series(series, fetch_interval, interval).tail(bars_for_lookback(lookback_days, interval))
+        for interval in intervals
+    }
+
+
+def fetch_candles_by_interval(symbol, intervals, lookback_days, fetch_interval):
+    """As fetch_series_by_interval, with candles as facts-pack dicts: {interval: candles}."""
+    by_interval = fetch_series_by_interval(symbol, intervals, lookback_days, fetch_interval)
+    return {interval: series.to_candles() for interval, series in by_interval.items()}
+
+
+def fetch_candle_series(symbol, lookback_days, interval="1d", fetch_interval=None):
+    """
+    Fast ingestion path: fetch `lookback_days` of `interval` bars as a
+    columnar CandleSeries (int ms timestamps, float columns parsed in bulk).
+    If `fetch_interval` is a finer interval, those bars are fetched and
+    resampled locally into `interval`.
+    """
+    if fetch_interval and fetch_interval != interval:
+        return fetch_series_by_interval(symbol, [interval], lookback_days, fetch_interval)[interval]
+    return CandleSeries.from_klines(fetch_klines(symbol, interval, bars_for_lookback(lookback_days, interval)))
+
+
+def fetch_candles(symbol, lookback_days, interval="1d", fetch_interval=None):
+    """
+    Fetch `lookback_days` of `interval` candles as facts-pack dicts
+    ({"t": ISO-8601, "o", "h", "l", "c", "v"}). See fetch_candle_series.
+    """
+    return fetch_candle_series(symbol, lookback_days, interval, fetch_interval).to_candles()
+
+
+def fetch_daily_candles(symbol, lookback_days):
+    return fetch_candles(symbol, lookback_days, "1d")
@@ -0,0 +1,98 @@
+"""
+candle_store.py
+Local on-disk store of klines, partitioned by symbol, interval and month.
+
+Layout: <root>/<SYMBOL>/<interval>/<YYYY-MM>.csv, one kline per line as
+open_ms,o,h,l,c,v (no header), oldest first. Each month file is written to a
+temporary file and renamed into place, so a partially written month is never
+visible to readers.
+"""
+from __future__ import annotations
+
+import csv
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from spectre.candles import CandleSeries
+from spectre.resample import bars_for_lookback, interval_ms, resample_series
+
+
+def month_of(open_ms: int) -> str:
+    return datetime.fromtimestamp(open_ms / 1000, tz=timezone.utc).strftime("%Y-%m")
+
+
+class CandleStore:
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _dir(self, symbol: str, interval: str) -> Path:
+        return self.root / symbol / interval
+
+    def month_path(self, symbol: str, interval: str, month: str) -> Path:
+        return self._dir(symbol, interval) / f"{month}.csv"
+
+    def symbols(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
+
+    def months(self, symbol: str, interval: str) -> List[str]:
+        d = self._dir(symbol, interval)
+        if not d.exists():
+            return []
+        return sorted(p.stem for p in d.glob("*.csv"))
+
+    def read_month(self, symbol: str, interval: str, month: str) -> List[list]:
+        p = self.month_path(symbol, interval, month)
+        if not p.exists():
+            return []
+        with open(p, "r", encoding="utf-8", newline="") as f:
+            cols = list(zip(*csv.reader(f)))
+        if not cols:
+            return []
+        # Decode column-wise rather than row by row.
+        t = map(int, cols[0])
+        o, h, l, c, v = (map(float, col) for col in cols[1:6])
+        return [list(r) for r in zip(t, o, h, l, c, v)]
+
+    def write_month(self, symbol: str, interval: str, month: str, rows: Sequence[Sequence[Any]]) -> Path:
+        """Commit one symbol-month of klines, replacing any existing file."""
+        p = self.month_path(symbol, interval, month)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            csv.writer(f, lineterminator="\n").writerows(
+                (int(r[0]), repr(float(r[1])), repr(float(r[2])), repr(float(r[3])), repr(float(r[4])), repr(float(r[5])))
+                for r in rows
+            )
+        os.replace(tmp, p)
+        return p
+
+    def read_klines(self, symbol: str, interval: str, limit: Optional[int] = None) -> List[list]:
+        """Most recent `limit` klines (all if None), oldest first."""
+        rows: List[list] = []
+        for month in reversed(self.months(symbol, interval)):
+            rows = self.read_month(symbol, interval, month) + rows
+            if limit is not None and len(rows) >= limit:
+                break
+        return rows[-limit:] if limit is not None else rows
+
+    def load_series(self, symbol: str, lookback_days: int, interval: str = "1d", fetch_interval: Optional[str] = None) -> CandleSeries:
+        """
+        The most recent `lookback_days` of stored history as a CandleSeries.
+        With `fetch_interval`, stored bars of that interval are resampled locally.
+        """
+        bars = bars_for_lookback(lookback_days, interval)
+        if fetch_interval and fetch_interval != interval:
+            per_bar = interval_ms(interval) // interval_ms(fetch_interval)
+            series = CandleSeries.from_klines(self.read_klines(symbol, fetch_interval, (bars + 1) * per_bar))
+            series = resample_series(series, fetch_interval, interval)
+        else:
+            series = CandleSeries.from_klines(self.read_klines(symbol, interval, bars))
+        return series.tail(bars)
+
+    def load_candles(self, symbol: str, lookback_days: int, interval: str = "1d", fetch_interval: Optional[str] = None) -> List[Dict[str, Any]]:
+        """As load_series, with candles as facts-pack dicts."""
+        return self.load_series(symbol, lookback_days, interval, fetch_interval).to_candles()
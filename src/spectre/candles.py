@@ -0,0 +1,117 @@
+"""
+candles.py
+Columnar candle series.
+
+Candles are held as parallel typed arrays: open times as int64 epoch
+milliseconds and OHLCV as float64. Kline pages decode straight into the
+arrays, and ISO-8601 timestamps are only produced when candles are written
+to a JSON artifact (to_candles / iso_times).
+"""
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from calendar import timegm
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+_ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def iso_from_ms(ms: int) -> str:
+    return time.strftime(_ISO_FORMAT, time.gmtime(ms // 1000))
+
+
+def ms_from_iso(t: str) -> int:
+    return timegm(time.strptime(t[:19], _ISO_FORMAT[:-1])) * 1000
+
+
+class CandleSeries:
+    __slots__ = ("t", "o", "h", "l", "c", "v")
+
+    def __init__(
+        self,
+        t: Optional[Iterable[int]] = None,
+        o: Optional[Iterable[float]] = None,
+        h: Optional[Iterable[float]] = None,
+        l: Optional[Iterable[float]] = None,
+        c: Optional[Iterable[float]] = None,
+        v: Optional[Iterable[float]] = None,
+    ):
+        self.t = array("q", t or ())
+        self.o = array("d", o or ())
+        self.h = array("d", h or ())
+        self.l = array("d", l or ())
+        self.c = array("d", c or ())
+        self.v = array("d", v or ())
+
+    @classmethod
+    def from_klines(cls, rows: Sequence[Sequence[Any]]) -> "CandleSeries":
+        """Decode Binance kline rows [open_ms, "o", "h", "l", "c", "v", ...] column by column."""
+        if not rows:
+            return cls()
+        cols = list(zip(*rows))
+        return cls(
+            cols[0],
+            map(float, cols[1]),
+            map(float, cols[2]),
+            map(float, cols[3]),
+            map(float, cols[4]),
+            map(float, cols[5]),
+        )
+
+    @classmethod
+    def from_candles(cls, candles: Sequence[Dict[str, Any]]) -> "CandleSeries":
+        """Build a series from facts-pack candle objects ({"t": ISO, "o": ..., ...})."""
+        return cls(
+            [ms_from_iso(x["t"]) for x in candles],
+            [x["o"] for x in candles],
+            [x["h"] for x in candles],
+            [x["l"] for x in candles],
+            [x["c"] for x in candles],
+            [x["v"] for x in candles],
+        )
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def tail(self, n: int) -> "CandleSeries":
+        if n >= len(self):
+            return self
+        start = len(self) - n
+        return CandleSeries(self.t[start:], self.o[start:], self.h[start:], self.l[start:], self.c[start:], self.v[start:])
+
+    def closes_view(self) -> "CandleSeries":
+        """A series sharing only the t and c columns (enough for returns and correlation)."""
+        s = CandleSeries()
+        s.t, s.c = self.t, self.c
+        return s
+
+    def klines(self) -> List[list]:
+        return [list(r) for r in zip(self.t, self.o, self.h, self.l, self.c, self.v)]
+
+    def iso_times(self) -> List[str]:
+        return [iso_from_ms(ms) for ms in self.t]
+
+    def to_candles(self) -> List[Dict[str, Any]]:
+        return [
+            {"t": t, "o": o, "h": h, "l": l, "c": c, "v": v}
+            for t, o, h, l, c, v in zip(self.iso_times(), self.o, self.h, self.l, self.c, self.v)
+        ]
+
+    def structure_errors(self) -> Optional[str]:
+        """First structural problem (ordering, non-finite values, negative volume), or None."""
+        t = self.t
+        n = len(t)
+        if not (len(self.o) == len(self.h) == len(self.l) == len(self.c) == len(self.v) == n):
+            return "column lengths differ"
+        for i in range(1, n):
+            if t[i] <= t[i - 1]:
+                return f"timestamps not strictly increasing at index {i}"
+        for name in ("o", "h", "l", "c", "v"):
+            col = getattr(self, name)
+            if not all(map(math.isfinite, col)):
+                return f"non-finite value in {name}"
+        if n and min(self.v) < 0:
+            return "negative volume"
+        return None
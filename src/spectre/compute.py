@@ -1,62 +1,325 @@
 
 import math
 import statistics
+from operator import mul
+from spectre.candles import CandleSeries
+from spectre.resample import periods_per_year
 
 class InsufficientDataError(Exception):
     pass
 
 
-def compute_realised_vol_annualised(candles):
-    closes = [c["c"] for c in candles]
+# Candles are either a CandleSeries or a list of {"t", "c", ...} dicts.
+def _closes(candles):
+    return candles.c if isinstance(candles, CandleSeries) else [c["c"] for c in candles]
+
+
+def _times_and_closes(candles):
+    if isinstance(candles, CandleSeries):
+        return candles.t, candles.c
+    return [c["t"] for c in candles], [c["c"] for c in candles]
+
+
+def compute_realised_vol_annualised(candles, interval="1d"):
+    closes = _closes(candles)
     returns = []
     for i in range(1, len(closes)):
         returns.append(math.log(closes[i] / closes[i-1]))
     if len(returns) < 30:
         raise InsufficientDataError("Insufficient data: need at least 30 return observations.")
-    vol = statistics.stdev(returns) * math.sqrt(365)
+    # Annualise by the number of `interval` bars per year (365 for daily bars)
+    vol = statistics.stdev(returns) * math.sqrt(periods_per_year(interval))
     return float(vol)
 
 
-def compute_correlation_matrix(candles_by_symbol):
-    # Align by intersection of timestamps
+ATR_PERIOD = 14
+# Momentum look-backs, in bars of the pack's interval.
+MOMENTUM_HORIZONS = (7, 30, 90)
+
+
+def compute_symbol_stats(candles, interval="1d", atr_period=ATR_PERIOD, horizons=MOMENTUM_HORIZONS):
+    """
+    Extended per-symbol statistics from one sweep over the OHLCV columns:
+
+    - atr: Wilder's average true range over `atr_period` bars (None if too short);
+      atr_pct is atr over the last close.
+    - max_drawdown: largest peak-to-trough fall in close, as a fraction.
+    - momentum: {horizon: close / close `horizon` bars earlier - 1} (None if too short).
+    - downside_vol_annualised: root mean square of negative log returns, annualised.
+    - avg_dollar_volume: mean close x volume per bar.
+    """
+    if isinstance(candles, CandleSeries):
+        h, l, c, v = candles.h, candles.l, candles.c, candles.v
+    else:
+        h, l, c, v = ([x[k] for x in candles] for k in ("h", "l", "c", "v"))
+    n = len(c)
+    if n < 2:
+        raise InsufficientDataError("Insufficient data: need at least 2 candles.")
+    atr = None
+    tr_sum = 0.0
+    peak = c[0]
+    max_dd = 0.0
+    down_sq = 0.0
+    dollar_volume = c[0] * v[0]
+    prev = c[0]
+    for i in range(1, n):
+        close = c[i]
+        hi, lo = h[i], l[i]
+        tr = max(hi - lo, abs(hi - prev), abs(lo - prev))
+        if i <= atr_period:
+            tr_sum += tr
+            if i == atr_period:
+                atr = tr_sum / atr_period
+        else:
+            atr = (atr * (atr_period - 1) + tr) / atr_period
+        r = math.log(close / prev)
+        if r < 0:
+            down_sq += r * r
+        if close > peak:
+            peak = close
+        elif peak > 0 and 1.0 - close / peak > max_dd:
+            max_dd = 1.0 - close / peak
+        dollar_volume += close * v[i]
+        prev = close
+    last = c[-1]
+    return {
+        "atr": atr,
+        "atr_pct": atr / last if atr is not None and last > 0 else None,
+        "max_drawdown": max_dd,
+        "momentum": {str(k): (last / c[-1 - k] - 1.0 if k < n and c[-1 - k] > 0 else None) for k in horizons},
+        "downside_vol_annualised": math.sqrt(down_sq / (n - 1) * periods_per_year(interval)),
+        "avg_dollar_volume": dollar_volume / n,
+    }
+
+
+CORR_ENGINE_SAMPLE = "sample"
+CORR_ENGINE_LEDOIT_WOLF = "ledoit_wolf"
+CORR_ENGINE_EWMA = "ewma"
+CORR_ENGINES = (CORR_ENGINE_SAMPLE, CORR_ENGINE_LEDOIT_WOLF, CORR_ENGINE_EWMA)
+# RiskMetrics daily decay factor.
+DEFAULT_EWMA_LAMBDA = 0.94
+# How symbols are aligned before correlating: every symbol on the timestamps
+# all of them share, or each pair on its own overlap (sample engine only).
+CORR_ALIGN_INTERSECTION = "intersection"
+CORR_ALIGN_PAIRWISE = "pairwise"
+CORR_ALIGNMENTS = (CORR_ALIGN_INTERSECTION, CORR_ALIGN_PAIRWISE)
+MIN_ALIGNED_RETURNS = 30
+
+
+def aligned_returns(candles_by_symbol):
+    """
+    Log returns of every symbol over the intersection of their timestamps.
+    Returns (symbols, returns_by_symbol, sample_size).
+    """
     symbols = list(candles_by_symbol.keys())
-    ts_sets = [set(c["t"] for c in candles_by_symbol[s]) for s in symbols]
-    common_ts = set.intersection(*ts_sets)
+    series = [_times_and_closes(candles_by_symbol[s]) for s in symbols]
+    common_ts = set.intersection(*(set(times) for times, _ in series))
     if not common_ts:
         raise InsufficientDataError("No overlapping timestamps across symbols.")
-    aligned = []
-    for s in symbols:
-        ts_to_candle = {c["t"]: c for c in candles_by_symbol[s]}
-        aligned.append([ts_to_candle[t]["c"] for t in sorted(common_ts)])
-
-    # Compute log returns for each symbol
+    common = sorted(common_ts)
     returns_by_symbol = []
-    for closes in aligned:
-        returns = [math.log(closes[i] / closes[i-1]) for i in range(1, len(closes))]
+    for times, closes in series:
+        ts_to_close = dict(zip(times, closes))
+        aligned = [ts_to_close[t] for t in common]
+        returns_by_symbol.append([math.log(b / a) for a, b in zip(aligned, aligned[1:])])
+    sample_size = len(common) - 1
+    if sample_size < MIN_ALIGNED_RETURNS:
+        raise InsufficientDataError(f"Insufficient data: need at least {MIN_ALIGNED_RETURNS} aligned return observations.")
+    return symbols, returns_by_symbol, sample_size
+
+
+def masked_returns(candles_by_symbol):
+    """
+    Log returns of every symbol on the union of all timestamps, with a 0/1
+    mask per symbol. A return at grid step k needs closes at steps k - 1 and
+    k; missing returns are stored as 0.0 with mask 0.0.
+    Returns (symbols, returns_by_symbol, masks).
+    """
+    symbols = list(candles_by_symbol.keys())
+    series = [_times_and_closes(candles_by_symbol[s]) for s in symbols]
+    grid = sorted(set().union(*(times for times, _ in series)))
+    step = {t: k for k, t in enumerate(grid)}
+    returns_by_symbol, masks = [], []
+    for times, closes in series:
+        returns = [0.0] * (len(grid) - 1)
+        mask = [0.0] * (len(grid) - 1)
+        for t0, t1, c0, c1 in zip(times, times[1:], closes, closes[1:]):
+            k = step[t1]
+            if step[t0] == k - 1:
+                returns[k - 1] = math.log(c1 / c0)
+                mask[k - 1] = 1.0
         returns_by_symbol.append(returns)
+        masks.append(mask)
+    return symbols, returns_by_symbol, masks
 
-    sample_size = len(returns_by_symbol[0]) if returns_by_symbol else 0
-    if sample_size < 30:
-        raise InsufficientDataError("Insufficient data: need at least 30 aligned return observations.")
 
-    # Compute correlation matrix
-    n = len(symbols)
-    corr_matrix = [[0.0 for _ in range(n)] for _ in range(n)]
+def _gram(vectors):
+    # Symmetric matrix of dot products, one C-level pass per pair.
+    n = len(vectors)
+    out = [[0.0] * n for _ in range(n)]
     for i in range(n):
-        for j in range(n):
-            x = returns_by_symbol[i]
-            y = returns_by_symbol[j]
-            if i == j:
-                corr_matrix[i][j] = 1.0
-            else:
-                mean_x = statistics.mean(x)
-                mean_y = statistics.mean(y)
-                cov = sum((a - mean_x) * (b - mean_y) for a, b in zip(x, y)) / (sample_size - 1)
-                stdev_x = statistics.stdev(x)
-                stdev_y = statistics.stdev(y)
-                if stdev_x == 0 or stdev_y == 0:
-                    corr = 0.0
-                else:
-                    corr = cov / (stdev_x * stdev_y)
-                corr_matrix[i][j] = corr
-    return symbols, corr_matrix, sample_size
+        vi = vectors[i]
+        for j in range(i, n):
+            out[i][j] = out[j][i] = sum(map(mul, vi, vectors[j]))
+    return out
+
+
+def _gram_for(workers):
+    # workers > 1 computes the Gram matrix in a process pool (see spectre.parallel); same result.
+    if workers > 1:
+        from spectre.parallel import parallel_gram
+        return lambda vectors: parallel_gram(vectors, workers)
+    return _gram
+
+
+def _standardise(returns):
+    # Demeaned series scaled to unit norm, so dot products are Pearson correlations.
+    # A constant series stays all-zero and correlates 0.0 with everything.
+    mean = math.fsum(returns) / len(returns)
+    centred = [r - mean for r in returns]
+    norm = math.sqrt(sum(map(mul, centred, centred)))
+    return [c / norm for c in centred] if norm > 0 else [0.0] * len(returns)
+
+
+def _unit_diagonal(matrix):
+    for i in range(len(matrix)):
+        matrix[i][i] = 1.0
+    return matrix
+
+
+def sample_correlation(returns_by_symbol, gram=_gram):
+    return _unit_diagonal(gram([_standardise(r) for r in returns_by_symbol]))
+
+
+def ledoit_wolf_correlation(returns_by_symbol, gram=_gram):
+    """
+    Ledoit-Wolf (2004) shrinkage of the sample correlation towards the
+    identity. Returns (matrix, shrinkage) where shrinkage is the optimal
+    intensity in [0, 1]; off-diagonal entries are (1 - shrinkage) times the
+    sample correlation.
+    """
+    z = [_standardise(r) for r in returns_by_symbol]
+    n, t = len(z), len(z[0])
+    # Rows of x are observations of returns standardised to unit variance (1/T convention).
+    scale = math.sqrt(t)
+    x_rows = [[v * scale for v in row] for row in zip(*z)]
+    s = gram(z)
+    # Squared Frobenius norms are normalised by n as in Ledoit & Wolf.
+    s_norm2 = sum(v * v for row in s for v in row)
+    target_dist2 = (s_norm2 - sum(s[i][i] ** 2 for i in range(n)) + sum((s[i][i] - 1.0) ** 2 for i in range(n))) / n
+    # sum_t ||x_t x_t' - S||^2 = sum_t ||x_t||^4 - T ||S||^2
+    fourth = math.fsum(sum(map(mul, row, row)) ** 2 for row in x_rows)
+    b_bar2 = max(0.0, (fourth - t * s_norm2) / (t * t * n))
+    shrinkage = 1.0 if target_dist2 <= 0 else min(1.0, b_bar2 / target_dist2)
+    matrix = [[(1.0 - shrinkage) * v for v in row] for row in s]
+    return _unit_diagonal(matrix), shrinkage
+
+
+def ewma_correlation(returns_by_symbol, lam=DEFAULT_EWMA_LAMBDA, gram=_gram):
+    """
+    Exponentially weighted (RiskMetrics, zero-mean) correlation: the most
+    recent return has weight 1 and each older one is scaled by `lam`.
+    """
+    if not 0 < lam < 1:
+        raise ValueError(f"EWMA lambda must be in (0, 1), got {lam}")
+    t = len(returns_by_symbol[0])
+    root_w = [math.sqrt(lam ** (t - 1 - k)) for k in range(t)]
+    weighted = []
+    for returns in returns_by_symbol:
+        w = list(map(mul, returns, root_w))
+        norm = math.sqrt(sum(map(mul, w, w)))
+        weighted.append([v / norm for v in w] if norm > 0 else [0.0] * t)
+    return _unit_diagonal(gram(weighted))
+
+
+def pairwise_correlation(returns_by_symbol, masks, min_overlap=MIN_ALIGNED_RETURNS):
+    """
+    Pearson correlation of each pair over the steps where both have a return.
+    Returns (matrix, sample_sizes); sample_sizes[i][i] is symbol i's own
+    return count. Pairs overlapping on fewer than `min_overlap` returns are
+    reported as 0.0.
+
+    Missing returns are zero and masked, so every masked sum is a plain inner
+    product: n = m_i.m_j, sum x = x_i.m_j, sum x^2 = x_i^2.m_j, sum xy = x_i.x_j.
+    That is six inner products per pair against the dense path's one, with no
+    per-pair realignment.
+    """
+    n = len(returns_by_symbol)
+    squares = [list(map(mul, r, r)) for r in returns_by_symbol]
+    matrix = [[0.0] * n for _ in range(n)]
+    sizes = [[0] * n for _ in range(n)]
+    for i in range(n):
+        xi, mi, qi = returns_by_symbol[i], masks[i], squares[i]
+        matrix[i][i] = 1.0
+        sizes[i][i] = int(sum(mi))
+        for j in range(i + 1, n):
+            xj, mj = returns_by_symbol[j], masks[j]
+            count = int(sum(map(mul, mi, mj)))
+            sizes[i][j] = sizes[j][i] = count
+            if count < max(2, min_overlap):
+                continue
+            sx, sy = sum(map(mul, xi, mj)), sum(map(mul, xj, mi))
+            vx = count * sum(map(mul, qi, mj)) - sx * sx
+            vy = count * sum(map(mul, squares[j], mi)) - sy * sy
+            if vx <= 0 or vy <= 0:
+                continue
+            corr = (count * sum(map(mul, xi, xj)) - sx * sy) / math.sqrt(vx * vy)
+            matrix[i][j] = matrix[j][i] = max(-1.0, min(1.0, corr))
+    return matrix, sizes
+
+
+def _pairwise_result(candles_by_symbol):
+    symbols, returns_by_symbol, masks = masked_returns(candles_by_symbol)
+    matrix, sizes = pairwise_correlation(returns_by_symbol, masks)
+    n = len(symbols)
+    overlaps = [sizes[i][j] for i in range(n) for j in range(i + 1, n)] or [sizes[0][0]]
+    if max(overlaps) < MIN_ALIGNED_RETURNS:
+        raise InsufficientDataError(f"Insufficient data: no pair of symbols has {MIN_ALIGNED_RETURNS} overlapping return observations.")
+    return {
+        "symbols": symbols,
+        # Smallest pairwise overlap; per-pair counts are in sample_sizes.
+        "sample_size": min(overlaps),
+        "engine": CORR_ENGINE_SAMPLE,
+        "matrix": matrix,
+        "alignment": CORR_ALIGN_PAIRWISE,
+        "sample_sizes": sizes,
+    }
+
+
+def compute_correlation(candles_by_symbol, engine=CORR_ENGINE_SAMPLE, ewma_lambda=DEFAULT_EWMA_LAMBDA, alignment=CORR_ALIGN_INTERSECTION, workers=1):
+    """
+    Correlation matrix over aligned log returns using `engine` (sample,
+    ledoit_wolf or ewma). Returns a dict with symbols, matrix, sample_size,
+    engine and the engine's parameter (shrinkage or ewma_lambda).
+
+    With alignment="pairwise" each pair is correlated over its own overlap
+    (sample engine only) and the dict also carries alignment and the
+    per-pair sample_sizes.
+
+    With workers > 1 the intersection engines split the matrix into row
+    blocks across that many processes; the result is identical.
+    """
+    if alignment == CORR_ALIGN_PAIRWISE:
+        if engine != CORR_ENGINE_SAMPLE:
+            raise ValueError(f"Pairwise alignment supports only the {CORR_ENGINE_SAMPLE} engine, got {engine}")
+        return _pairwise_result(candles_by_symbol)
+    if alignment != CORR_ALIGN_INTERSECTION:
+        raise ValueError(f"Unknown correlation alignment: {alignment} (expected one of {', '.join(CORR_ALIGNMENTS)})")
+    symbols, returns_by_symbol, sample_size = aligned_returns(candles_by_symbol)
+    result = {"symbols": symbols, "sample_size": sample_size, "engine": engine}
+    gram = _gram_for(workers)
+    if engine == CORR_ENGINE_SAMPLE:
+        result["matrix"] = sample_correlation(returns_by_symbol, gram)
+    elif engine == CORR_ENGINE_LEDOIT_WOLF:
+        result["matrix"], result["shrinkage"] = ledoit_wolf_correlation(returns_by_symbol, gram)
+    elif engine == CORR_ENGINE_EWMA:
+        result["matrix"] = ewma_correlation(returns_by_symbol, ewma_lambda, gram)
+        result["ewma_lambda"] = ewma_lambda
+    else:
+        raise ValueError(f"Unknown correlation engine: {engine} (expected one of {', '.join(CORR_ENGINES)})")
+    return result
+
+
+def compute_correlation_matrix(candles_by_symbol):
+    result = compute_correlation(candles_by_symbol)
+    return result["symbols"], result["matrix"], result["sample_size"]
@@ -0,0 +1,237 @@
+"""
+correlation_analysis.py
+Reduced-form summaries of a correlation matrix, computed once in the facts
+stage and stored in the facts pack (computed.correlation_analysis):
+
+- per-symbol average correlation (mean of the off-diagonal row) and the
+  overall mean pairwise correlation;
+- the top-k eigenvalues and the share of variance each explains (the first
+  is the market-factor concentration, "PC1 share");
+- average-linkage hierarchical clusters on distance 1 - correlation, cut at
+  a minimum average correlation.
+
+Downstream stages read these summaries instead of walking the n x n matrix.
+Pure Python (Lanczos for the eigenvalues), so results do not depend on
+whether numpy happens to be installed.
+"""
+from __future__ import annotations
+
+from operator import mul
+from typing import Any, Dict, List, Sequence
+
+DEFAULT_TOP_K = 3
+DEFAULT_CLUSTER_MIN_CORRELATION = 0.5
+
+# Lanczos stops once every wanted Ritz value moves less than this (relative) in one step.
+_LANCZOS_TOLERANCE = 1e-10
+_LANCZOS_MAX_STEPS = 200
+
+
+def average_correlation(symbols: Sequence[str], matrix: Sequence[Sequence[float]]) -> Dict[str, float]:
+    """Mean correlation of each symbol with every other symbol (row sum minus the diagonal)."""
+    n = len(symbols)
+    if n < 2:
+        return {s: 0.0 for s in symbols}
+    return {s: (sum(matrix[i]) - matrix[i][i]) / (n - 1) for i, s in enumerate(symbols)}
+
+
+def _matvec(matrix: Sequence[Sequence[float]], v: List[float]) -> List[float]:
+    return [sum(map(mul, row, v)) for row in matrix]
+
+
+def _dot(a: Sequence[float], b: Sequence[float]) -> float:
+    return sum(map(mul, a, b))
+
+
+def _normalise(v: List[float]) -> List[float]:
+    norm = _dot(v, v) ** 0.5
+    return [x / norm for x in v] if norm > 0 else v
+
+
+def _tridiagonal_count_below(alphas: Sequence[float], betas: Sequence[float], x: float) -> int:
+    # Sturm sequence: number of eigenvalues of the symmetric tridiagonal matrix below x.
+    count = 0
+    d = 1.0
+    for i, a in enumerate(alphas):
+        d = a - x - (betas[i - 1] ** 2 / d if i else 0.0)
+        if d == 0.0:
+            d = -1e-300
+        if d < 0:
+            count += 1
+    return count
+
+
+def _tridiagonal_top(alphas: Sequence[float], betas: Sequence[float], k: int) -> List[float]:
+    """Largest `k` eigenvalues of a symmetric tridiagonal matrix, by bisection."""
+    m = len(alphas)
+    radius = [abs(betas[i - 1]) if i else 0.0 for i in range(m)]
+    radius = [r + (abs(betas[i]) if i < m - 1 else 0.0) for i, r in enumerate(radius)]
+    lower = min(a - r for a, r in zip(alphas, radius))
+    upper = max(a + r for a, r in zip(alphas, radius))
+    values = []
+    for index in range(m - 1, max(m - k, 0) - 1, -1):
+        lo, hi = lower, upper
+        while hi - lo > 1e-14 * max(1.0, abs(lo), abs(hi)):
+            mid = (lo + hi) / 2
+            if _tridiagonal_count_below(alphas, betas, mid) <= index:
+                lo = mid
+            else:
+                hi = mid
+        values.append((lo + hi) / 2)
+    return values
+
+
+def _restart_vector(basis: Sequence[List[float]], n: int) -> List[float]:
+    # First unit vector with a component outside span(basis); only reached on Lanczos breakdown.
+    for r in range(n):
+        v = [0.0] * n
+        v[r] = 1.0
+        for u in basis:
+            d = _dot(v, u)
+            v = [x - d * y for x, y in zip(v, u)]
+        if _dot(v, v) > 1e-12:
+            return _normalise(v)
+    return []
+
+
+def _top_eigenvalues_lanczos(matrix: Sequence[Sequence[float]], k: int) -> List[float]:
+    """
+    Largest `k` eigenvalues by Lanczos with full reorthogonalisation. The
+    extreme Ritz values converge in a few dozen matrix-vector products, and
+    iteration stops as soon as the wanted eigenvalues stop moving. On an
+    invariant subspace (exact breakdown) Lanczos restarts orthogonally, so
+    repeated eigenvalues are still found.
+    """
+    n = len(matrix)
+    k = min(k, n)
+    # Deterministic, non-degenerate start vector.
+    q = _normalise([1.0 + (i % 7) / 10 for i in range(n)])
+    basis: List[List[float]] = []
+    alphas: List[float] = []
+    betas: List[float] = []
+    previous: List[float] = []
+    beta = 0.0
+    for _ in range(min(n, _LANCZOS_MAX_STEPS)):
+        basis.append(q)
+        w = _matvec(matrix, q)
+        alphas.append(_dot(w, q))
+        # Full reorthogonalisation (twice is enough) keeps the basis orthogonal in floating point.
+        for _pass in range(2):
+            for u in basis:
+                d = _dot(w, u)
+                w = [x - d * y for x, y in zip(w, u)]
+        values = _tridiagonal_top(alphas, betas, k)
+        if len(values) == k and previous and all(
+            abs(a - b) <= _LANCZOS_TOLERANCE * max(1.0, abs(a)) for a, b in zip(values, previous)
+        ):
+            return values
+        previous = values
+        beta = _dot(w, w) ** 0.5
+        if beta > 1e-10:
+            q = [x / beta for x in w]
+        else:
+            q = _restart_vector(basis, n)
+            beta = 0.0
+            if not q:
+                break
+        betas.append(beta)
+    return _tridiagonal_top(alphas, betas[: len(alphas) - 1], k)
+
+
+def top_eigenvalues(matrix: Sequence[Sequence[float]], k: int = DEFAULT_TOP_K) -> List[float]:
+    """Largest `k` eigenvalues of a symmetric matrix, in descending order."""
+    if not matrix:
+        return []
+    return _top_eigenvalues_lanczos(matrix, k)
+
+
+def hierarchical_clusters(
+    symbols: Sequence[str],
+    matrix: Sequence[Sequence[float]],
+    min_correlation: float = DEFAULT_CLUSTER_MIN_CORRELATION,
+) -> List[List[str]]:
+    """
+    Average-linkage clusters on distance 1 - correlation, cut where the
+    average correlation between two clusters falls below `min_correlation`.
+
+    Uses the nearest-neighbour-chain algorithm, so the full dendrogram costs
+    O(n^2) distance updates rather than O(n^3). Clusters are returned largest
+    first, members in input order.
+    """
+    n = len(symbols)
+    max_distance = 1.0 - min_correlation
+    dist: Dict[int, Dict[int, float]] = {i: {j: 1.0 - matrix[i][j] for j in range(n) if j != i} for i in range(n)}
+    size = {i: 1 for i in range(n)}
+    parent: Dict[int, int] = {}
+    next_id = n
+    chain: List[int] = []
+    while len(dist) > 1:
+        if not chain:
+            chain.append(min(dist))
+        a = chain[-1]
+        prev = chain[-2] if len(chain) > 1 else None
+        # Ties go to the previous chain element, then to the lowest id, so the result is deterministic.
+        b = min(dist[a], key=lambda j: (dist[a][j], j != prev, j))
+        if b != prev:
+            chain.append(b)
+            continue
+        chain.pop()
+        chain.pop()
+        d_ab = dist[a][b]
+        new = next_id
+        next_id += 1
+        if d_ab <= max_distance:
+            parent[a] = new
+            parent[b] = new
+        row_a, row_b = dist.pop(a), dist.pop(b)
+        new_row = {}
+        for k in dist:
+            # Lance-Williams update for average linkage.
+            new_row[k] = (size[a] * row_a[k] + size[b] * row_b[k]) / (size[a] + size[b])
+            del dist[k][a], dist[k][b]
+            dist[k][new] = new_row[k]
+        dist[new] = new_row
+        size[new] = size[a] + size[b]
+
+    groups: Dict[int, List[str]] = {}
+    for i, s in enumerate(symbols):
+        root = i
+        while root in parent:
+            root = parent[root]
+        groups.setdefault(root, []).append(s)
+    order = {s: i for i, s in enumerate(symbols)}
+    return sorted(groups.values(), key=lambda g: (-len(g), order[g[0]]))
+
+
+def _mean_within(members: Sequence[int], matrix: Sequence[Sequence[float]]) -> float:
+    if len(members) < 2:
+        return 1.0
+    total = sum(matrix[i][j] for i in members for j in members if i != j)
+    return total / (len(members) * (len(members) - 1))
+
+
+def analyse_correlation(
+    symbols: Sequence[str],
+    matrix: Sequence[Sequence[float]],
+    top_k: int = DEFAULT_TOP_K,
+    cluster_min_correlation: float = DEFAULT_CLUSTER_MIN_CORRELATION,
+) -> Dict[str, Any]:
+    """The computed.correlation_analysis section of the facts pack."""
+    n = len(symbols)
+    avg = average_correlation(symbols, matrix)
+    eigenvalues = top_eigenvalues(matrix, top_k)
+    index = {s: i for i, s in enumerate(symbols)}
+    clusters = hierarchical_clusters(symbols, matrix, cluster_min_correlation)
+    return {
+        "mean_correlation": sum(avg.values()) / n if n > 1 else 0.0,
+        "average_correlation": avg,
+        "eigenvalues": eigenvalues,
+        # The trace of a correlation matrix is n, so lambda / n is the share of variance explained.
+        "explained_variance": [v / n for v in eigenvalues],
+        "pc1_share": eigenvalues[0] / n if eigenvalues else 0.0,
+        "cluster_min_correlation": cluster_min_correlation,
+        "clusters": [
+            {"symbols": members, "mean_correlation": _mean_within([index[s] for s in members], matrix)}
+            for members in clusters
+        ],
+    }
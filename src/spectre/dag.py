@@ -0,0 +1,176 @@
+"""
+dag.py
+Minimal DAG executor with content-hash artifact caching.
+
+Each stage's cache key is a hash of its name, its parameters and the keys of
+the stages it depends on, so a key changes whenever anything upstream of the
+stage changes. Keys are therefore known before any stage runs. Stages whose
+key is already in the cache are loaded instead of run; stages whose
+dependencies are satisfied run concurrently. Stages marked cacheable=False
+(those reading live data their key cannot capture) always run.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from spectre import json_backend
+from spectre.metrics import time_pass
+from spectre.profiling import profile_pass
+
+
+class DagError(Exception):
+    pass
+
+
+@dataclass
+class Stage:
+    name: str
+    # Called with the outputs of `deps` as keyword arguments; must return a JSON-serialisable dict.
+    run: Callable[..., Dict[str, Any]]
+    deps: Tuple[str, ...] = ()
+    params: Dict[str, Any] = field(default_factory=dict)
+    # False when the output depends on live data outside the key; the stage is then never cached.
+    cacheable: bool = True
+
+
+@dataclass
+class DagResult:
+    outputs: Dict[str, Dict[str, Any]]
+    keys: Dict[str, str]
+    ran: List[str]
+    cached: List[str]
+
+
+def file_digest(path: str | Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+class ArtifactCache:
+    """Stores stage outputs as <root>/<stage>/<key>.json."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.root / stage / f"{key}.json"
+
+    def get(self, stage: str, key: str) -> Optional[Dict[str, Any]]:
+        p = self._path(stage, key)
+        if not p.exists():
+            return None
+        try:
+            return json_backend.loads(p.read_bytes())
+        except (OSError, ValueError):
+            # A corrupt or half-written entry is treated as a miss.
+            return None
+
+    def put(self, stage: str, key: str, doc: Dict[str, Any]) -> None:
+        p = self._path(stage, key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(json_backend.dumps(doc))
+        os.replace(tmp, p)
+
+
+def _topological_order(stages: List[Stage]) -> List[Stage]:
+    by_name = {s.name: s for s in stages}
+    if len(by_name) != len(stages):
+        raise DagError("Duplicate stage names.")
+    order: List[Stage] = []
+    state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+    def visit(name: str) -> None:
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise DagError(f"Cycle detected at stage {name}.")
+        if name not in by_name:
+            raise DagError(f"Unknown dependency: {name}")
+        state[name] = 1
+        for dep in by_name[name].deps:
+            visit(dep)
+        state[name] = 2
+        order.append(by_name[name])
+
+    for s in stages:
+        visit(s.name)
+    return order
+
+
+def stage_keys(stages: List[Stage]) -> Dict[str, str]:
+    keys: Dict[str, str] = {}
+    for s in _topological_order(stages):
+        payload = {
+            "stage": s.name,
+            "params": s.params,
+            "deps": {d: keys[d] for d in s.deps},
+        }
+        blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        keys[s.name] = hashlib.sha256(blob.encode("utf-8")).hexdigest()
+    return keys
+
+
+def run_dag(
+    stages: List[Stage],
+    cache: Optional[ArtifactCache] = None,
+    *,
+    max_workers: int = 4,
+    log: Callable[[str], None] = lambda _msg: None,
+) -> DagResult:
+    """
+    Run `stages`, skipping any whose key is present in `cache`.
+    The first stage failure is re-raised once running stages have finished.
+    """
+    order = _topological_order(stages)
+    keys = stage_keys(stages)
+    outputs: Dict[str, Dict[str, Any]] = {}
+    ran: List[str] = []
+    cached: List[str] = []
+
+    # Resolve cache hits up front; only misses need scheduling.
+    pending: List[Stage] = []
+    for s in order:
+        hit = cache.get(s.name, keys[s.name]) if cache is not None and s.cacheable else None
+        if hit is not None:
+            outputs[s.name] = hit
+            cached.append(s.name)
+            log(f"[{s.name}] cached ({keys[s.name][:12]})")
+        else:
+            pending.append(s)
+
+    def _run(s: Stage) -> Dict[str, Any]:
+        log(f"[{s.name}] running...")
+        with time_pass(s.name), profile_pass(s.name):
+            out = s.run(**{d: outputs[d] for d in s.deps})
+        if cache is not None and s.cacheable:
+            cache.put(s.name, keys[s.name], out)
+        return out
+
+    error: Optional[BaseException] = None
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running: Dict[Any, Stage] = {}
+        while pending or running:
+            if error is None:
+                for s in [s for s in pending if all(d in outputs for d in s.deps)]:
+                    pending.remove(s)
+                    running[pool.submit(_run, s)] = s
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                s = running.pop(fut)
+                try:
+                    outputs[s.name] = fut.result()
+                    ran.append(s.name)
+                except BaseException as e:  # noqa: BLE001 - re-raised below
+                    if error is None:
+                        error = e
+    if error is not None:
+        raise error
+    return DagResult(outputs=outputs, keys=keys, ran=ran, cached=cached)
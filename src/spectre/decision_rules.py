@@ -1,31 +1,52 @@
 """
 decision_rules.py
 Deterministic decision packet builder for spectre.
+
+Vols are read from computed.realised_vol_annualised and the mean correlation
+from computed.correlation_analysis (or the computed.correlation matrix).
+Older packs with top-level symbol_stats / correlations keys are still read.
 """
-from typing import Dict, Any, List
-import statistics
+from typing import Dict, Any, List, Optional, Tuple
+
+from spectre.correlation_analysis import average_correlation
+
+
+def _vol_by_symbol(facts_pack: Dict[str, Any]) -> Dict[str, float]:
+    computed = facts_pack.get("computed", {})
+    if "realised_vol_annualised" in computed:
+        return computed["realised_vol_annualised"]
+    # Older packs kept per-symbol stats at the top level.
+    symbol_stats = facts_pack.get("symbol_stats", {})
+    return {s: stats.get("realised_vol_annualised", 0.0) for s, stats in symbol_stats.items()}
+
+
+def _correlation_summary(facts_pack: Dict[str, Any]) -> Tuple[float, Optional[Dict[str, Any]]]:
+    """Mean pairwise correlation and the correlation_analysis section, if the pack has one."""
+    computed = facts_pack.get("computed", {})
+    analysis = computed.get("correlation_analysis")
+    if analysis:
+        return analysis["mean_correlation"], analysis
+    # No precomputed analysis: mean off-diagonal correlation from row sums.
+    corr_matrix = computed.get("correlation", {}).get("matrix") or facts_pack.get("correlations", {}).get("matrix", [])
+    n = len(corr_matrix)
+    if n < 2:
+        return 0.0, None
+    return sum(average_correlation(range(n), corr_matrix).values()) / n, None
+
 
 def build_decision_packet(facts_pack: Dict[str, Any]) -> Dict[str, Any]:
     symbols = facts_pack.get("universe", {}).get("symbols", [])
-    symbol_stats = facts_pack.get("symbol_stats", {})
-    correlations = facts_pack.get("correlations", {})
+    vol_by_symbol = _vol_by_symbol(facts_pack)
     warnings = facts_pack.get("warnings", [])
     as_of_utc = facts_pack.get("as_of_utc")
 
     # Extract realised_vol_annualised for all symbols
-    vols = [symbol_stats[s].get("realised_vol_annualised", 0.0) for s in symbols if s in symbol_stats]
+    vols = [vol_by_symbol[s] for s in symbols if s in vol_by_symbol]
     max_vol = max(vols) if vols else 0.0
     min_vol = min(vols) if vols else 0.0
 
-    # Compute average pairwise correlation (off-diagonal only)
-    corr_matrix = correlations.get("matrix", [])
-    n = len(corr_matrix)
-    off_diag = []
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                off_diag.append(corr_matrix[i][j])
-    avg_corr = statistics.mean(off_diag) if off_diag else 0.0
+    # Average pairwise correlation (off-diagonal only), precomputed in the facts stage
+    avg_corr, analysis = _correlation_summary(facts_pack)
 
     # Regime
     if any(v > 0.80 for v in vols):
@@ -75,7 +96,7 @@ def build_decision_packet(facts_pack: Dict[str, Any]) -> Dict[str, Any]:
     allowed_symbols = list(symbols)
     blocked_symbols = []
     for idx, s in enumerate(symbols):
-        v = symbol_stats.get(s, {}).get("realised_vol_annualised", 0.0)
+        v = vol_by_symbol.get(s, 0.0)
         if v > 1.00:
             blocked_symbols.append(s)
     allowed_symbols = [s for s in allowed_symbols if s not in blocked_symbols]
@@ -91,6 +112,15 @@ def build_decision_packet(facts_pack: Dict[str, Any]) -> Dict[str, Any]:
             "rationale": f"Average pairwise correlation is {avg_corr:.2f}."
         }
     ]
+    if analysis:
+        largest = max((len(c["symbols"]) for c in analysis["clusters"]), default=0)
+        top_risks.append({
+            "risk": "Concentration",
+            "rationale": (
+                f"First principal component explains {analysis['pc1_share']:.0%} of return variance; "
+                f"largest correlation cluster holds {largest} of {len(symbols)} symbols."
+            )
+        })
     if warnings:
         top_risks.append({
             "risk": "Data quality",
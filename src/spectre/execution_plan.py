@@ -1,22 +1,58 @@
 
 
 import json
-from typing import Dict, Any, List
-import requests
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 from decimal import Decimal, ROUND_DOWN, InvalidOperation
-from spectre.binance_public import fetch_exchange_info
+from spectre import binance_public
+from spectre.binance_public import fetch_exchange_info, fetch_ticker_prices
+from spectre.metrics import record_plan
+from spectre.rebalance import DEFAULT_TURNOVER_THRESHOLD, SIDE_BUY, SIDE_SELL, base_asset, rebalance_deltas, rebalance_symbols
+from spectre.sizing import SIZING_EQUAL, SIZING_MODES, SizingError, allocate_notional
+from spectre.venues import BinanceVenue, VenueAdapter, positive_or_none
 
 
-SCHEMA_VERSION = "1.3"
-VENUE = "binance"
+SCHEMA_VERSION = "1.4"
+VENUE = "binance"  # name of the default venue
 MODE = "dry_run"
 QUOTE_CURRENCY = "USDT"
 NOTIONAL_BUDGET_QUOTE = 50.0  # Default value, can be overridden by env var
 MIN_ORDER_NOTIONAL = 5.0
 
 
-def build_execution_plan(facts_pack: Dict[str, Any], decision_packet: Dict[str, Any], facts_pack_path: str, decision_packet_path: str) -> Dict[str, Any]:
+def __getattr__(name):
+    # ep.requests is the requests module binance_public calls through, imported
+    # on first use; patching ep.requests.get stubs the price fetch.
+    if name == "requests":
+        return binance_public._requests()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _BinanceVenue(BinanceVenue):
+    # The default venue. Rules and prices are looked up through this module's
+    # fetch_exchange_info / fetch_ticker_prices, which tests and benchmarks replace.
+    def fetch_rules(self, symbols):
+        return fetch_exchange_info(list(symbols))
+
+    def fetch_prices(self, symbols):
+        return positive_or_none(fetch_ticker_prices(), symbols)
+
+
+def build_execution_plan(facts_pack: Dict[str, Any], decision_packet: Dict[str, Any], facts_pack_path: str, decision_packet_path: str, sizing: Optional[str] = None,
+                         portfolio_state: Optional[Dict[str, Any]] = None, portfolio_state_path: Optional[str] = None,
+                         turnover_threshold: float = DEFAULT_TURNOVER_THRESHOLD, venue: Optional[VenueAdapter] = None) -> Dict[str, Any]:
+    """
+    Dry-run plan for the decision packet's allowed symbols.
+
+    Without `portfolio_state` every allowed symbol gets a BUY for its full
+    target notional. With it ({"balances": {...}}) targets are diffed against
+    current holdings (see spectre.rebalance): held symbols that are no longer
+    allowed are sold, and trades below min-notional or `turnover_threshold`
+    x budget are suppressed.
+
+    Prices and exchange rules come from `venue` (see spectre.venues), Binance
+    public REST by default; the plan's `venue` field records its name.
+    """
     import os
     # Allow override of NOTIONAL_BUDGET_QUOTE via env var
     env_budget = os.environ.get("SPECTRE_BUDGET_QUOTE", "")
@@ -32,34 +68,36 @@ def build_execution_plan(facts_pack: Dict[str, Any], decision_packet: Dict[str,
                 budget_override_invalid = True
         except Exception:
             budget_override_invalid = True
+    # Sizing mode: argument, else SPECTRE_SIZING, else equal split (see spectre.sizing)
+    sizing_mode = sizing or os.environ.get("SPECTRE_SIZING", "") or SIZING_EQUAL
+    sizing_invalid = sizing_mode not in SIZING_MODES
 
-    # Fetch public prices from Binance
-    # Fetch public prices from Binance
+    # Fetch public prices from the venue
+    if venue is None:
+        venue = _BinanceVenue()
     allowed_symbols = decision_packet.get("allowed_symbols", [])
+    balances = (portfolio_state or {}).get("balances", {})
+    # Held symbols that are not allowed any more are priced too, so they can be sold.
+    priced_symbols = rebalance_symbols(allowed_symbols, balances, QUOTE_CURRENCY) if portfolio_state is not None else allowed_symbols
     pricing = {
         "as_of_utc": datetime.utcnow().replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-        "source": "binance_public",
+        "source": venue.price_source,
         "prices": {}
     }
     try:
-        resp = requests.get("https://api.binance.com/api/v3/ticker/price", timeout=10)
-        resp.raise_for_status()
-        all_prices = {item["symbol"]: float(item["price"]) for item in resp.json()}
-        for symbol in allowed_symbols:
-            price = all_prices.get(symbol)
-            if price and price > 0:
-                pricing["prices"][symbol] = price
+        prices = venue.fetch_prices(priced_symbols)
+        pricing["prices"] = {symbol: price for symbol, price in prices.items() if price is not None}
     except Exception:
-        for symbol in allowed_symbols:
+        for symbol in priced_symbols:
             pricing["prices"][symbol] = None
 
     # Fetch exchange rules for allowed_symbols
     exchange_rules = {
         "as_of_utc": datetime.utcnow().replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z'),
-        "source": "binance_exchange_info",
+        "source": venue.rules_source,
         "symbols": {}
     }
-    rules = fetch_exchange_info(allowed_symbols)
+    rules = venue.fetch_rules(priced_symbols)
     for symbol, rule in rules.items():
         exchange_rules["symbols"][symbol] = rule
     as_of_utc = decision_packet.get("as_of_utc")
@@ -75,9 +113,17 @@ def build_execution_plan(facts_pack: Dict[str, Any], decision_packet: Dict[str,
             "symbol": "*",
             "message": f"Invalid SPECTRE_BUDGET_QUOTE={env_budget}; using default 50.0"
         })
+    if sizing_invalid:
+        refusals.append({
+            "code": "BAD_SIZING_MODE",
+            "symbol": "*",
+            "message": f"Unknown sizing mode {sizing_mode}; expected one of {', '.join(SIZING_MODES)}"
+        })
+        sizing_mode = SIZING_EQUAL
 
     orders: List[Dict[str, Any]] = []
     plan_action = None
+    rebalance = None
 
     if strategy_mode == "do_nothing":
         refusals.append({
@@ -101,11 +147,35 @@ def build_execution_plan(facts_pack: Dict[str, Any], decision_packet: Dict[str,
         })
         plan_action = "no_action"
     elif strategy_mode in ("trend", "mean_revert", "reduce_risk"):
-        per_order_notional = round(budget_quote / len(allowed_symbols), 2) if allowed_symbols else 0
+        try:
+            notional_by_symbol = allocate_notional(
+                allowed_symbols, facts_pack, budget_quote, sizing_mode,
+                max_gross_exposure, decision_packet.get("vol_target_annualised"),
+            )
+        except SizingError as e:
+            refusals.append({"code": e.code, "symbol": e.symbol, "message": str(e)})
+            notional_by_symbol = {}
+        side_by_symbol = {s: SIDE_BUY for s in notional_by_symbol}
+        if portfolio_state is not None and notional_by_symbol:
+            deltas, current_notional, suppressed = rebalance_deltas(
+                priced_symbols, notional_by_symbol, balances, pricing["prices"], rules,
+                QUOTE_CURRENCY, budget_quote, MIN_ORDER_NOTIONAL, turnover_threshold,
+            )
+            rebalance = {
+                "turnover_threshold": turnover_threshold,
+                "current_notional": current_notional,
+                "target_notional": {s: notional_by_symbol.get(s, 0.0) for s in priced_symbols},
+                "suppressed": suppressed,
+            }
+            notional_by_symbol = {s: notional for s, (_, notional) in deltas.items()}
+            side_by_symbol = {s: side for s, (side, _) in deltas.items()}
         orderable_symbols = []
-        for symbol in allowed_symbols:
+        for symbol in notional_by_symbol:
             refused = False
-            if per_order_notional < MIN_ORDER_NOTIONAL:
+            per_order_notional = notional_by_symbol[symbol]
+            side = side_by_symbol[symbol]
+            # Rebalance deltas below the minimum were already suppressed.
+            if rebalance is None and per_order_notional < MIN_ORDER_NOTIONAL:
                 refusals.append({
                     "code": "BELOW_MIN_NOTIONAL",
                     "symbol": symbol,
@@ -143,6 +213,10 @@ def build_execution_plan(facts_pack: Dict[str, Any], decision_packet: Dict[str,
             if not refused:
                 try:
                     raw_qty = Decimal(str(per_order_notional)) / Decimal(str(price_used))
+                    if side == SIDE_SELL:
+                        # Never sell more than is held (a full exit is exactly the balance).
+                        held = Decimal(str(balances.get(base_asset(symbol, QUOTE_CURRENCY, rule), 0.0)))
+                        raw_qty = min(raw_qty, held)
                 except (InvalidOperation, ZeroDivisionError):
                     refusals.append({
                         "code": "BAD_PRICE",
@@ -188,7 +262,7 @@ def build_execution_plan(facts_pack: Dict[str, Any], decision_packet: Dict[str,
             if not refused:
                 orders.append({
                     "symbol": symbol,
-                    "side": "BUY",
+                    "side": side,
                     "order_type": "MARKET",
                     "notional_quote": float(per_order_notional),
                     "price_used": float(price_used),
@@ -197,13 +271,14 @@ def build_execution_plan(facts_pack: Dict[str, Any], decision_packet: Dict[str,
                     "min_qty_used": float(min_qty),
                     "min_notional_used": float(min_notional),
                     "rationale": f"{strategy_mode} strategy, risk_score={risk_score}"
+                    + ("" if sizing_mode == SIZING_EQUAL else f", sizing={sizing_mode}")
                 })
                 orderable_symbols.append(symbol)
         # After all processing, enforce all-or-nothing: any refusal means no orders/action
         if refusals:
             orders.clear()
             plan_action = "no_action"
-        elif len(orderable_symbols) == len(allowed_symbols) and len(orderable_symbols) > 0:
+        elif orderable_symbols:
             plan_action = "rebalance"
         else:
             plan_action = "no_action"
@@ -222,10 +297,10 @@ def build_execution_plan(facts_pack: Dict[str, Any], decision_packet: Dict[str,
     }
     # Top-level audit fields
     as_of_utc = datetime.utcnow().replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
-    return {
+    execution_plan = {
         "schema_version": SCHEMA_VERSION,
         "as_of_utc": as_of_utc,
-        "venue": VENUE,
+        "venue": venue.name,
         "mode": MODE,
         "inputs": {
             "facts_pack_path": facts_pack_path,
@@ -240,3 +315,9 @@ def build_execution_plan(facts_pack: Dict[str, Any], decision_packet: Dict[str,
         "plan": plan,
         "refusals": refusals
     }
+    if portfolio_state_path:
+        execution_plan["inputs"]["portfolio_state_path"] = portfolio_state_path
+    if rebalance is not None:
+        execution_plan["rebalance"] = rebalance
+    record_plan(execution_plan)
+    return execution_plan
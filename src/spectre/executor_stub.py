@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any, Dict
 
+from spectre import json_backend
+
 
 def load_execution_plan(path: str | Path) -> Dict[str, Any]:
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"Execution plan not found: {p}")
-    return json.loads(p.read_text(encoding="utf-8"))
+    return json_backend.loads(p.read_bytes())
 
 
 def preview_execution_plan(plan: Dict[str, Any]) -> str:
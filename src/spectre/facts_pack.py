@@ -1,11 +1,11 @@
 from datetime import datetime, timezone
-from dateutil import parser
+from spectre.candles import CandleSeries
 
 SCHEMA_VERSION = "1.0"
 
 
-def build_facts_pack(symbols, lookback_days, candles_by_symbol, vol_by_symbol, corr_symbols, corr_matrix, sample_size, provenance_note=None, warnings=None):
-    now_utc = datetime.utcnow().replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
+def build_facts_pack(symbols, lookback_days, candles_by_symbol, vol_by_symbol, corr_symbols, corr_matrix, sample_size, provenance_note=None, warnings=None, validation=None, as_of_utc=None, candle="1d", source_name="Binance Spot Public REST", correlation_analysis=None, correlation_meta=None, venue_comparison=None, symbol_stats=None):
+    now_utc = as_of_utc or datetime.utcnow().replace(tzinfo=timezone.utc).isoformat().replace('+00:00', 'Z')
     facts = {
         "schema_version": SCHEMA_VERSION,
         "as_of_utc": now_utc,
@@ -14,11 +14,12 @@ def build_facts_pack(symbols, lookback_days, candles_by_symbol, vol_by_symbol, c
             "symbols": symbols
         },
         "timeframe": {
-            "candle": "1d",
+            "candle": candle,
             "lookback_days": lookback_days
         },
         "market_data": {
-            "candles": candles_by_symbol
+            # Columnar series are only rendered to ISO-timestamped rows here.
+            "candles": {s: c.to_candles() if isinstance(c, CandleSeries) else c for s, c in candles_by_symbol.items()}
         },
         "computed": {
             "realised_vol_annualised": {s: vol_by_symbol[s] for s in symbols},
@@ -30,7 +31,7 @@ def build_facts_pack(symbols, lookback_days, candles_by_symbol, vol_by_symbol, c
         "provenance": {
             "sources": [
                 {
-                    "name": "Binance Spot Public REST",
+                    "name": source_name,
                     "type": "market_data",
                     "retrieved_at_utc": now_utc,
                     "note": provenance_note or "/api/v3/klines"
@@ -38,6 +39,28 @@ def build_facts_pack(symbols, lookback_days, candles_by_symbol, vol_by_symbol, c
             ]
         }
     }
+    if symbol_stats:
+        # ATR, drawdown, momentum, downside vol and dollar volume (see spectre.compute.compute_symbol_stats)
+        facts["computed"]["symbol_stats"] = symbol_stats
+    if correlation_meta:
+        # Estimator used for the matrix (engine, shrinkage intensity, EWMA decay)
+        facts["computed"]["correlation"].update(correlation_meta)
+    if correlation_analysis:
+        # Cluster / eigenvalue / per-symbol summaries (see spectre.correlation_analysis)
+        facts["computed"]["correlation_analysis"] = correlation_analysis
+    if venue_comparison:
+        # The same symbols on other venues (see spectre.venues), each listed as a source
+        facts["computed"]["venue_comparison"] = venue_comparison
+        for venue, entry in venue_comparison.items():
+            facts["provenance"]["sources"].append({
+                "name": entry["source"],
+                "type": "market_data",
+                "retrieved_at_utc": now_utc,
+                "note": f"venue comparison: {venue}"
+            })
+    if validation:
+        # Which validation tier the pack was checked with (see spectre.schema_registry)
+        facts["provenance"]["validation"] = validation
     if warnings:
         facts["warnings"] = warnings
     return facts
@@ -0,0 +1,68 @@
+"""
+facts_writer.py
+Streaming facts pack writer.
+
+Writes the facts pack section by section: the header first, then each
+symbol's candles as soon as they are available, then the computed section,
+provenance and warnings. Output is compact JSON with the same key order (and
+bytes) as json.dumps(facts_pack, separators=(",", ":")).
+"""
+from __future__ import annotations
+
+import json
+from typing import IO, Any, Dict, List, Union
+
+from spectre.candles import CandleSeries
+
+# Top-level keys, in document order, either side of market_data.
+HEADER_KEYS = ("schema_version", "as_of_utc", "universe", "timeframe")
+FOOTER_KEYS = ("computed", "provenance", "warnings", "telemetry")
+
+_SEPARATORS = (",", ":")
+_CANDLE_ROW = '{"t":"%s","o":%r,"h":%r,"l":%r,"c":%r,"v":%r}'
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=_SEPARATORS)
+
+
+class FactsPackWriter:
+    """
+    Usage:
+        writer = FactsPackWriter(f)
+        writer.write_header(facts)            # keys before market_data
+        writer.write_candles(symbol, candles) # once per symbol
+        writer.write_footer(facts)            # keys after market_data
+    """
+
+    def __init__(self, fp: IO[str]):
+        self._fp = fp
+        self._symbols_written = 0
+        self._state = "new"
+
+    def write_header(self, facts: Dict[str, Any]) -> None:
+        if self._state != "new":
+            raise RuntimeError("Header already written.")
+        parts = [f"{_dumps(k)}:{_dumps(facts[k])}" for k in HEADER_KEYS if k in facts]
+        self._fp.write("{" + ",".join(parts) + ',"market_data":{"candles":{')
+        self._state = "candles"
+
+    def write_candles(self, symbol: str, candles: Union[CandleSeries, List[Dict[str, Any]]]) -> None:
+        if self._state != "candles":
+            raise RuntimeError("Candles must be written after the header and before the footer.")
+        prefix = "," if self._symbols_written else ""
+        # Rows are formatted straight from the candle fields; float repr matches json.dumps.
+        if isinstance(candles, CandleSeries):
+            fields = zip(candles.iso_times(), candles.o, candles.h, candles.l, candles.c, candles.v)
+            rows = ",".join([_CANDLE_ROW % row for row in fields])
+        else:
+            rows = ",".join([_CANDLE_ROW % (c["t"], c["o"], c["h"], c["l"], c["c"], c["v"]) for c in candles])
+        self._fp.write(f"{prefix}{_dumps(symbol)}:[{rows}]")
+        self._symbols_written += 1
+
+    def write_footer(self, facts: Dict[str, Any]) -> None:
+        if self._state != "candles":
+            raise RuntimeError("Header must be written before the footer.")
+        parts = [f"{_dumps(k)}:{_dumps(facts[k])}" for k in FOOTER_KEYS if k in facts]
+        self._fp.write("}}" + "".join("," + p for p in parts) + "}")
+        self._state = "done"
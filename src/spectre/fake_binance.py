@@ -0,0 +1,322 @@
+"""
+fake_binance.py
+Local stand-in for the Binance Spot public REST API, for offline load tests.
+
+Serves the endpoints Spectre calls:
+
+    GET /api/v3/klines         symbol, interval, limit (max 1000), startTime, endTime
+    GET /api/v3/exchangeInfo   symbols (JSON list) or every listed symbol
+    GET /api/v3/ticker/price   symbol, symbols or every listed symbol
+    GET /api/v3/ticker/24hr    symbol, symbols or every listed symbol
+
+Klines come from recorded rows where given and are otherwise synthesised:
+a deterministic random walk per (symbol, interval), seeded from the names,
+with the newest bar open at `now_ms`. Every response goes through the
+server's limits:
+
+- latency: each request sleeps `latency_s` (plus up to `jitter_s`)
+- request weight: each request costs the Binance weight of its endpoint and
+  parameters (spectre.rate_limit.request_weight), counted per fixed
+  wall-clock window of `window_s`, as Binance counts per clock minute.
+  Responses carry X-MBX-USED-WEIGHT-1M. A request that would exceed
+  `weight_limit` gets 429 with Retry-After. With `ban_after_429s`, further
+  requests in that window get 418.
+
+Point Spectre at it with SPECTRE_BINANCE_BASE_URL:
+
+    with FakeBinanceServer(FakeBinanceConfig(latency_s=0.05, weight_limit=1200)) as server:
+        os.environ["SPECTRE_BINANCE_BASE_URL"] = server.base_url
+        ...
+
+or run it standalone: python -m spectre.fake_binance --port 8901 --latency-ms 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from spectre.rate_limit import KLINES_DEFAULT_LIMIT, USED_WEIGHT_HEADER, request_weight
+from spectre.resample import interval_ms
+
+KLINES_MAX_LIMIT = 1000
+DEFAULT_SYMBOLS = ("BTCUSDT", "ETHUSDT", "BNBUSDT", "SOLUSDT", "XRPUSDT")
+
+
+@dataclass
+class FakeBinanceConfig:
+    symbols: Sequence[str] = DEFAULT_SYMBOLS
+    latency_s: float = 0.0
+    jitter_s: float = 0.0
+    weight_limit: Optional[int] = 6000
+    window_s: float = 60.0
+    ban_after_429s: Optional[int] = None
+    history_bars: int = 3000
+    now_ms: Optional[int] = None
+    # Recorded kline rows (Binance format, oldest first): {symbol: {interval: rows}}.
+    klines: Dict[str, Dict[str, List[List[Any]]]] = field(default_factory=dict)
+
+
+def _synthetic_klines(symbol: str, interval: str, bars: int, now_ms: int) -> List[List[Any]]:
+    step = interval_ms(interval)
+    last_open = now_ms // step * step
+    rng = random.Random(zlib.crc32(f"{symbol}/{interval}".encode()))
+    price = 1.0 + 999.0 * rng.random()
+    scale = 0.02 * math.sqrt(step / 86_400_000)
+    # Daily quote volume between ~3M and ~3B, so universe screens have something to rank.
+    quote_per_bar = 10 ** (6.5 + 3.0 * rng.random()) * step / 86_400_000
+    rows = []
+    for i in range(bars):
+        open_ms = last_open - (bars - 1 - i) * step
+        o = price
+        price *= math.exp(rng.gauss(0, scale))
+        h, low = max(o, price) * (1 + scale * rng.random()), min(o, price) * (1 - scale * rng.random())
+        qv = quote_per_bar * (0.5 + rng.random())
+        v = qv / price
+        rows.append([
+            open_ms, f"{o:.8f}", f"{h:.8f}", f"{low:.8f}", f"{price:.8f}", f"{v:.8f}",
+            open_ms + step - 1, f"{qv:.8f}", int(qv // 500) + 1, f"{v / 2:.8f}", f"{qv / 2:.8f}", "0",
+        ])
+    return rows
+
+
+class FakeBinance:
+    """Request handling and limit accounting, independent of the HTTP layer."""
+
+    def __init__(self, config: FakeBinanceConfig = FakeBinanceConfig()):
+        self.config = config
+        self._series: Dict[Tuple[str, str], List[List[Any]]] = {}
+        self._lock = threading.Lock()
+        self._window = -1
+        self._used = 0
+        self._rejected_in_window = 0
+        self._in_flight = 0
+        self.stats: Dict[str, Any] = {"requests": {}, "status": {}, "max_in_flight": 0}
+
+    def now_ms(self) -> int:
+        return self.config.now_ms if self.config.now_ms is not None else int(time.time() * 1000)
+
+    def klines_for(self, symbol: str, interval: str) -> List[List[Any]]:
+        recorded = self.config.klines.get(symbol, {}).get(interval)
+        if recorded is not None:
+            return recorded
+        key = (symbol, interval)
+        with self._lock:
+            rows = self._series.get(key)
+            if rows is None:
+                rows = self._series[key] = _synthetic_klines(symbol, interval, self.config.history_bars, self.now_ms())
+        return rows
+
+    def _charge(self, weight: int) -> Tuple[int, int, Dict[str, str]]:
+        """Count `weight` against the current window; returns (status, used weight, extra headers)."""
+        now = time.time()
+        window = int(now // self.config.window_s)
+        with self._lock:
+            if window != self._window:
+                self._window, self._used, self._rejected_in_window = window, 0, 0
+            retry_after = str(max(1, math.ceil((window + 1) * self.config.window_s - now)))
+            limit = self.config.weight_limit
+            if limit is not None and self._used + weight > limit:
+                self._rejected_in_window += 1
+                banned = self.config.ban_after_429s is not None and self._rejected_in_window > self.config.ban_after_429s
+                return (418 if banned else 429), self._used, {"Retry-After": retry_after}
+            self._used += weight
+            return 200, self._used, {}
+
+    def handle(self, path: str, params: Dict[str, str]) -> Tuple[int, Dict[str, str], Any]:
+        """Serve one request: (status, headers, JSON body)."""
+        endpoint = path.rsplit("/api/v3/", 1)[-1]
+        with self._lock:
+            self._in_flight += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self._in_flight)
+            self.stats["requests"][endpoint] = self.stats["requests"].get(endpoint, 0) + 1
+        try:
+            delay = self.config.latency_s + self.config.jitter_s * random.random()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                weight = request_weight(path, params)
+            except (ValueError, TypeError):
+                status, headers, body = 400, {}, {"code": -1100, "msg": "Illegal characters found in a parameter."}
+            else:
+                status, used, headers = self._charge(weight)
+                headers[USED_WEIGHT_HEADER] = str(used)
+                if status == 200:
+                    status, body = self._route(path, params)
+                else:
+                    body = {"code": -1003, "msg": "Too much request weight used; current limit exceeded."}
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        with self._lock:
+            self.stats["status"][status] = self.stats["status"].get(status, 0) + 1
+        return status, headers, body
+
+    def _route(self, path: str, params: Dict[str, str]) -> Tuple[int, Any]:
+        try:
+            if path == "/api/v3/klines":
+                return 200, self._klines(params)
+            if path == "/api/v3/exchangeInfo":
+                return 200, {"timezone": "UTC", "serverTime": self.now_ms(), "symbols": [self._symbol_info(s) for s in self._requested(params)]}
+            if path == "/api/v3/ticker/price":
+                tickers = [{"symbol": s, "price": self.klines_for(s, "1d")[-1][4]} for s in self._requested(params)]
+                return 200, tickers[0] if "symbol" in params else tickers
+            if path == "/api/v3/ticker/24hr":
+                tickers = [self._ticker_24hr(s) for s in self._requested(params)]
+                return 200, tickers[0] if "symbol" in params else tickers
+        except (KeyError, ValueError) as e:
+            return 400, {"code": -1102, "msg": f"Mandatory parameter missing or malformed: {e}"}
+        return 404, {"code": -1, "msg": f"Unknown endpoint {path}"}
+
+    def _requested(self, params: Dict[str, str]) -> List[str]:
+        if "symbol" in params:
+            return [params["symbol"]]
+        if "symbols" in params:
+            return list(json.loads(params["symbols"]))
+        return list(self.config.symbols)
+
+    def _klines(self, params: Dict[str, str]) -> List[List[Any]]:
+        rows = self.klines_for(params["symbol"], params["interval"])
+        limit = min(int(params.get("limit", KLINES_DEFAULT_LIMIT)), KLINES_MAX_LIMIT)
+        if "endTime" in params:
+            end = int(params["endTime"])
+            rows = [r for r in rows if r[0] <= end]
+        if "startTime" in params:
+            start = int(params["startTime"])
+            return [r for r in rows if r[0] >= start][:limit]
+        return rows[-limit:]
+
+    @staticmethod
+    def _symbol_info(symbol: str) -> Dict[str, Any]:
+        return {
+            "symbol": symbol,
+            "status": "TRADING",
+            "baseAsset": symbol[:-4],
+            "quoteAsset": symbol[-4:],
+            "filters": [
+                {"filterType": "LOT_SIZE", "minQty": "0.00001000", "maxQty": "9000.00000000", "stepSize": "0.00001000"},
+                {"filterType": "NOTIONAL", "minNotional": "5.00000000", "applyMinToMarket": True},
+            ],
+        }
+
+    def _ticker_24hr(self, symbol: str) -> Dict[str, Any]:
+        row = self.klines_for(symbol, "1d")[-1]
+        close = float(row[4])
+        return {
+            "symbol": symbol,
+            "lastPrice": row[4],
+            "bidPrice": f"{close * 0.9999:.8f}",
+            "askPrice": f"{close * 1.0001:.8f}",
+            "volume": row[5],
+            "quoteVolume": row[7],
+            "count": row[8],
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_HTTPServer"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        status, headers, body = self.server.fake.handle(url.path, params)
+        data = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    request_queue_size = 128
+    fake: FakeBinance
+
+
+class FakeBinanceServer:
+    """FakeBinance behind a threaded HTTP server on 127.0.0.1; usable as a context manager."""
+
+    def __init__(self, config: FakeBinanceConfig = FakeBinanceConfig(), port: int = 0, host: str = "127.0.0.1"):
+        self.fake = FakeBinance(config)
+        self._httpd = _HTTPServer((host, port), _Handler)
+        self._httpd.fake = self.fake
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return self.fake.stats
+
+    def start(self) -> "FakeBinanceServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-binance", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeBinanceServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def load_recorded(path: str) -> Dict[str, Dict[str, List[List[Any]]]]:
+    """Recorded klines from a JSON file: {symbol: {interval: [kline rows]}}."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Binance public REST API")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--symbols", default=",".join(DEFAULT_SYMBOLS), help="Symbols listed by exchangeInfo and the tickers")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency, up to this much")
+    parser.add_argument("--weight-limit", type=int, default=6000, help="Request weight allowed per window (0 = unlimited)")
+    parser.add_argument("--window-s", type=float, default=60.0, help="Weight window length in seconds")
+    parser.add_argument("--ban-after-429s", type=int, default=None, help="Answer 418 after this many 429s in one window")
+    parser.add_argument("--recorded", default=None, help="JSON file of recorded klines: {symbol: {interval: rows}}")
+    args = parser.parse_args(argv)
+
+    config = FakeBinanceConfig(
+        symbols=[s.strip() for s in args.symbols.split(",") if s.strip()],
+        latency_s=args.latency_ms / 1000.0,
+        jitter_s=args.jitter_ms / 1000.0,
+        weight_limit=args.weight_limit or None,
+        window_s=args.window_s,
+        ban_after_429s=args.ban_after_429s,
+        klines=load_recorded(args.recorded) if args.recorded else {},
+    )
+    server = FakeBinanceServer(config, port=args.port)
+    print(f"Fake Binance listening on {server.base_url} (set SPECTRE_BINANCE_BASE_URL={server.base_url})")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,88 @@
+"""
+json_backend.py
+JSON encoding/decoding for artifacts, with an optional fast backend.
+
+orjson and msgspec both decode from bytes and encode straight to bytes in C.
+Neither is required: the backend is chosen by SPECTRE_JSON_BACKEND
+("orjson", "msgspec", "json" or "auto", the default), and "auto" uses the
+first of orjson, msgspec that is installed, falling back to the stdlib json
+module.
+
+With msgspec, `loads(data, model=...)` decodes directly into the typed
+artifact models in spectre.models, checking field types as it goes; the
+other backends return the same plain dicts without type checks.
+"""
+from __future__ import annotations
+
+import json
+import os
+from functools import lru_cache
+from typing import Any, Optional
+
+BACKEND_ENV = "SPECTRE_JSON_BACKEND"
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+class JSONDecodeError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=None)
+def _available(name: str) -> bool:
+    if name == "json":
+        return True
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+def backend_name() -> str:
+    """The backend in use, resolved from SPECTRE_JSON_BACKEND."""
+    requested = os.environ.get(BACKEND_ENV, "auto").strip().lower() or "auto"
+    if requested == "auto":
+        return next(name for name in BACKENDS if _available(name))
+    if requested not in BACKENDS:
+        raise RuntimeError(f"Unknown {BACKEND_ENV}: {requested} (expected auto, {', '.join(BACKENDS)})")
+    if not _available(requested):
+        raise RuntimeError(f"{requested} is not installed. Please install with: pip install {requested}")
+    return requested
+
+
+def loads(data: bytes | str, model: Optional[Any] = None) -> Any:
+    """Decode a JSON document; with msgspec and a `model`, decode and type-check into it."""
+    backend = backend_name()
+    try:
+        if backend == "orjson":
+            import orjson
+            return orjson.loads(data)
+        if backend == "msgspec":
+            import msgspec
+            return msgspec.json.decode(data, type=model) if model is not None else msgspec.json.decode(data)
+        return json.loads(data)
+    except ValueError as e:
+        raise JSONDecodeError(str(e)) from e
+    except Exception as e:
+        # msgspec.DecodeError / msgspec.ValidationError are not ValueErrors.
+        if type(e).__module__.startswith("msgspec"):
+            raise JSONDecodeError(str(e)) from e
+        raise
+
+
+def dumps(obj: Any, *, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Encode to UTF-8 JSON bytes: compact, or indented by two spaces with `indent`."""
+    backend = backend_name()
+    if backend == "orjson":
+        import orjson
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, option=option)
+    if backend == "msgspec":
+        import msgspec
+        buf = msgspec.json.encode(obj, order="sorted" if sort_keys else None)
+        return msgspec.json.format(buf, indent=2) if indent else buf
+    if indent:
+        text = json.dumps(obj, indent=2, sort_keys=sort_keys, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False)
+    return text.encode("utf-8")
@@ -0,0 +1,321 @@
+"""
+metrics.py
+Prometheus / OpenMetrics counters and histograms for scheduled runs.
+
+Metrics are always collected in-process (a dict update under a lock per
+event, nothing per candle) and exported on request, either as a file for
+node_exporter's textfile collector or over a local HTTP endpoint:
+
+    write_textfile("/var/lib/node_exporter/textfile/spectre.prom")
+    start_http_server(9108)   # serves /metrics from a daemon thread
+
+Exported series:
+    spectre_http_requests_total{endpoint, status}
+    spectre_http_request_duration_seconds{endpoint}      (histogram)
+    spectre_pass_duration_seconds{pass}                  (histogram)
+    spectre_plan_refusals_total{code}
+    spectre_plan_orders_total{side}
+    spectre_simulator_orders_total{result}               (accepted / rejected)
+    spectre_simulator_rejections_total{reason}
+    spectre_runs_total{job, outcome}                      (ok / error)
+    spectre_last_success_timestamp_seconds{job}
+
+The textfile outlives the process that writes it, so write_textfile carries
+earlier runs forward: counters and histograms written by previous processes
+are added to this one's, and gauge series this process did not set (e.g. the
+last-success time after a failed run) keep their previous value. Counters in
+the file therefore only grow across runs, as rate()/increase() expect.
+
+No prometheus_client dependency; the text exposition format is written here.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+METRICS_TEXTFILE_ENV = "SPECTRE_METRICS_TEXTFILE"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+_REGISTRY: List["_Metric"] = []
+# Per textfile path: the samples it held before this process first wrote it.
+_TEXTFILE_BASELINE: Dict[str, Dict[str, float]] = {}
+_TEXTFILE_LOCK = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(x: float) -> str:
+    if x == float("inf"):
+        return "+Inf"
+    return repr(float(x)) if isinstance(x, float) and not x.is_integer() else str(int(x))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def owns(self, sample: str) -> bool:
+        """Whether a rendered sample key (name{labels}) belongs to this metric."""
+        return sample.split("{", 1)[0] == self.name
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (last is +Inf)], sum, count
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall time of the block (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def owns(self, sample: str) -> bool:
+        return sample.split("{", 1)[0] in (f"{self.name}_bucket", f"{self.name}_sum", f"{self.name}_count")
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._values.items())
+        lines = self._header()
+        for key, (counts, total, n) in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {n}")
+        return lines
+
+
+HTTP_REQUESTS = Counter("spectre_http_requests_total", "Binance HTTP requests by endpoint and status code.", ("endpoint", "status"))
+HTTP_LATENCY = Histogram("spectre_http_request_duration_seconds", "Binance HTTP request latency.", ("endpoint",))
+PASS_LATENCY = Histogram("spectre_pass_duration_seconds", "Wall time of each pipeline pass.", ("pass",))
+PLAN_REFUSALS = Counter("spectre_plan_refusals_total", "Execution plan refusals by code.", ("code",))
+PLAN_ORDERS = Counter("spectre_plan_orders_total", "Execution plan orders by side.", ("side",))
+SIMULATOR_ORDERS = Counter("spectre_simulator_orders_total", "Simulated orders by result.", ("result",))
+SIMULATOR_REJECTIONS = Counter("spectre_simulator_rejections_total", "Simulator rejections by reason.", ("reason",))
+RUNS = Counter("spectre_runs_total", "Finished runs by job and outcome.", ("job", "outcome"))
+LAST_SUCCESS = Gauge("spectre_last_success_timestamp_seconds", "Unix time the job last finished without error.", ("job",))
+
+
+def observe_http(endpoint: str, status: object, seconds: float) -> None:
+    """One Binance request; `status` is the HTTP status code, or "error" when no response arrived."""
+    HTTP_REQUESTS.inc(endpoint=endpoint, status=str(status))
+    HTTP_LATENCY.observe(seconds, endpoint=endpoint)
+
+
+def time_pass(name: str):
+    """Context manager observing the wall time of pipeline pass `name`."""
+    return PASS_LATENCY.time(**{"pass": name})
+
+
+def record_plan(plan: Dict) -> None:
+    """Count an execution plan's refusals by code and its orders by side."""
+    for refusal in plan.get("refusals", []):
+        PLAN_REFUSALS.inc(code=refusal.get("code", ""))
+    for order in plan.get("plan", {}).get("orders", []):
+        PLAN_ORDERS.inc(side=order.get("side", ""))
+
+
+def record_simulation(report: Dict) -> None:
+    """Count a simulator report's accepted and rejected orders, and rejections by reason."""
+    accepted = len(report.get("accepted_orders", []))
+    if accepted:
+        SIMULATOR_ORDERS.inc(accepted, result="accepted")
+    for rejection in report.get("rejected_orders", []):
+        # "*" rows record the all-or-nothing abort, not an order.
+        if rejection.get("symbol") != "*":
+            SIMULATOR_ORDERS.inc(result="rejected")
+        SIMULATOR_REJECTIONS.inc(reason=rejection.get("reason", ""))
+
+
+def mark_run(job: str, ok: bool = True) -> None:
+    RUNS.inc(job=job, outcome="ok" if ok else "error")
+    if ok:
+        LAST_SUCCESS.set(time.time(), job=job)
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in _REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    """Clear every recorded value (for tests and long-lived processes that export per run)."""
+    for metric in _REGISTRY:
+        metric.reset()
+    # The textfile already holds what was recorded so far; the next write builds on it.
+    with _TEXTFILE_LOCK:
+        _TEXTFILE_BASELINE.clear()
+
+
+def _parse_samples(text: str) -> Dict[str, float]:
+    samples: Dict[str, float] = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        key, _, value = line.rpartition(" ")
+        try:
+            samples[key] = float(value)
+        except ValueError:
+            continue
+    return samples
+
+
+def _render_onto(previous: Dict[str, float]) -> str:
+    # render(), with counters/histograms added to `previous` and its other gauge series kept.
+    lines: List[str] = []
+    for metric in _REGISTRY:
+        cumulative = metric.kind != "gauge"
+        seen = set()
+        for line in metric.render():
+            if not line.startswith("#"):
+                key, _, value = line.rpartition(" ")
+                seen.add(key)
+                if cumulative and key in previous:
+                    line = f"{key} {_number(float(value) + previous[key])}"
+            lines.append(line)
+        lines.extend(f"{key} {_number(value)}" for key, value in previous.items() if key not in seen and metric.owns(key))
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str | Path) -> None:
+    """
+    Write the metrics atomically, as node_exporter's textfile collector
+    expects, carried forward from what earlier processes wrote to `path`.
+    """
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with _TEXTFILE_LOCK:
+        key = str(p.resolve())
+        if key not in _TEXTFILE_BASELINE:
+            try:
+                _TEXTFILE_BASELINE[key] = _parse_samples(p.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                _TEXTFILE_BASELINE[key] = {}
+        tmp = p.with_name(p.name + ".tmp")
+        tmp.write_text(_render_onto(_TEXTFILE_BASELINE[key]), encoding="utf-8")
+        os.replace(tmp, p)
+
+
+def write_textfile_from_env() -> Optional[str]:
+    """Write the textfile named by SPECTRE_METRICS_TEXTFILE, if set; returns the path written."""
+    path = os.environ.get(METRICS_TEXTFILE_ENV)
+    if path:
+        write_textfile(path)
+    return path or None
+
+
+def start_http_server(port: int, addr: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve /metrics on addr:port from a daemon thread; call .shutdown() on the result to stop."""
+    # http.server (and the email/ssl modules behind it) is only loaded by processes that serve.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer((addr, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="spectre-metrics", daemon=True).start()
+    return server
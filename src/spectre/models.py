@@ -0,0 +1,265 @@
+"""
+models.py
+Typed shapes of the three pipeline artifacts, mirroring schemas/*.schema.json.
+
+These are TypedDicts, so decoded artifacts stay plain dicts everywhere in the
+pipeline. With the msgspec JSON backend they are also decode targets: fields
+are type-checked while parsing, and keys that are not declared here are
+dropped, so fields added to a schema must be added here too.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, TypedDict
+
+
+class TelemetrySpan(TypedDict):
+    count: int
+    wall_s: float
+    cpu_s: float
+    requests: int
+    bytes: int
+
+
+class TelemetrySummary(TypedDict):
+    # Optional telemetry section of every artifact (schemas/telemetry.schema.json).
+    wall_s: float
+    cpu_s: float
+    peak_rss_bytes: Optional[int]
+    requests: int
+    bytes_downloaded: int
+    spans: Dict[str, TelemetrySpan]
+
+
+class Candle(TypedDict):
+    t: str
+    o: float
+    h: float
+    l: float
+    c: float
+    v: float
+
+
+class Universe(TypedDict):
+    venue: str
+    symbols: List[str]
+
+
+class Timeframe(TypedDict):
+    candle: str
+    lookback_days: int
+
+
+class MarketData(TypedDict):
+    candles: Dict[str, List[Candle]]
+
+
+class _Correlation(TypedDict):
+    symbols: List[str]
+    matrix: List[List[float]]
+
+
+class Correlation(_Correlation, total=False):
+    engine: str
+    shrinkage: float
+    ewma_lambda: float
+    alignment: str
+    sample_sizes: List[List[int]]
+
+
+class CorrelationCluster(TypedDict):
+    symbols: List[str]
+    mean_correlation: float
+
+
+class CorrelationAnalysis(TypedDict):
+    mean_correlation: float
+    average_correlation: Dict[str, float]
+    eigenvalues: List[float]
+    explained_variance: List[float]
+    pc1_share: float
+    cluster_min_correlation: float
+    clusters: List[CorrelationCluster]
+
+
+class SymbolStats(TypedDict):
+    atr: Optional[float]
+    atr_pct: Optional[float]
+    max_drawdown: float
+    momentum: Dict[str, Optional[float]]
+    downside_vol_annualised: float
+    avg_dollar_volume: float
+
+
+class SymbolStatsSection(TypedDict):
+    atr_period: int
+    momentum_horizons: List[int]
+    symbols: Dict[str, SymbolStats]
+
+
+class VenueComparison(TypedDict):
+    source: str
+    symbols: List[str]
+    realised_vol_annualised: Dict[str, float]
+    last_close: Dict[str, float]
+    last_close_diff_bps: Dict[str, float]
+
+
+class _Computed(TypedDict):
+    realised_vol_annualised: Dict[str, float]
+    correlation: Correlation
+
+
+class Computed(_Computed, total=False):
+    correlation_analysis: CorrelationAnalysis
+    symbol_stats: SymbolStatsSection
+    venue_comparison: Dict[str, VenueComparison]
+
+
+class _Source(TypedDict):
+    name: str
+    type: str
+    retrieved_at_utc: str
+
+
+class Source(_Source, total=False):
+    note: str
+
+
+class _Validation(TypedDict):
+    mode: str
+
+
+class Validation(_Validation, total=False):
+    sample_size: int
+
+
+class _Provenance(TypedDict):
+    sources: List[Source]
+
+
+class Provenance(_Provenance, total=False):
+    validation: Validation
+
+
+class _FactsPack(TypedDict):
+    schema_version: str
+    as_of_utc: str
+    universe: Universe
+    timeframe: Timeframe
+    market_data: MarketData
+    computed: Computed
+    provenance: Provenance
+
+
+class FactsPack(_FactsPack, total=False):
+    warnings: List[str]
+    telemetry: TelemetrySummary
+
+
+class TopRisk(TypedDict):
+    risk: str
+    rationale: str
+
+
+class KillSwitch(TypedDict):
+    max_daily_drawdown: float
+    conditions: List[str]
+
+
+class _DecisionPacket(TypedDict):
+    schema_version: str
+    as_of_utc: str
+    global_regime: str
+    risk_score: int
+    vol_target_annualised: float
+    max_gross_exposure: float
+    allowed_symbols: List[str]
+    blocked_symbols: List[str]
+    strategy_mode: str
+    top_risks: List[TopRisk]
+    kill_switch: KillSwitch
+
+
+class DecisionPacket(_DecisionPacket, total=False):
+    telemetry: TelemetrySummary
+
+
+class _PlanInputs(TypedDict):
+    facts_pack_path: str
+    decision_packet_path: str
+
+
+class PlanInputs(_PlanInputs, total=False):
+    portfolio_state_path: str
+
+
+class Portfolio(TypedDict):
+    quote_currency: str
+    notional_budget_quote: float
+
+
+class Pricing(TypedDict):
+    as_of_utc: str
+    source: str
+    prices: Dict[str, Optional[float]]
+
+
+class ExchangeRules(TypedDict):
+    as_of_utc: str
+    source: str
+    symbols: Dict[str, Dict[str, Any]]
+
+
+class Order(TypedDict):
+    symbol: str
+    side: str
+    order_type: str
+    notional_quote: float
+    price_used: float
+    quantity_base: float
+    step_size_used: float
+    min_qty_used: float
+    min_notional_used: float
+    rationale: str
+
+
+class Plan(TypedDict):
+    action: str
+    orders: List[Order]
+
+
+class Refusal(TypedDict):
+    code: str
+    symbol: str
+    message: str
+
+
+class SuppressedTrade(TypedDict):
+    symbol: str
+    delta_quote: float
+    reason: str
+
+
+class Rebalance(TypedDict):
+    turnover_threshold: float
+    current_notional: Dict[str, float]
+    target_notional: Dict[str, float]
+    suppressed: List[SuppressedTrade]
+
+
+class _ExecutionPlan(TypedDict):
+    schema_version: str
+    as_of_utc: str
+    venue: str
+    mode: str
+    inputs: PlanInputs
+    portfolio: Portfolio
+    pricing: Pricing
+    exchange_rules: ExchangeRules
+    plan: Plan
+    refusals: List[Refusal]
+
+
+class ExecutionPlan(_ExecutionPlan, total=False):
+    rebalance: Rebalance
+    telemetry: TelemetrySummary
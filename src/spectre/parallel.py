@@ -0,0 +1,216 @@
+"""
+parallel.py
+Process-pool compute for large universes.
+
+Two kinds of work are spread over worker processes:
+
+- Per-symbol statistics (map_series): any module-level function of one
+  CandleSeries, e.g. compute_realised_vol_annualised.
+- The Gram matrix behind the correlation engines (parallel_gram), split
+  into blocks of rows of its upper triangle.
+
+Inputs are written once to shared memory (multiprocessing.shared_memory) and
+each worker attaches to it when it starts, so a task is only an index range
+and only results are sent back. Work is cut into contiguous chunks and every
+value is computed by the same code, in the same order, as the serial path,
+so results are bit-identical for any worker count.
+
+Workers are started with forkserver where available (spawn elsewhere), never
+plain fork: the DAG runs passes in threads, and forking a threaded process
+can deadlock.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from operator import mul
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from spectre.candles import CandleSeries
+
+# Below this many rows the Gram matrix is cheaper to compute in-process than to ship to workers.
+GRAM_MIN_ROWS = 64
+# Chunks per worker: enough for late chunks to even out uneven symbol lengths.
+CHUNKS_PER_WORKER = 4
+
+_COLUMNS = ("o", "h", "l", "c", "v")
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Worker count for a --workers value: 0 or None means one per CPU."""
+    if not workers:
+        return os.cpu_count() or 1
+    if workers < 0:
+        raise ValueError(f"workers must be >= 0, got {workers}")
+    return workers
+
+
+def _context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _chunks(costs: Sequence[int], n_chunks: int) -> List[Tuple[int, int]]:
+    """Split range(len(costs)) into at most n_chunks contiguous [start, end) ranges of similar total cost."""
+    total = sum(costs)
+    if not costs:
+        return []
+    target = max(1, total / max(1, n_chunks))
+    ranges, start, acc = [], 0, 0
+    for i, cost in enumerate(costs):
+        acc += cost
+        if acc >= target and i + 1 < len(costs):
+            ranges.append((start, i + 1))
+            start, acc = i + 1, 0
+    ranges.append((start, len(costs)))
+    return ranges
+
+
+def _share(values: array) -> shared_memory.SharedMemory:
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(values) * values.itemsize))
+    shm.buf[: len(values) * values.itemsize] = values.tobytes()
+    return shm
+
+
+def _release(segments: Sequence[shared_memory.SharedMemory]) -> None:
+    for shm in segments:
+        shm.close()
+        shm.unlink()
+
+
+# Worker-side state, set once per process by the pool initializers.
+_worker: Dict[str, Any] = {}
+
+
+def _attach(name: str, fmt: str, length: int) -> memoryview:
+    shm = shared_memory.SharedMemory(name=name)
+    _worker.setdefault("segments", []).append(shm)  # keep the mapping open for the worker's lifetime
+    return shm.buf.cast(fmt)[:length]
+
+
+def _init_series(t_name: str, d_name: str, offsets: List[int]) -> None:
+    n = offsets[-1]
+    _worker["t"] = _attach(t_name, "q", n)
+    _worker["d"] = _attach(d_name, "d", n * len(_COLUMNS))
+    _worker["offsets"] = offsets
+
+
+def _series_at(k: int) -> CandleSeries:
+    offsets, t, d = _worker["offsets"], _worker["t"], _worker["d"]
+    a, b, n = offsets[k], offsets[k + 1], offsets[-1]
+    cols = [d[i * n + a: i * n + b] for i in range(len(_COLUMNS))]
+    return CandleSeries(t[a:b], *cols)
+
+
+def _series_task(func: Callable[..., Any], args: Tuple[Any, ...], start: int, end: int) -> List[Any]:
+    results = []
+    for k in range(start, end):
+        try:
+            results.append(func(_series_at(k), *args))
+        except Exception as e:  # noqa: BLE001 - returned to the caller in the symbol's place
+            results.append(e)
+    return results
+
+
+def map_series(
+    func: Callable[..., Any],
+    candles_by_symbol: Mapping[str, CandleSeries],
+    workers: int,
+    *args: Any,
+) -> Dict[str, Any]:
+    """
+    {symbol: func(series, *args)} computed in `workers` processes. `func` must
+    be a module-level function. An exception raised for a symbol is returned
+    as that symbol's value, so callers can report the first failure in symbol
+    order whatever the worker count.
+    """
+    symbols = list(candles_by_symbol)
+    if workers <= 1 or len(symbols) < 2:
+        results = {}
+        for symbol in symbols:
+            try:
+                results[symbol] = func(candles_by_symbol[symbol], *args)
+            except Exception as e:  # noqa: BLE001 - same contract as the pooled path
+                results[symbol] = e
+        return results
+
+    offsets = [0]
+    t = array("q")
+    for symbol in symbols:
+        series = candles_by_symbol[symbol]
+        t.extend(series.t)
+        offsets.append(len(t))
+    d = array("d")
+    for name in _COLUMNS:
+        for symbol in symbols:
+            d.extend(getattr(candles_by_symbol[symbol], name))
+    segments = [_share(t), _share(d)]
+    try:
+        chunks = _chunks([offsets[k + 1] - offsets[k] + 1 for k in range(len(symbols))], workers * CHUNKS_PER_WORKER)
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=_context(),
+            initializer=_init_series,
+            initargs=(segments[0].name, segments[1].name, offsets),
+        ) as pool:
+            futures = [pool.submit(_series_task, func, args, a, b) for a, b in chunks]
+            values = [v for f in futures for v in f.result()]
+    finally:
+        _release(segments)
+    return dict(zip(symbols, values))
+
+
+def _init_gram(name: str, n: int, width: int) -> None:
+    flat = _attach(name, "d", n * width)
+    # One local copy of the rows per worker: list iteration is faster than memoryview slices.
+    _worker["rows"] = [flat[i * width:(i + 1) * width].tolist() for i in range(n)]
+
+
+def _gram_task(start: int, end: int) -> List[List[float]]:
+    # Rows start..end-1 of the upper triangle, in the same order as compute._gram.
+    rows = _worker["rows"]
+    n = len(rows)
+    out = []
+    for i in range(start, end):
+        vi = rows[i]
+        out.append([sum(map(mul, vi, rows[j])) for j in range(i, n)])
+    return out
+
+
+def parallel_gram(vectors: Sequence[Sequence[float]], workers: int) -> List[List[float]]:
+    """
+    Symmetric matrix of dot products of `vectors`, equal to compute._gram's,
+    with row blocks of the upper triangle computed in `workers` processes.
+    Small inputs (fewer than GRAM_MIN_ROWS vectors) are computed in-process.
+    """
+    from spectre.compute import _gram
+
+    n = len(vectors)
+    if workers <= 1 or n < GRAM_MIN_ROWS:
+        return _gram(vectors)
+    width = len(vectors[0])
+    flat = array("d")
+    for v in vectors:
+        flat.extend(v)
+    segments = [_share(flat)]
+    del flat
+    try:
+        chunks = _chunks([n - i for i in range(n)], workers * CHUNKS_PER_WORKER)
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=_context(),
+            initializer=_init_gram,
+            initargs=(segments[0].name, n, width),
+        ) as pool:
+            futures = [(a, pool.submit(_gram_task, a, b)) for a, b in chunks]
+            out = [[0.0] * n for _ in range(n)]
+            for a, future in futures:
+                for i, row in enumerate(future.result(), start=a):
+                    for j, value in enumerate(row, start=i):
+                        out[i][j] = out[j][i] = value
+    finally:
+        _release(segments)
+    return out
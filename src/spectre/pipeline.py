@@ -0,0 +1,735 @@
+"""
+pipeline.py
+In-process runner for Pass 1–4.3.
+
+Runs validate examples -> facts pack -> decision packet -> execution plan in a
+single Python process. Artifacts are handed from pass to pass in memory and are
+written to disk once at the end (or not at all with --no-write).
+
+Passes are scheduled by spectre.dag: examples validation runs alongside the
+facts pass, and a pass is skipped when its content-hash key is already cached
+(except the execution plan, which prices orders live and always runs).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from jsonschema import ValidationError
+
+from spectre.candles import CandleSeries
+from spectre.compute import (
+    CORR_ALIGN_INTERSECTION,
+    CORR_ALIGN_PAIRWISE,
+    CORR_ALIGNMENTS,
+    CORR_ENGINE_SAMPLE,
+    CORR_ENGINES,
+    DEFAULT_EWMA_LAMBDA,
+    MIN_ALIGNED_RETURNS,
+    ATR_PERIOD,
+    MOMENTUM_HORIZONS,
+    InsufficientDataError,
+    compute_correlation,
+    compute_realised_vol_annualised,
+    compute_symbol_stats,
+)
+from spectre.correlation_analysis import analyse_correlation
+from spectre.artifact_io import load_json, open_artifact, write_json
+from spectre.dag import ArtifactCache, Stage, file_digest, run_dag
+from spectre.decision_rules import build_decision_packet
+from spectre.execution_plan import SCHEMA_VERSION as PLAN_SCHEMA_VERSION, build_execution_plan
+from spectre.facts_pack import SCHEMA_VERSION as FACTS_SCHEMA_VERSION, build_facts_pack
+from spectre.facts_writer import FactsPackWriter
+from spectre.resample import INTERVALS, bars_for_lookback, can_resample
+from spectre.schema_registry import (
+    DECISION_PACKET,
+    EXECUTION_PLAN,
+    DEFAULT_SAMPLE_SIZE,
+    FACTS_PACK,
+    VALIDATION_FULL,
+    VALIDATION_MODES,
+    VALIDATION_SAMPLE,
+    get_validator,
+    schema_path,
+    validate_candles,
+    validate_decision_packet,
+    validate_execution_plan,
+    validate_facts_pack,
+)
+from spectre.metrics import METRICS_TEXTFILE_ENV, mark_run, write_textfile
+from spectre.parallel import map_series, resolve_workers
+from spectre.telemetry import Telemetry, collect, format_summary, span
+from spectre.universe import UniverseCriteria, build_universe, load_symbols_file, universe_symbols
+from spectre.venues import FileVenue, VenueAdapter, fetch_from_venues, venue_from_spec, venues_from_specs
+
+ROOT = Path(__file__).resolve().parents[2]
+EXAMPLES_DIR = ROOT / "examples"
+
+EXAMPLE_FILES = [
+    ("facts_pack.valid.json", FACTS_PACK, True),
+    ("facts_pack.invalid.json", FACTS_PACK, False),
+    ("decision_packet.valid.json", DECISION_PACKET, True),
+    ("decision_packet.invalid.json", DECISION_PACKET, False),
+]
+
+FACTS_PACK_FILE = "facts_pack.json"
+DECISION_PACKET_FILE = "decision_packet.json"
+EXECUTION_PLAN_FILE = "execution_plan.json"
+
+class PipelineError(Exception):
+    pass
+
+
+def validate_examples() -> List[str]:
+    """Pass 1: check every example behaves as expected against its schema."""
+    lines: List[str] = []
+    failed = False
+    for example_file, schema_name, should_pass in EXAMPLE_FILES:
+        data = load_json(EXAMPLES_DIR / example_file)
+        try:
+            get_validator(schema_name).validate(data)
+            if should_pass:
+                lines.append(f"PASS: {example_file} (as expected)")
+            else:
+                lines.append(f"FAIL: {example_file} (should have failed, but passed)")
+                failed = True
+        except ValidationError as e:
+            if should_pass:
+                lines.append(f"FAIL: {example_file} (should have passed, but failed)")
+                lines.append(f"  Reason: {e.message}")
+                failed = True
+            else:
+                lines.append(f"PASS: {example_file} (invalid as expected)")
+    if failed:
+        raise PipelineError("Example validation failed:\n" + "\n".join(lines))
+    return lines
+
+
+@dataclass(frozen=True)
+class FactsOptions:
+    """Settings for the facts pass beyond symbols and lookback."""
+    interval: str = "1d"
+    # Finer interval to fetch and resample locally into `interval` (None = fetch `interval` directly).
+    fetch_interval: Optional[str] = None
+    validation_mode: str = VALIDATION_FULL
+    validation_sample_size: int = DEFAULT_SAMPLE_SIZE
+    # Venue spec (see spectre.venues.venue_from_spec) for the candles and the execution plan's prices and rules.
+    venue: str = "binance"
+    # Read candles from this local candle store (see spectre.archive_import) instead of the venue.
+    candle_store: Optional[str] = None
+    # Correlation estimator (see spectre.compute.compute_correlation).
+    corr_engine: str = CORR_ENGINE_SAMPLE
+    ewma_lambda: float = DEFAULT_EWMA_LAMBDA
+    # intersection: all symbols on their shared timestamps; pairwise: each pair on its own overlap.
+    corr_alignment: str = CORR_ALIGN_INTERSECTION
+    # Venue specs (see spectre.venues.venue_from_spec) fetched alongside and compared in computed.venue_comparison.
+    compare_venues: Tuple[str, ...] = ()
+    # Processes for per-symbol stats and the correlation matrix (1 = in-process); results do not depend on it.
+    workers: int = 1
+
+    def primary_venue(self) -> VenueAdapter:
+        """Adapter for --venue: the execution plan's prices and rules, and the candles unless candle_store is set."""
+        try:
+            return venue_from_spec(self.venue)
+        except ValueError as e:
+            raise PipelineError(str(e)) from e
+
+    def candle_venue(self) -> VenueAdapter:
+        return FileVenue(self.candle_store) if self.candle_store else self.primary_venue()
+
+    def venues(self) -> List[VenueAdapter]:
+        try:
+            return venues_from_specs(self.compare_venues)
+        except ValueError as e:
+            raise PipelineError(str(e)) from e
+
+    def validation_record(self) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"mode": self.validation_mode}
+        if self.validation_mode == VALIDATION_SAMPLE:
+            record["sample_size"] = self.validation_sample_size
+        return record
+
+    def source_name(self) -> str:
+        return "Binance Public Data Archive" if self.candle_store else self.primary_venue().source_name
+
+    def provenance_note(self) -> str:
+        source = self.candle_venue().candles_source
+        if self.fetch_interval and self.fetch_interval != self.interval:
+            return f"{source} ({self.fetch_interval} bars resampled to {self.interval})"
+        return source
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {n}")
+    return n
+
+
+def add_facts_arguments(parser: argparse.ArgumentParser) -> None:
+    """CLI flags for FactsOptions, shared by build_facts_pack.py and the pipeline runner."""
+    parser.add_argument("--interval", choices=INTERVALS, default="1d", help="Candle interval (default: 1d)")
+    parser.add_argument("--fetch-interval", choices=INTERVALS, default=None,
+                        help="Fetch this finer interval and resample locally into --interval")
+    parser.add_argument("--validation", choices=VALIDATION_MODES, default=VALIDATION_FULL,
+                        help="Candle validation tier: full (default), structural or sample")
+    parser.add_argument("--validation-sample", type=positive_int, default=DEFAULT_SAMPLE_SIZE,
+                        help="Candles per symbol checked in sample mode")
+    parser.add_argument("--venue", default="binance", metavar="SPEC",
+                        help="Venue for candles and the execution plan's prices and rules: binance (default) "
+                             "or file:DIR (candle store plus rules.json and prices.json, no network)")
+    parser.add_argument("--candle-store", default=None,
+                        help="Read candles from this local candle store instead of --venue (no network)")
+    parser.add_argument("--corr-engine", choices=CORR_ENGINES, default=CORR_ENGINE_SAMPLE,
+                        help="Correlation estimator: sample (default), ledoit_wolf shrinkage or ewma")
+    parser.add_argument("--ewma-lambda", type=float, default=DEFAULT_EWMA_LAMBDA,
+                        help=f"Decay factor for --corr-engine ewma (default: {DEFAULT_EWMA_LAMBDA})")
+    parser.add_argument("--corr-alignment", choices=CORR_ALIGNMENTS, default=CORR_ALIGN_INTERSECTION,
+                        help="Correlate all symbols on shared timestamps (intersection, default) "
+                             "or each pair on its own overlap (pairwise, sample engine only)")
+    parser.add_argument("--compare-venue", action="append", default=None, metavar="SPEC",
+                        help="Also fetch the symbols from this venue (binance or file:DIR, optionally NAME=...) "
+                             "and compare it in computed.venue_comparison; repeatable, fetched concurrently")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for per-symbol stats and the correlation matrix "
+                             "(default: 1 = in-process, 0 = one per CPU); results are identical for any count")
+
+
+def facts_options_from_args(args: argparse.Namespace) -> FactsOptions:
+    if args.fetch_interval and not can_resample(args.fetch_interval, args.interval):
+        raise PipelineError(f"Cannot build {args.interval} candles from {args.fetch_interval} bars")
+    if not 0 < args.ewma_lambda < 1:
+        raise PipelineError(f"--ewma-lambda must be between 0 and 1, got {args.ewma_lambda}")
+    if args.corr_alignment == CORR_ALIGN_PAIRWISE and args.corr_engine != CORR_ENGINE_SAMPLE:
+        raise PipelineError(f"--corr-alignment pairwise requires --corr-engine {CORR_ENGINE_SAMPLE}")
+    try:
+        workers = resolve_workers(args.workers)
+    except ValueError as e:
+        raise PipelineError(f"--workers: {e}") from e
+    options = FactsOptions(
+        interval=args.interval,
+        fetch_interval=args.fetch_interval,
+        validation_mode=args.validation,
+        validation_sample_size=args.validation_sample,
+        venue=args.venue,
+        candle_store=args.candle_store,
+        corr_engine=args.corr_engine,
+        ewma_lambda=args.ewma_lambda,
+        corr_alignment=args.corr_alignment,
+        compare_venues=tuple(args.compare_venue or ()),
+        workers=workers,
+    )
+    # Reject bad venue specs before anything is fetched.
+    options.primary_venue()
+    options.venues()
+    return options
+
+
+def _fetch_candles(symbol: str, lookback_days: int, options: FactsOptions, venue: VenueAdapter) -> CandleSeries:
+    try:
+        candles = venue.fetch_candles(symbol, lookback_days, options.interval, options.fetch_interval)
+    except Exception as e:
+        raise PipelineError(f"Failed to fetch candles for {symbol}: {e}") from e
+    if not candles:
+        raise PipelineError(f"No candles returned for {symbol}")
+    return candles
+
+
+def symbol_facts(candles: CandleSeries, interval: str) -> Tuple[float, Dict[str, Any]]:
+    """Realised vol and extended stats of one symbol (module-level, so worker processes can run it)."""
+    with span("compute.realised_vol"):
+        vol = compute_realised_vol_annualised(candles, interval)
+    with span("compute.symbol_stats"):
+        stats = compute_symbol_stats(candles, interval)
+    return vol, stats
+
+
+def _symbol_facts(symbol: str, candles: CandleSeries, options: FactsOptions) -> Tuple[float, Dict[str, Any]]:
+    try:
+        return symbol_facts(candles, options.interval)
+    except InsufficientDataError as e:
+        raise PipelineError(f"{symbol}: {e}") from e
+
+
+def _all_symbol_facts(
+    candles_by_symbol: Dict[str, CandleSeries], options: FactsOptions
+) -> Tuple[Dict[str, float], Dict[str, Dict[str, Any]]]:
+    """Realised vol and extended stats for every symbol, in worker processes with options.workers > 1."""
+    if options.workers <= 1:
+        results = {symbol: _symbol_facts(symbol, candles, options) for symbol, candles in candles_by_symbol.items()}
+    else:
+        results = map_series(symbol_facts, candles_by_symbol, options.workers, options.interval)
+        # Failures are reported for the first symbol in order, as in the serial loop.
+        for symbol, result in results.items():
+            if isinstance(result, InsufficientDataError):
+                raise PipelineError(f"{symbol}: {result}") from result
+            if isinstance(result, Exception):
+                raise result
+    return {s: r[0] for s, r in results.items()}, {s: r[1] for s, r in results.items()}
+
+
+def _symbol_stats_section(stats_by_symbol: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return {"atr_period": ATR_PERIOD, "momentum_horizons": list(MOMENTUM_HORIZONS), "symbols": stats_by_symbol}
+
+
+def _close_diff_bps(primary: CandleSeries, other: CandleSeries) -> Optional[float]:
+    """Other venue's close vs the primary's on their latest shared bar, in basis points."""
+    shared = set(primary.t).intersection(other.t)
+    if not shared:
+        return None
+    t = max(shared)
+    base = primary.c[primary.t.index(t)]
+    if base <= 0:
+        return None
+    return (other.c[other.t.index(t)] / base - 1.0) * 1e4
+
+
+def _venue_comparison(
+    venues: List[VenueAdapter],
+    fetched: Dict[str, Tuple[Dict[str, CandleSeries], Dict[str, str]]],
+    primary: Dict[str, CandleSeries],
+    options: FactsOptions,
+) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """computed.venue_comparison and warnings for the symbols a venue could not provide."""
+    comparison: Dict[str, Any] = {}
+    warnings: List[str] = []
+    for venue in venues:
+        candles, failures = fetched[venue.name]
+        failures = dict(failures)
+        entry: Dict[str, Any] = {
+            "source": venue.source_name,
+            "symbols": [],
+            "realised_vol_annualised": {},
+            "last_close": {},
+            "last_close_diff_bps": {},
+        }
+        for symbol, series in candles.items():
+            try:
+                with span("compute.realised_vol"):
+                    entry["realised_vol_annualised"][symbol] = compute_realised_vol_annualised(series, options.interval)
+            except InsufficientDataError as e:
+                failures[symbol] = str(e)
+                continue
+            entry["symbols"].append(symbol)
+            entry["last_close"][symbol] = series.c[-1]
+            diff = _close_diff_bps(primary[symbol], series)
+            if diff is not None:
+                entry["last_close_diff_bps"][symbol] = diff
+        comparison[venue.name] = entry
+        warnings.extend(f"Venue {venue.name}: {symbol} not compared ({reason})." for symbol, reason in failures.items())
+    return comparison or None, warnings
+
+
+def _correlation(
+    candles_by_symbol: Dict[str, CandleSeries], lookback_days: int, options: FactsOptions
+) -> Tuple[Dict[str, Any], Optional[List[str]]]:
+    try:
+        with span("compute.correlation"):
+            correlation = compute_correlation(
+                candles_by_symbol, options.corr_engine, options.ewma_lambda, options.corr_alignment, options.workers
+            )
+    except (InsufficientDataError, ValueError) as e:
+        raise PipelineError(str(e)) from e
+    if options.corr_alignment == CORR_ALIGN_PAIRWISE:
+        return correlation, _pairwise_warnings(correlation)
+    sample_size = correlation["sample_size"]
+    warnings = None
+    # If sample_size < number of bars in the lookback, warn
+    if sample_size < bars_for_lookback(lookback_days, options.interval):
+        warnings = [f"Aligned sample size reduced to {sample_size} due to timestamp intersection."]
+    return correlation, warnings
+
+
+def _pairwise_warnings(correlation: Dict[str, Any]) -> Optional[List[str]]:
+    # Name the symbols with shorter histories instead of one universe-wide sample size.
+    symbols, sizes = correlation["symbols"], correlation["sample_sizes"]
+    counts = [sizes[i][i] for i in range(len(symbols))]
+    warnings = [
+        f"Pairwise sample size reduced to {n} for pairs with {s}; other pairs use their full overlap."
+        for s, n in zip(symbols, counts) if n < max(counts)
+    ]
+    short = sum(1 for i in range(len(symbols)) for j in range(i + 1, len(symbols)) if sizes[i][j] < MIN_ALIGNED_RETURNS)
+    if short:
+        warnings.append(f"{short} symbol pair(s) overlap on fewer than {MIN_ALIGNED_RETURNS} returns; their correlation is reported as 0.0.")
+    return warnings or None
+
+
+def _correlation_fields(correlation: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """build_facts_pack keyword arguments for a compute_correlation result (None = not computed yet)."""
+    if correlation is None:
+        return {"corr_symbols": [], "corr_matrix": [], "sample_size": 0}
+    with span("compute.correlation_analysis"):
+        analysis = analyse_correlation(correlation["symbols"], correlation["matrix"])
+    return {
+        "corr_symbols": correlation["symbols"],
+        "corr_matrix": correlation["matrix"],
+        "sample_size": correlation["sample_size"],
+        "correlation_meta": {k: v for k, v in correlation.items() if k not in ("symbols", "matrix", "sample_size")},
+        "correlation_analysis": analysis,
+    }
+
+
+def build_facts(
+    symbols: List[str],
+    lookback_days: int,
+    options: FactsOptions = FactsOptions(),
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Pass 2: fetch candles, compute metrics and return a validated facts pack
+    together with the aligned sample size used for returns/correlation.
+    The validation tier used is recorded in provenance.validation.
+    """
+    venue = options.candle_venue()
+    venues = options.venues()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        # Comparison venues are fetched in the background while the primary source is.
+        compared = pool.submit(fetch_from_venues, venues, symbols, lookback_days, options.interval, options.fetch_interval)
+        candles_by_symbol = {}
+        for symbol in symbols:
+            candles_by_symbol[symbol] = _fetch_candles(symbol, lookback_days, options, venue)
+        fetched = compared.result()
+
+    vol_by_symbol, stats_by_symbol = _all_symbol_facts(candles_by_symbol, options)
+
+    correlation, warnings = _correlation(candles_by_symbol, lookback_days, options)
+    sample_size = correlation["sample_size"]
+    venue_comparison, venue_warnings = _venue_comparison(venues, fetched, candles_by_symbol, options)
+    warnings = (warnings or []) + venue_warnings or None
+
+    facts_pack = build_facts_pack(
+        symbols=symbols,
+        lookback_days=lookback_days,
+        candles_by_symbol=candles_by_symbol,
+        vol_by_symbol=vol_by_symbol,
+        provenance_note=options.provenance_note(),
+        source_name=options.source_name(),
+        warnings=warnings,
+        validation=options.validation_record(),
+        candle=options.interval,
+        venue_comparison=venue_comparison,
+        symbol_stats=_symbol_stats_section(stats_by_symbol),
+        **_correlation_fields(correlation),
+    )
+    try:
+        validate_facts_pack(facts_pack, mode=options.validation_mode, sample_size=options.validation_sample_size)
+    except ValidationError as e:
+        raise PipelineError(f"Facts pack failed schema validation: {e.message}") from e
+    return facts_pack, sample_size
+
+
+def stream_facts(
+    symbols: List[str],
+    lookback_days: int,
+    out_path: str | Path,
+    options: FactsOptions = FactsOptions(),
+    profile: Optional[Telemetry] = None,
+) -> Tuple[Dict[str, int], int]:
+    """
+    Pass 2, streamed: each symbol's candles are validated and written as soon
+    as they are fetched, and only its closes are kept for the correlation
+    matrix, so peak memory is one symbol's candles plus the close series.
+    Output is compact JSON, compressed when out_path ends in .gz or .zst.
+    The file is written to a temporary path and renamed into place only once
+    the whole pack has validated.
+
+    With options.workers > 1 only the correlation matrix uses worker
+    processes; per-symbol vol and stats are computed as each symbol streams past.
+
+    With `profile`, its summary so far is written as the pack's telemetry
+    section. Returns the candle count per symbol and the aligned sample size.
+    """
+    out = Path(out_path)
+    # Keep the suffix so the temporary file gets the same compression.
+    tmp = out.with_name(out.stem + ".partial" + out.suffix)
+    as_of_utc = datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+    def _pack(vol_by_symbol, correlation, warnings, venue_comparison=None, stats_by_symbol=None):
+        return build_facts_pack(
+            symbols=symbols,
+            lookback_days=lookback_days,
+            candles_by_symbol={},
+            vol_by_symbol=vol_by_symbol,
+            provenance_note=options.provenance_note(),
+            source_name=options.source_name(),
+            warnings=warnings,
+            validation=options.validation_record(),
+            as_of_utc=as_of_utc,
+            candle=options.interval,
+            venue_comparison=venue_comparison,
+            symbol_stats=_symbol_stats_section(stats_by_symbol) if stats_by_symbol else None,
+            **_correlation_fields(correlation),
+        )
+
+    candle_counts: Dict[str, int] = {}
+    closes_by_symbol: Dict[str, CandleSeries] = {}
+    vol_by_symbol: Dict[str, float] = {}
+    stats_by_symbol: Dict[str, Dict[str, Any]] = {}
+    venue = options.candle_venue()
+    venues = options.venues()
+    try:
+        with open_artifact(tmp, "w") as f, ThreadPoolExecutor(max_workers=1) as pool:
+            compared = pool.submit(fetch_from_venues, venues, symbols, lookback_days, options.interval, options.fetch_interval)
+            writer = FactsPackWriter(f)
+            writer.write_header(_pack({s: 0.0 for s in symbols}, None, None))
+            for symbol in symbols:
+                candles = _fetch_candles(symbol, lookback_days, options, venue)
+                try:
+                    validate_candles({symbol: candles}, mode=options.validation_mode, sample_size=options.validation_sample_size)
+                except ValidationError as e:
+                    raise PipelineError(f"Facts pack failed schema validation: {e.message}") from e
+                writer.write_candles(symbol, candles)
+                vol_by_symbol[symbol], stats_by_symbol[symbol] = _symbol_facts(symbol, candles, options)
+                closes_by_symbol[symbol] = candles.closes_view()
+                candle_counts[symbol] = len(candles)
+                del candles
+
+            correlation, warnings = _correlation(closes_by_symbol, lookback_days, options)
+            sample_size = correlation["sample_size"]
+            venue_comparison, venue_warnings = _venue_comparison(venues, compared.result(), closes_by_symbol, options)
+            warnings = (warnings or []) + venue_warnings or None
+            # Candles were validated per symbol above; validate everything else here.
+            facts_pack = _pack(vol_by_symbol, correlation, warnings, venue_comparison, stats_by_symbol)
+            try:
+                validate_facts_pack(facts_pack)
+            except ValidationError as e:
+                raise PipelineError(f"Facts pack failed schema validation: {e.message}") from e
+            if profile is not None:
+                facts_pack["telemetry"] = profile.summary()
+            writer.write_footer(facts_pack)
+        os.replace(tmp, out)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return candle_counts, sample_size
+
+
+def build_decision(facts_pack: Dict[str, Any]) -> Dict[str, Any]:
+    """Pass 3: build and validate the deterministic decision packet."""
+    decision_packet = build_decision_packet(facts_pack)
+    try:
+        validate_decision_packet(decision_packet)
+    except ValidationError as e:
+        raise PipelineError(f"Decision packet validation failed: {e.message}") from e
+    return decision_packet
+
+
+def build_plan(
+    facts_pack: Dict[str, Any],
+    decision_packet: Dict[str, Any],
+    facts_pack_path: str,
+    decision_packet_path: str,
+    venue: Optional[VenueAdapter] = None,
+) -> Dict[str, Any]:
+    """Pass 4.3: build and validate the dry-run execution plan, priced on `venue` (Binance by default)."""
+    plan = build_execution_plan(facts_pack, decision_packet, facts_pack_path, decision_packet_path, venue=venue)
+    try:
+        validate_execution_plan(plan)
+    except ValidationError as e:
+        raise PipelineError(f"Execution plan validation failed: {e.message}") from e
+    return plan
+
+
+def write_artifacts(artifacts: Dict[str, Dict[str, Any]], out_dir: str | Path) -> Dict[str, Path]:
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for file_name, doc in artifacts.items():
+        path = out / file_name
+        write_json(path, doc)
+        paths[file_name] = path
+    return paths
+
+
+def pipeline_stages(
+    symbols: List[str],
+    lookback_days: int,
+    facts_pack_path: str,
+    decision_packet_path: str,
+    options: FactsOptions = FactsOptions(),
+) -> List[Stage]:
+    """
+    The four passes as DAG stages. Stage parameters include everything the
+    output depends on (arguments, schema contents, the budget override), so a
+    cached artifact is reused only when none of them changed.
+    """
+    schema_digest = {name: file_digest(schema_path(name)) for name in (FACTS_PACK, DECISION_PACKET, EXECUTION_PLAN)}
+    example_digest = {f: file_digest(EXAMPLES_DIR / f) for f, _schema, _ok in EXAMPLE_FILES}
+    # Daily candles close at 00:00 UTC, so fetched facts are reused for the rest of the UTC day.
+    utc_date = datetime.now(timezone.utc).date().isoformat()
+    return [
+        Stage(
+            name="validate_examples",
+            run=lambda: {"results": validate_examples()},
+            params={"examples": example_digest, "schemas": schema_digest},
+        ),
+        Stage(
+            name="build_facts_pack",
+            run=lambda: build_facts(symbols, lookback_days, options)[0],
+            params={
+                "symbols": symbols,
+                "lookback_days": lookback_days,
+                # Worker count changes how, not what, the pass computes.
+                "options": {k: v for k, v in asdict(options).items() if k != "workers"},
+                "utc_date": utc_date,
+                # Local stores change without the date changing: key on their files too.
+                "sources": {v.name: v.data_fingerprint() for v in [options.candle_venue(), *options.venues()]},
+                "schema_version": FACTS_SCHEMA_VERSION,
+                "schema": schema_digest[FACTS_PACK],
+            },
+        ),
+        Stage(
+            name="build_decision_packet",
+            run=lambda build_facts_pack: build_decision(build_facts_pack),
+            deps=("build_facts_pack",),
+            params={"schema": schema_digest[DECISION_PACKET]},
+        ),
+        Stage(
+            name="build_execution_plan",
+            run=lambda build_facts_pack, build_decision_packet: build_plan(
+                build_facts_pack, build_decision_packet, facts_pack_path, decision_packet_path, options.primary_venue()
+            ),
+            deps=("build_facts_pack", "build_decision_packet"),
+            # Prices and exchange rules are fetched live, so the plan is rebuilt on every run.
+            cacheable=False,
+            params={
+                "budget": os.environ.get("SPECTRE_BUDGET_QUOTE", ""),
+                "sizing": os.environ.get("SPECTRE_SIZING", ""),
+                "inputs": [facts_pack_path, decision_packet_path],
+                "venue": options.venue,
+                "schema_version": PLAN_SCHEMA_VERSION,
+                "schema": schema_digest[EXECUTION_PLAN],
+            },
+        ),
+    ]
+
+
+def run_pipeline(
+    symbols: List[str],
+    lookback_days: int,
+    out_dir: Optional[str | Path] = None,
+    *,
+    cache_dir: Optional[str | Path] = None,
+    options: FactsOptions = FactsOptions(),
+    log=print,
+    profile: Optional[Telemetry] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run all passes in-process and return the artifacts keyed by file name.
+    Independent passes run concurrently; with a cache_dir, passes whose inputs
+    are unchanged are loaded from the cache instead of re-run. If out_dir is
+    given, artifacts are written there once every pass has succeeded. With
+    `profile`, each artifact carries the run's telemetry summary.
+    """
+    if out_dir is not None:
+        facts_path = str(Path(out_dir) / FACTS_PACK_FILE)
+        decision_path = str(Path(out_dir) / DECISION_PACKET_FILE)
+    else:
+        facts_path = "(in-memory)"
+        decision_path = "(in-memory)"
+
+    stages = pipeline_stages(symbols, lookback_days, facts_path, decision_path, options)
+    cache = ArtifactCache(cache_dir) if cache_dir is not None else None
+    result = run_dag(stages, cache, log=log)
+
+    artifacts = {
+        FACTS_PACK_FILE: result.outputs["build_facts_pack"],
+        DECISION_PACKET_FILE: result.outputs["build_decision_packet"],
+        EXECUTION_PLAN_FILE: result.outputs["build_execution_plan"],
+    }
+    if profile is not None:
+        # Copies, so cached stage outputs stay free of per-run telemetry.
+        summary = profile.summary()
+        artifacts = {name: {**doc, "telemetry": summary} for name, doc in artifacts.items()}
+    if out_dir is not None:
+        write_artifacts(artifacts, out_dir)
+    return artifacts
+
+
+def pipeline_symbols(args: argparse.Namespace) -> List[str]:
+    """Symbols from --screen-top (live screen), --symbols-file or --symbols, in that order of precedence."""
+    if args.screen_top is not None:
+        try:
+            universe = build_universe(UniverseCriteria(top_n=args.screen_top))
+        except Exception as e:
+            raise PipelineError(f"Universe screening failed: {e}") from e
+        symbols = universe_symbols(universe)
+        print(f"Universe: {len(symbols)} of {universe['counts']['listed']} trading USDT symbols selected")
+    elif args.symbols_file:
+        try:
+            symbols = load_symbols_file(args.symbols_file)
+        except (OSError, ValueError) as e:
+            raise PipelineError(f"Failed to read symbols file: {e}") from e
+    else:
+        symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
+    if not symbols:
+        raise PipelineError("No symbols to run the pipeline on")
+    return symbols
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the full Spectre pipeline (Pass 1–4.3) in a single process.")
+    parser.add_argument("--symbols", default="BTCUSDT,ETHUSDT", help="Comma-separated symbols (e.g. BTCUSDT,ETHUSDT)")
+    parser.add_argument("--symbols-file", default=None,
+                        help="Take symbols from a universe.json (scripts/build_universe.py) or a text file instead")
+    parser.add_argument("--screen-top", type=positive_int, default=None,
+                        help="Screen the exchange first and run on the N most liquid USDT symbols")
+    parser.add_argument("--lookback-days", type=int, default=365, help="Number of days to look back")
+    parser.add_argument("--out-dir", default="artifacts", help="Directory the artifacts are written to")
+    parser.add_argument("--no-write", action="store_true", help="Run every pass but do not write artifacts")
+    parser.add_argument("--cache-dir", default=None, help="Stage cache directory (default: <out-dir>/.cache)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-run every pass, ignoring cached artifacts")
+    parser.add_argument("--profile", action="store_true",
+                        help="Record per-stage timings, requests and bytes; print them and add a telemetry section to each artifact")
+    parser.add_argument("--metrics-textfile", default=os.environ.get(METRICS_TEXTFILE_ENV),
+                        help=f"Write Prometheus metrics here after the run, for node_exporter's textfile collector (default: ${METRICS_TEXTFILE_ENV})")
+    add_facts_arguments(parser)
+    args = parser.parse_args(argv)
+
+    out_dir = None if args.no_write else args.out_dir
+    cache_dir = args.cache_dir
+    if cache_dir is None and out_dir is not None:
+        cache_dir = str(Path(out_dir) / ".cache")
+    if args.no_cache:
+        cache_dir = None
+    ok = False
+    try:
+        with collect(args.profile) as profile:
+            symbols = pipeline_symbols(args)
+            options = facts_options_from_args(args)
+            artifacts = run_pipeline(symbols, args.lookback_days, out_dir, cache_dir=cache_dir, options=options, profile=profile)
+        ok = True
+    except PipelineError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    finally:
+        # Failed runs are exported too, so they can be alerted on.
+        if args.metrics_textfile:
+            mark_run("pipeline", ok)
+            write_textfile(args.metrics_textfile)
+
+    decision_packet = artifacts[DECISION_PACKET_FILE]
+    plan = artifacts[EXECUTION_PLAN_FILE]
+    print()
+    print("PIPELINE OK")
+    print(f"Regime: {decision_packet['global_regime']}, Strategy mode: {decision_packet['strategy_mode']}")
+    print(f"Action: {plan['plan']['action']}, Orders: {len(plan['plan']['orders'])}, Refusals: {len(plan['refusals'])}")
+    if out_dir is not None:
+        print(f"Artifacts written to {out_dir}")
+    if profile is not None:
+        for line in format_summary(profile.summary()):
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,154 @@
+"""
+profiling.py
+cProfile / tracemalloc dumps per pass, switched on by SPECTRE_PROFILE.
+
+With SPECTRE_PROFILE=1 every pass wrapped in profile_pass() runs under
+cProfile and tracemalloc, and then writes to SPECTRE_PROFILE_DIR (default
+artifacts/profiles):
+
+    <pass>-<UTC timestamp>-<pid>.prof        cProfile stats (snakeviz, pstats)
+    <pass>-<UTC timestamp>-<pid>.alloc.txt   top allocation sites by size
+
+It also logs the hottest functions by cumulative time to stderr, so a
+production run's log shows where the time went. Outside SPECTRE_PROFILE,
+profile_pass() costs one environment lookup.
+
+Each pass gets its own cProfile profiler, which only sees the thread that
+entered the pass, so passes on different threads (the pipeline's DAG stages)
+run and are profiled concurrently. tracemalloc is process-wide: it stays on
+while any profiled pass is running, and a pass's peak covers everything
+allocated while it ran, including allocations by overlapping passes.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    import pstats
+    import tracemalloc
+
+PROFILE_ENV = "SPECTRE_PROFILE"
+PROFILE_DIR_ENV = "SPECTRE_PROFILE_DIR"
+DEFAULT_PROFILE_DIR = "artifacts/profiles"
+TOP_FUNCTIONS = 10
+TOP_ALLOCATIONS = 25
+
+# Guards only the tracemalloc bookkeeping below, never a pass itself.
+_lock = threading.Lock()
+_tracing_passes = 0
+_started_tracing = False
+_active = threading.local()
+
+
+def profiling_enabled() -> bool:
+    return os.environ.get(PROFILE_ENV, "").strip().lower() not in ("", "0", "false", "no", "off")
+
+
+def profile_dir() -> Path:
+    return Path(os.environ.get(PROFILE_DIR_ENV) or DEFAULT_PROFILE_DIR)
+
+
+def _log(message: str) -> None:
+    # stderr: shadow_run and simulator_stub print their JSON report on stdout.
+    print(message, file=sys.stderr)
+
+
+def hot_functions(stats: pstats.Stats, limit: int = TOP_FUNCTIONS) -> List[str]:
+    """The `limit` functions with the largest cumulative time, formatted one per line."""
+    rows = sorted(stats.stats.items(), key=lambda item: -item[1][3])[:limit]
+    lines = []
+    for (filename, lineno, func), (_cc, ncalls, tottime, cumtime, _callers) in rows:
+        where = func if filename == "~" else f"{Path(filename).name}:{lineno}({func})"
+        lines.append(f"{cumtime:9.3f}s cum {tottime:9.3f}s self {ncalls:>9} calls  {where}")
+    return lines
+
+
+def _allocation_report(name: str, snapshot: tracemalloc.Snapshot, peak: int) -> str:
+    stats = snapshot.statistics("lineno")
+    lines = [f"# {name}: peak traced memory {peak / 1e6:.1f} MB, top {TOP_ALLOCATIONS} allocation sites still live at the end"]
+    lines.extend(str(stat) for stat in stats[:TOP_ALLOCATIONS])
+    return "\n".join(lines) + "\n"
+
+
+def _start_tracing(tracemalloc) -> None:
+    """Turn tracemalloc on for the first concurrent pass; leave tracing someone else started alone."""
+    global _tracing_passes, _started_tracing
+    with _lock:
+        if _tracing_passes == 0:
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+            else:
+                tracemalloc.reset_peak()
+        _tracing_passes += 1
+
+
+def _stop_tracing(tracemalloc) -> None:
+    """Turn tracemalloc off again when the last concurrent pass ends, if a pass turned it on."""
+    global _tracing_passes
+    with _lock:
+        _tracing_passes -= 1
+        if _tracing_passes == 0 and _started_tracing:
+            tracemalloc.stop()
+
+
+@contextmanager
+def profile_pass(name: str, log: Callable[[str], None] = _log) -> Iterator[Optional[Path]]:
+    """
+    Profile the block as pass `name` when SPECTRE_PROFILE is set; yields the
+    .prof path that will be written, or None when not profiling. Reports are
+    written even when the pass raises, so a failed run still leaves a profile.
+    A pass nested inside another profiled pass on the same thread is not
+    profiled separately. Where the interpreter allows only one cProfile at a
+    time (Python 3.12+), a pass that overlaps another keeps its allocation
+    report but writes no .prof.
+    """
+    if not profiling_enabled() or getattr(_active, "name", None) is not None:
+        yield None
+        return
+    # The profilers are only imported when a pass is actually profiled.
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    out_dir = profile_dir()
+    prof_path = out_dir / f"{name}-{stamp}-{os.getpid()}.prof"
+    alloc_path = out_dir / f"{name}-{stamp}-{os.getpid()}.alloc.txt"
+
+    _active.name = name
+    _start_tracing(tracemalloc)
+    profiler: Optional[cProfile.Profile] = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another thread's pass holds the interpreter's only profiler slot.
+        profiler = None
+    try:
+        yield prof_path
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        _stop_tracing(tracemalloc)
+        _active.name = None
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        alloc_path.write_text(_allocation_report(name, snapshot, peak), encoding="utf-8")
+        if profiler is None:
+            log(f"PROFILE {name}: {elapsed:.3f}s, peak traced {peak / 1e6:.1f} MB -> {alloc_path} (cProfile busy)")
+        else:
+            profiler.dump_stats(str(prof_path))
+            log(f"PROFILE {name}: {elapsed:.3f}s, peak traced {peak / 1e6:.1f} MB -> {prof_path}")
+            for line in hot_functions(pstats.Stats(profiler)):
+                log(f"  {line}")
@@ -0,0 +1,188 @@
+"""
+rate_limit.py
+Request-weight-aware rate limiting for every Binance call in the process.
+
+Binance limits each IP to a request weight per clock minute (6000 on spot
+at the time of writing). Each endpoint costs a weight that depends on its
+parameters (request_weight). Going over the limit returns 429. Continuing
+after 429s returns 418 and an IP ban.
+
+WeightLimiter combines two checks:
+
+- A token bucket refilled at limit / window per second, so calls are paced
+  through the minute instead of spending the budget in one burst.
+- Per-window accounting, so no clock minute is charged more than `limit`.
+  A call that would overflow the current minute is scheduled for the next.
+
+Every response feeds back into the limiter (update):
+
+- X-MBX-USED-WEIGHT-1M raises the current minute's count to what Binance
+  has seen, including weight used by other processes on the same IP.
+- A 429 or 418 blocks all callers for its Retry-After.
+
+Callers reserve weight under a lock and then sleep outside it, so one
+limiter serves any number of threads (acquire) and asyncio tasks
+(acquire_async), in the order they reserve. binance_public and execution_plan share
+the limiter returned by shared_limiter(), sized by
+SPECTRE_BINANCE_WEIGHT_LIMIT (0 disables limiting).
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+WEIGHT_LIMIT_ENV = "SPECTRE_BINANCE_WEIGHT_LIMIT"
+DEFAULT_WEIGHT_LIMIT = 6000
+WINDOW_S = 60.0
+USED_WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1M"
+RETRIES_ON_429 = 3
+KLINES_DEFAULT_LIMIT = 500
+
+
+def request_weight(path: str, params: Optional[Mapping[str, Any]] = None) -> int:
+    """Binance request weight of one api/v3 call, from its path and query parameters."""
+    params = params or {}
+    if path.endswith("/klines"):
+        limit = int(params.get("limit", KLINES_DEFAULT_LIMIT))
+        return 1 if limit < 100 else 2 if limit < 500 else 5 if limit <= 1000 else 10
+    if path.endswith("/exchangeInfo"):
+        return 20
+    if path.endswith("/ticker/price"):
+        return 2 if "symbol" in params else 4
+    if path.endswith("/ticker/24hr"):
+        if "symbol" in params:
+            return 2
+        if "symbols" in params:
+            n = len(json.loads(params["symbols"]))
+            return 2 if n <= 20 else 40 if n <= 100 else 80
+        return 80
+    return 1
+
+
+class WeightLimiter:
+    """Token bucket plus per-window weight accounting; safe to share across threads and asyncio tasks."""
+
+    def __init__(
+        self,
+        limit: int = DEFAULT_WEIGHT_LIMIT,
+        window_s: float = WINDOW_S,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        self.limit = limit
+        self.window_s = window_s
+        # Burst defaults to a tenth of the window's budget: enough to start a
+        # run's first wave of requests at once, small enough to pace the rest.
+        self.burst = max(1, burst if burst is not None else limit // 10)
+        self.rate = limit / window_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._refilled_at = clock()
+        self._used: Dict[int, int] = {}
+        self._blocked_until = 0.0
+        self.waited_s = 0.0
+
+    def _window(self, t: float) -> int:
+        return int(t // self.window_s)
+
+    def reserve(self, weight: int) -> float:
+        """Charge `weight` and return how long the caller must wait before sending."""
+        weight = min(weight, self.limit)
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+            self._refilled_at = now
+            self._tokens -= weight
+            bucket_wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            start = max(now + bucket_wait, self._blocked_until)
+            window = self._window(start)
+            while self._used.get(window, 0) + weight > self.limit:
+                window += 1
+                start = max(start, window * self.window_s)
+            self._used[window] = self._used.get(window, 0) + weight
+            for old in [w for w in self._used if w < self._window(now)]:
+                del self._used[old]
+            wait = start - now
+            self.waited_s += wait
+            return wait
+
+    def acquire(self, weight: int = 1, sleep: Callable[[float], None] = time.sleep) -> None:
+        wait = self.reserve(weight)
+        if wait > 0:
+            sleep(wait)
+
+    async def acquire_async(self, weight: int = 1) -> None:
+        import asyncio
+
+        wait = self.reserve(weight)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def update(self, status: Optional[int], headers: Optional[Mapping[str, str]]) -> None:
+        """Self-correct from a response: adopt Binance's used weight; back off on 429/418."""
+        headers = headers or {}
+        used = headers.get(USED_WEIGHT_HEADER)
+        with self._lock:
+            now = self._clock()
+            if used is not None:
+                try:
+                    window = self._window(now)
+                    self._used[window] = max(self._used.get(window, 0), int(used))
+                except ValueError:
+                    pass
+            if status in (418, 429):
+                try:
+                    retry_after = float(headers.get("Retry-After", ""))
+                except ValueError:
+                    retry_after = (self._window(now) + 1) * self.window_s - now
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def used(self) -> int:
+        """Weight charged to the current window so far."""
+        with self._lock:
+            return self._used.get(self._window(self._clock()), 0)
+
+
+_shared: Optional[WeightLimiter] = None
+_configured = False
+_shared_lock = threading.Lock()
+
+
+def shared_limiter() -> Optional[WeightLimiter]:
+    """The process-wide limiter, created on first use (None when SPECTRE_BINANCE_WEIGHT_LIMIT=0)."""
+    global _shared, _configured
+    if not _configured:
+        with _shared_lock:
+            if not _configured:
+                limit = int(os.environ.get(WEIGHT_LIMIT_ENV) or DEFAULT_WEIGHT_LIMIT)
+                _shared = WeightLimiter(limit) if limit > 0 else None
+                _configured = True
+    return _shared
+
+
+def set_shared_limiter(limiter: Optional[WeightLimiter], *, from_env: bool = False) -> None:
+    """Replace the process-wide limiter; with from_env, re-read SPECTRE_BINANCE_WEIGHT_LIMIT on next use."""
+    global _shared, _configured
+    with _shared_lock:
+        _shared = limiter
+        _configured = not from_env
+
+
+def throttle(path: str, params: Optional[Mapping[str, Any]] = None) -> None:
+    """Wait until the shared limiter allows a call to `path` with `params`."""
+    limiter = shared_limiter()
+    if limiter is not None:
+        limiter.acquire(request_weight(path, params))
+
+
+def record_response(resp: Any) -> None:
+    """Feed a response's status and weight headers back into the shared limiter."""
+    limiter = shared_limiter()
+    if limiter is not None:
+        limiter.update(getattr(resp, "status_code", None), getattr(resp, "headers", None))
@@ -0,0 +1,83 @@
+"""
+rebalance.py
+Diff target notionals against current holdings.
+
+The portfolio state is the same document the simulator reads:
+{"balances": {"USDT": 100.0, "BTC": 0.001, ...}}. Every symbol that is either
+a target or currently held is diffed in one pass; held symbols that are no
+longer targets get a target of zero and are sold. Deltas that are too small
+to be worth trading (below the order minimum, the symbol's exchange
+min_notional, or turnover_threshold x budget) are suppressed rather than
+refused, so re-running a plan against the holdings it produced yields no
+orders instead of doubling exposure.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_TURNOVER_THRESHOLD = 0.01
+
+SIDE_BUY = "BUY"
+SIDE_SELL = "SELL"
+
+
+def rebalance_symbols(targets: Sequence[str], balances: Mapping[str, float], quote: str) -> List[str]:
+    """Target symbols followed by held, non-target `quote` pairs (sorted)."""
+    held = sorted(
+        f"{asset}{quote}" for asset, amount in balances.items()
+        if asset != quote and float(amount or 0.0) > 0 and f"{asset}{quote}" not in targets
+    )
+    return list(targets) + held
+
+
+def base_asset(symbol: str, quote: str, rule: Optional[Mapping[str, Any]] = None) -> str:
+    if rule and rule.get("base_asset"):
+        return rule["base_asset"]
+    return symbol[: -len(quote)] if symbol.endswith(quote) else symbol
+
+
+def rebalance_deltas(
+    symbols: Sequence[str],
+    target_notional: Mapping[str, float],
+    balances: Mapping[str, float],
+    prices: Mapping[str, Optional[float]],
+    rules: Mapping[str, Mapping[str, Any]],
+    quote: str,
+    budget: float,
+    min_order_notional: float,
+    turnover_threshold: float = DEFAULT_TURNOVER_THRESHOLD,
+) -> Tuple[Dict[str, Tuple[str, float]], Dict[str, float], List[Dict[str, Any]]]:
+    """
+    Returns (deltas, current_notional, suppressed):
+    deltas maps symbol -> (side, notional_quote) for the trades to make;
+    current_notional is each symbol's holding valued at `prices`;
+    suppressed lists {"symbol", "delta_quote", "reason"} for skipped trades.
+
+    Symbols without a price cannot be diffed; they are passed through with
+    their full target so the plan's price check refuses them.
+    """
+    deltas: Dict[str, Tuple[str, float]] = {}
+    current: Dict[str, float] = {}
+    suppressed: List[Dict[str, Any]] = []
+    turnover_floor = turnover_threshold * budget
+    for symbol in symbols:
+        target = target_notional.get(symbol, 0.0)
+        price = prices.get(symbol)
+        if not price or price <= 0:
+            deltas[symbol] = (SIDE_BUY if target > 0 else SIDE_SELL, target)
+            continue
+        rule = rules.get(symbol) or {}
+        held = float(balances.get(base_asset(symbol, quote, rule), 0.0) or 0.0)
+        current[symbol] = round(held * price, 2)
+        delta = round(target - held * price, 2)
+        size = abs(delta)
+        if size == 0:
+            continue
+        floor = max(min_order_notional, float(rule.get("min_notional") or 0.0))
+        if size < floor:
+            suppressed.append({"symbol": symbol, "delta_quote": delta, "reason": "BELOW_MIN_NOTIONAL"})
+        elif size < turnover_floor:
+            suppressed.append({"symbol": symbol, "delta_quote": delta, "reason": "BELOW_TURNOVER_THRESHOLD"})
+        else:
+            deltas[symbol] = (SIDE_BUY if delta > 0 else SIDE_SELL, size)
+    return deltas, current, suppressed
@@ -0,0 +1,119 @@
+"""
+resample.py
+Binance kline intervals and local resampling of finer bars into coarser ones.
+
+Bars are bucketed by open time the way Binance does: fixed-width buckets
+aligned to the Unix epoch, except 1w which starts on Monday 00:00 UTC.
+"""
+from __future__ import annotations
+
+from typing import Any, List, Sequence
+
+from spectre.candles import CandleSeries
+
+MINUTE_MS = 60_000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+
+INTERVAL_MS = {
+    "1m": MINUTE_MS,
+    "3m": 3 * MINUTE_MS,
+    "5m": 5 * MINUTE_MS,
+    "15m": 15 * MINUTE_MS,
+    "30m": 30 * MINUTE_MS,
+    "1h": HOUR_MS,
+    "2h": 2 * HOUR_MS,
+    "4h": 4 * HOUR_MS,
+    "6h": 6 * HOUR_MS,
+    "8h": 8 * HOUR_MS,
+    "12h": 12 * HOUR_MS,
+    "1d": DAY_MS,
+    "3d": 3 * DAY_MS,
+    "1w": 7 * DAY_MS,
+}
+INTERVALS = tuple(INTERVAL_MS)
+
+# 1970-01-01 was a Thursday; Binance weeks open on Monday.
+_WEEK_OFFSET_MS = 3 * DAY_MS
+
+
+def interval_ms(interval: str) -> int:
+    try:
+        return INTERVAL_MS[interval]
+    except KeyError:
+        raise ValueError(f"Unsupported interval: {interval} (expected one of {', '.join(INTERVALS)})") from None
+
+
+def periods_per_year(interval: str) -> float:
+    """Number of bars of `interval` in a 365-day year (crypto trades every day)."""
+    return 365 * DAY_MS / interval_ms(interval)
+
+
+def bars_for_lookback(lookback_days: int, interval: str) -> int:
+    return max(1, lookback_days * DAY_MS // interval_ms(interval))
+
+
+def bucket_start(open_ms: int, interval: str) -> int:
+    width = interval_ms(interval)
+    if interval == "1w":
+        return (open_ms + _WEEK_OFFSET_MS) // width * width - _WEEK_OFFSET_MS
+    return open_ms // width * width
+
+
+def can_resample(from_interval: str, to_interval: str) -> bool:
+    src, dst = interval_ms(from_interval), interval_ms(to_interval)
+    if dst < src or dst % src:
+        return False
+    # Weekly buckets are Monday-aligned, so only sources that tile a day can fill them.
+    return to_interval != "1w" or DAY_MS % src == 0
+
+
+def resample_series(series: CandleSeries, from_interval: str, to_interval: str) -> CandleSeries:
+    """
+    Aggregate an ascending CandleSeries of `from_interval` bars into
+    `to_interval` bars.
+
+    A leading bucket that is missing bars is dropped, since its open/high/low
+    would be wrong; the trailing bucket is kept even if incomplete, matching
+    the in-progress candle Binance itself returns.
+    """
+    if not can_resample(from_interval, to_interval):
+        raise ValueError(f"Cannot resample {from_interval} bars into {to_interval} bars")
+    if from_interval == to_interval:
+        return series
+    per_bucket = interval_ms(to_interval) // interval_ms(from_interval)
+    width = interval_ms(to_interval)
+    offset = _WEEK_OFFSET_MS if to_interval == "1w" else 0
+
+    out = CandleSeries()
+    counts: List[int] = []
+    for t, o, h, l, c, v in zip(series.t, series.o, series.h, series.l, series.c, series.v):
+        start = (t + offset) // width * width - offset
+        if not counts or start != out.t[-1]:
+            out.t.append(start)
+            out.o.append(o)
+            out.h.append(h)
+            out.l.append(l)
+            out.c.append(c)
+            out.v.append(v)
+            counts.append(1)
+        else:
+            if h > out.h[-1]:
+                out.h[-1] = h
+            if l < out.l[-1]:
+                out.l[-1] = l
+            out.c[-1] = c
+            out.v[-1] += v
+            counts[-1] += 1
+    if counts and counts[0] < per_bucket and len(counts) > 1:
+        return out.tail(len(counts) - 1)
+    return out
+
+
+def resample_klines(rows: Sequence[Sequence[Any]], from_interval: str, to_interval: str) -> List[list]:
+    """
+    Aggregate ascending kline rows [open_ms, o, h, l, c, v, ...] of `from_interval`
+    into rows [open_ms, o, h, l, c, v] of `to_interval` (prices as floats).
+    See resample_series for how partial buckets are handled.
+    """
+    return resample_series(CandleSeries.from_klines(rows), from_interval, to_interval).klines()
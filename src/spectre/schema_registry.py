@@ -0,0 +1,209 @@
+"""
+schema_registry.py
+Process-wide registry of compiled JSON Schema validators.
+
+Each schema is read from schemas/ and checked once, the first time it is used;
+after that validating a document costs only the document walk. Definitions
+shared by several artifacts (the telemetry section) live in their own schema
+file and are referenced by file name, e.g. {"$ref": "telemetry.schema.json"}.
+
+Facts packs can also be validated in a cheaper tiered mode: everything except
+market_data.candles is validated against the schema as usual, and the candle
+arrays get either a fast structural check or a random-sample schema check.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+import json
+import math
+import random
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from jsonschema import Draft7Validator, ValidationError
+from jsonschema.validators import validator_for
+from referencing import Registry, Resource
+
+from spectre.candles import CandleSeries
+from spectre.telemetry import span
+
+SCHEMA_DIR = Path(__file__).resolve().parents[2] / "schemas"
+
+FACTS_PACK = "facts_pack"
+DECISION_PACKET = "decision_packet"
+EXECUTION_PLAN = "execution_plan"
+TELEMETRY = "telemetry"
+# Schemas the artifact schemas $ref by file name.
+SHARED_SCHEMAS = (TELEMETRY,)
+
+VALIDATION_FULL = "full"
+VALIDATION_STRUCTURAL = "structural"
+VALIDATION_SAMPLE = "sample"
+VALIDATION_MODES = (VALIDATION_FULL, VALIDATION_STRUCTURAL, VALIDATION_SAMPLE)
+DEFAULT_SAMPLE_SIZE = 50
+
+CANDLE_FIELDS = frozenset(("t", "o", "h", "l", "c", "v"))
+
+
+def schema_path(name: str) -> Path:
+    return SCHEMA_DIR / f"{name}.schema.json"
+
+
+@lru_cache(maxsize=None)
+def get_schema(name: str) -> Dict[str, Any]:
+    with open(schema_path(name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def _registry() -> Registry:
+    # The shared schemas, under the relative URIs the artifact schemas use to $ref them.
+    return Registry().with_resources(
+        (schema_path(name).name, Resource.from_contents(get_schema(name))) for name in SHARED_SCHEMAS
+    )
+
+
+@lru_cache(maxsize=None)
+def get_validator(name: str):
+    """Return the compiled validator for schemas/<name>.schema.json (Draft 2020-12, else Draft 7)."""
+    schema = get_schema(name)
+    cls = validator_for(schema, default=Draft7Validator)
+    cls.check_schema(schema)
+    return cls(schema, registry=_registry())
+
+
+def validate(name: str, instance: Dict[str, Any]) -> None:
+    """Raise jsonschema.ValidationError if `instance` does not match schema `name`."""
+    with span(f"schema.{name}"):
+        get_validator(name).validate(instance)
+
+
+@lru_cache(maxsize=None)
+def _candles_validator():
+    # Compiled sub-schema for market_data.candles (symbol -> candle array).
+    schema = get_schema(FACTS_PACK)
+    candles_schema = schema["properties"]["market_data"]["properties"]["candles"]
+    return get_validator(FACTS_PACK).evolve(schema=candles_schema)
+
+
+@lru_cache(maxsize=None)
+def _candle_validator():
+    # Compiled sub-schema for a single candle object.
+    candle_schema = _candles_validator().schema["additionalProperties"]["items"]
+    return get_validator(FACTS_PACK).evolve(schema=candle_schema)
+
+
+def _is_finite_number(x: Any) -> bool:
+    return isinstance(x, (int, float)) and not isinstance(x, bool) and math.isfinite(x)
+
+
+def check_candles_structure(candles_by_symbol: Dict[str, Any]) -> None:
+    """
+    Fast typed check of market_data.candles: every row has exactly the candle
+    fields, prices/volume are finite numbers (volume >= 0) and timestamps are
+    strictly increasing per symbol.
+    """
+    if not isinstance(candles_by_symbol, dict):
+        raise ValidationError("market_data.candles must be an object")
+    for symbol, rows in candles_by_symbol.items():
+        if not isinstance(rows, list):
+            raise ValidationError(f"market_data.candles.{symbol} must be an array")
+        prev_t = None
+        for i, row in enumerate(rows):
+            if not isinstance(row, dict) or row.keys() != CANDLE_FIELDS:
+                raise ValidationError(f"market_data.candles.{symbol}[{i}] must have exactly the fields t,o,h,l,c,v")
+            t = row["t"]
+            if not isinstance(t, str):
+                raise ValidationError(f"market_data.candles.{symbol}[{i}].t must be a string")
+            if prev_t is not None and t <= prev_t:
+                raise ValidationError(f"market_data.candles.{symbol}[{i}].t is not after the previous candle")
+            prev_t = t
+            if not (_is_finite_number(row["o"]) and _is_finite_number(row["h"]) and _is_finite_number(row["l"])
+                    and _is_finite_number(row["c"]) and _is_finite_number(row["v"])):
+                raise ValidationError(f"market_data.candles.{symbol}[{i}] has a non-finite or non-numeric value")
+            if row["v"] < 0:
+                raise ValidationError(f"market_data.candles.{symbol}[{i}].v must be >= 0")
+
+
+def check_candles_sample(candles_by_symbol: Dict[str, Any], sample_size: int = DEFAULT_SAMPLE_SIZE, seed: int = 0) -> None:
+    """Validate a deterministic random sample of up to `sample_size` candles per symbol against the schema."""
+    if not isinstance(candles_by_symbol, dict):
+        raise ValidationError("market_data.candles must be an object")
+    validator = _candle_validator()
+    rng = random.Random(seed)
+    for symbol in sorted(candles_by_symbol):
+        rows = candles_by_symbol[symbol]
+        if not isinstance(rows, list):
+            raise ValidationError(f"market_data.candles.{symbol} must be an array")
+        picked = rows if len(rows) <= sample_size else rng.sample(rows, sample_size)
+        for row in picked:
+            validator.validate(row)
+
+
+def validate_candles(
+    candles_by_symbol: Dict[str, Any],
+    mode: str = VALIDATION_FULL,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    seed: int = 0,
+) -> None:
+    """
+    Validate market_data.candles (or any subset of its symbols) using the given
+    tier. Values may be candle arrays or CandleSeries; a series is checked
+    column-wise in structural mode and rendered to candle objects otherwise.
+    """
+    if isinstance(candles_by_symbol, dict) and any(isinstance(c, CandleSeries) for c in candles_by_symbol.values()):
+        rows_by_symbol = {}
+        for symbol, candles in candles_by_symbol.items():
+            if not isinstance(candles, CandleSeries):
+                rows_by_symbol[symbol] = candles
+            elif mode != VALIDATION_STRUCTURAL:
+                rows_by_symbol[symbol] = candles.to_candles()
+            else:
+                error = candles.structure_errors()
+                if error:
+                    raise ValidationError(f"market_data.candles.{symbol}: {error}")
+        candles_by_symbol = rows_by_symbol
+    with span(f"schema.candles.{mode}"):
+        if mode == VALIDATION_FULL:
+            _candles_validator().validate(candles_by_symbol)
+        elif mode == VALIDATION_STRUCTURAL:
+            check_candles_structure(candles_by_symbol)
+        elif mode == VALIDATION_SAMPLE:
+            check_candles_sample(candles_by_symbol, sample_size=sample_size, seed=seed)
+        else:
+            raise ValueError(f"Unknown validation mode: {mode}")
+
+
+def validate_facts_pack(
+    instance: Dict[str, Any],
+    mode: str = VALIDATION_FULL,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    seed: int = 0,
+) -> None:
+    """
+    Validate a facts pack. mode="full" (the default) validates the whole
+    document against the schema. "structural" and "sample" validate everything
+    except market_data.candles against the schema, then check the candles with
+    check_candles_structure / check_candles_sample respectively.
+    """
+    if mode == VALIDATION_FULL:
+        validate(FACTS_PACK, instance)
+        return
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"Unknown validation mode: {mode}")
+    market_data = instance.get("market_data")
+    candles: Optional[Dict[str, Any]] = None
+    if isinstance(market_data, dict) and "candles" in market_data:
+        candles = market_data["candles"]
+        instance = {**instance, "market_data": {**market_data, "candles": {}}}
+    validate(FACTS_PACK, instance)
+    if candles is not None:
+        validate_candles(candles, mode=mode, sample_size=sample_size, seed=seed)
+
+
+def validate_decision_packet(instance: Dict[str, Any]) -> None:
+    validate(DECISION_PACKET, instance)
+
+
+def validate_execution_plan(instance: Dict[str, Any]) -> None:
+    validate(EXECUTION_PLAN, instance)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any, Dict
 
+from spectre import json_backend
 from spectre.execution_plan import build_execution_plan
+from spectre.metrics import mark_run, time_pass, write_textfile_from_env
+from spectre.profiling import profile_pass
 from spectre.simulator_stub import simulate_execution_plan
 
 
@@ -12,7 +14,7 @@ def _load(path: str | Path) -> Dict[str, Any]:
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"File not found: {p}")
-    return json.loads(p.read_text(encoding="utf-8"))
+    return json_backend.loads(p.read_bytes())
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -28,8 +30,15 @@ def main(argv: list[str] | None = None) -> int:
     decision = _load(decision_path)
     state = _load(state_path)
 
-    plan = build_execution_plan(facts, decision, facts_path, decision_path)
-    report = simulate_execution_plan(plan, state, all_or_nothing=True)
+    # Diff against the same holdings the simulator starts from.
+    with time_pass("build_execution_plan"), profile_pass("shadow_run.build_execution_plan"):
+        plan = build_execution_plan(facts, decision, facts_path, decision_path,
+                                    portfolio_state=state, portfolio_state_path=state_path)
+    with time_pass("simulate_execution_plan"), profile_pass("shadow_run.simulate_execution_plan"):
+        report = simulate_execution_plan(plan, state, all_or_nothing=True)
+    # Exported when SPECTRE_METRICS_TEXTFILE is set.
+    mark_run("shadow_run")
+    write_textfile_from_env()
 
     out = {
         "inputs": {
@@ -41,7 +50,7 @@ def main(argv: list[str] | None = None) -> int:
         "simulation_report": report,
     }
 
-    print(json.dumps(out, indent=2, sort_keys=True))
+    print(json_backend.dumps(out, indent=True, sort_keys=True).decode("utf-8"))
     return 0
 
 
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any, Dict, Tuple
 
+from spectre import json_backend
+from spectre.metrics import record_simulation
+from spectre.profiling import profile_pass
+
 
 def load_json(path: str | Path) -> Dict[str, Any]:
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"File not found: {p}")
-    return json.loads(p.read_text(encoding="utf-8"))
+    return json_backend.loads(p.read_bytes())
 
 
 def _split_symbol(symbol: str) -> Tuple[str, str]:
@@ -19,13 +22,39 @@ def _split_symbol(symbol: str) -> Tuple[str, str]:
     return symbol[:-4], "USDT"
 
 
+def _sell_quantity(order: Dict[str, Any]) -> float:
+    # Plans carry the step-rounded quantity; fall back to notional / price.
+    qty = order.get("quantity_base")
+    if qty:
+        return float(qty)
+    price = float(order.get("price_used") or 0.0)
+    return float(order.get("notional_quote", 0.0)) / price if price > 0 else 0.0
+
+
+def _aborted(rejected: list[Dict[str, Any]], starting_balances: Dict[str, float]) -> Dict[str, Any]:
+    # All-or-nothing abort: nothing executed, so the starting balances are returned untouched.
+    return {
+        "action": "no_action",
+        "accepted_orders": [],
+        "rejected_orders": rejected,
+        "resulting_balances": dict(starting_balances),
+    }
+
+
 def simulate_execution_plan(
     plan: Dict[str, Any],
     portfolio_state: Dict[str, Any],
     *,
     all_or_nothing: bool = True,
 ) -> Dict[str, Any]:
-    balances: Dict[str, float] = dict(portfolio_state.get("balances", {}))
+    report = _simulate(plan, portfolio_state, all_or_nothing)
+    record_simulation(report)
+    return report
+
+
+def _simulate(plan: Dict[str, Any], portfolio_state: Dict[str, Any], all_or_nothing: bool) -> Dict[str, Any]:
+    starting_balances: Dict[str, float] = dict(portfolio_state.get("balances", {}))
+    balances = dict(starting_balances)
     orders = list(plan.get("plan", {}).get("orders", []))
 
     accepted: list[Dict[str, Any]] = []
@@ -40,9 +69,14 @@ def simulate_execution_plan(
             "resulting_balances": balances,
         }
 
-    # v0: only BUY orders supported.
-    # Determine cumulative required quote spend for BUY orders.
+    # SELLs execute before BUYs so their proceeds can fund the buys.
+    orders.sort(key=lambda o: o.get("side") != "SELL")
+
+    # Determine cumulative required quote spend for BUY orders, net of SELL proceeds,
+    # and the base quantity each SELL needs.
     required_quote_total = 0.0
+    sell_quote_total = 0.0
+    required_base: Dict[str, float] = {}
     quote_currency = "USDT"
 
     for o in orders:
@@ -50,42 +84,38 @@ def simulate_execution_plan(
         side = o.get("side")
         notional = float(o.get("notional_quote", 0.0))
 
-        if side != "BUY":
+        if side not in ("BUY", "SELL"):
             rejected.append({"symbol": symbol, "reason": "UNSUPPORTED_SIDE"})
             continue
 
         # Validate symbol format.
-        _base, quote = _split_symbol(symbol)
+        base, quote = _split_symbol(symbol)
         quote_currency = quote
 
         if notional <= 0:
             rejected.append({"symbol": symbol, "reason": "BAD_NOTIONAL"})
             continue
 
-        required_quote_total += notional
+        if side == "SELL":
+            # Credited as execution does: the step-rounded quantity at price_used.
+            sell_quote_total += _sell_quantity(o) * float(o.get("price_used") or 0.0)
+            required_base[base] = required_base.get(base, 0.0) + _sell_quantity(o)
+        else:
+            required_quote_total += notional
 
-    quote_bal = float(balances.get(quote_currency, 0.0))
+    quote_bal = float(balances.get(quote_currency, 0.0)) + sell_quote_total
 
     # All-or-nothing: if ANY problem exists OR cumulative spend exceeds balance, abort.
     if all_or_nothing:
         if rejected:
-            return {
-                "action": "no_action",
-                "accepted_orders": [],
-                "rejected_orders": rejected + [{"symbol": "*", "reason": "ALL_OR_NOTHING_ABORT"}],
-                "resulting_balances": balances,
-            }
-        if required_quote_total > quote_bal:
+            return _aborted(rejected + [{"symbol": "*", "reason": "ALL_OR_NOTHING_ABORT"}], starting_balances)
+        short_bases = {b for b, qty in required_base.items() if qty > float(balances.get(b, 0.0))}
+        if required_quote_total > quote_bal or short_bases:
             # Reject each order deterministically with insufficient balance.
             for o in orders:
                 rejected.append({"symbol": o.get("symbol"), "reason": "INSUFFICIENT_BALANCE"})
             rejected.append({"symbol": "*", "reason": "ALL_OR_NOTHING_ABORT"})
-            return {
-                "action": "no_action",
-                "accepted_orders": [],
-                "rejected_orders": rejected,
-                "resulting_balances": balances,
-            }
+            return _aborted(rejected, starting_balances)
 
     # If partial execution is allowed, we execute sequentially as long as balance remains.
     for o in orders:
@@ -94,7 +124,7 @@ def simulate_execution_plan(
         notional = float(o.get("notional_quote", 0.0))
         price = float(o.get("price_used") or 0.0)
 
-        if side != "BUY":
+        if side not in ("BUY", "SELL"):
             rejected.append({"symbol": symbol, "reason": "UNSUPPORTED_SIDE"})
             continue
 
@@ -104,27 +134,39 @@ def simulate_execution_plan(
 
         base, quote = _split_symbol(symbol)
         quote_bal = float(balances.get(quote, 0.0))
+        base_bal = float(balances.get(base, 0.0))
 
         if price <= 0:
             rejected.append({"symbol": symbol, "reason": "MISSING_PRICE_USED"})
             if all_or_nothing:
-                return {
-                    "action": "no_action",
-                    "accepted_orders": [],
-                    "rejected_orders": rejected + [{"symbol": "*", "reason": "ALL_OR_NOTHING_ABORT"}],
-                    "resulting_balances": balances,
+                return _aborted(rejected + [{"symbol": "*", "reason": "ALL_OR_NOTHING_ABORT"}], starting_balances)
+            continue
+
+        if side == "SELL":
+            qty = _sell_quantity(o)
+            if base_bal < qty:
+                rejected.append({"symbol": symbol, "reason": "INSUFFICIENT_BALANCE"})
+                if all_or_nothing:
+                    return _aborted(rejected + [{"symbol": "*", "reason": "ALL_OR_NOTHING_ABORT"}], starting_balances)
+                continue
+            proceeds = qty * price
+            balances[base] = base_bal - qty
+            balances[quote] = quote_bal + proceeds
+            accepted.append(
+                {
+                    "symbol": symbol,
+                    "side": "SELL",
+                    "notional_quote": proceeds,
+                    "price_used": price,
+                    "quantity_base_simulated": qty,
                 }
+            )
             continue
 
         if quote_bal < notional:
             rejected.append({"symbol": symbol, "reason": "INSUFFICIENT_BALANCE"})
             if all_or_nothing:
-                return {
-                    "action": "no_action",
-                    "accepted_orders": [],
-                    "rejected_orders": rejected + [{"symbol": "*", "reason": "ALL_OR_NOTHING_ABORT"}],
-                    "resulting_balances": balances,
-                }
+                return _aborted(rejected + [{"symbol": "*", "reason": "ALL_OR_NOTHING_ABORT"}], starting_balances)
             continue
 
         qty = notional / price
@@ -141,10 +183,9 @@ def simulate_execution_plan(
             }
         )
 
-    final_action = "rebalance" if accepted else "no_action"
     if all_or_nothing and rejected:
-        final_action = "no_action"
-        accepted = []
+        return _aborted(rejected, starting_balances)
+    final_action = "rebalance" if accepted else "no_action"
 
     return {
         "action": final_action,
@@ -164,8 +205,9 @@ def main(argv: list[str] | None = None) -> int:
 
     plan = load_json(argv[0])
     state = load_json(argv[1])
-    report = simulate_execution_plan(plan, state, all_or_nothing=True)
-    print(json.dumps(report, indent=2, sort_keys=True))
+    with profile_pass("simulate_execution_plan"):
+        report = simulate_execution_plan(plan, state, all_or_nothing=True)
+    print(json_backend.dumps(report, indent=True, sort_keys=True).decode("utf-8"))
     return 0
 
 
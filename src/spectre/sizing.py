@@ -0,0 +1,150 @@
+"""
+sizing.py
+Notional allocation for the execution plan.
+
+- equal: the budget split evenly across allowed symbols (the original rule).
+- inverse_vol: weights proportional to 1 / realised vol.
+- risk_parity: equal risk contribution under the covariance built from the
+  facts pack's realised vols and correlation matrix.
+
+The risk-based modes deploy budget * gross, where gross is the decision
+packet's max_gross_exposure, reduced further when the weighted portfolio's
+vol would exceed vol_target_annualised. Pure Python; the risk-parity solve is
+cyclical coordinate descent, O(n^2) per sweep.
+"""
+from __future__ import annotations
+
+import math
+from operator import mul
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+SIZING_EQUAL = "equal"
+SIZING_INVERSE_VOL = "inverse_vol"
+SIZING_RISK_PARITY = "risk_parity"
+SIZING_MODES = (SIZING_EQUAL, SIZING_INVERSE_VOL, SIZING_RISK_PARITY)
+
+_RP_MAX_SWEEPS = 500
+_RP_TOLERANCE = 1e-10
+
+
+class SizingError(Exception):
+    """Inputs needed for a sizing mode are missing from the facts pack."""
+
+    def __init__(self, code: str, symbol: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.symbol = symbol
+
+
+def inverse_vol_weights(vols: Sequence[float]) -> List[float]:
+    inv = [1.0 / v for v in vols]
+    total = sum(inv)
+    return [x / total for x in inv]
+
+
+def risk_parity_weights(cov: Sequence[Sequence[float]]) -> List[float]:
+    """
+    Long-only weights (summing to 1) whose risk contributions w_i (Cov w)_i
+    are all equal. Each coordinate step solves the scalar first-order
+    condition of the convex program min 1/2 w'Cov w - (1/n) sum log w_i in
+    closed form, keeping Cov w up to date incrementally.
+    """
+    n = len(cov)
+    budget = 1.0 / n
+    w = inverse_vol_weights([math.sqrt(cov[i][i]) for i in range(n)])
+    cw = [sum(map(mul, row, w)) for row in cov]
+    for _ in range(_RP_MAX_SWEEPS):
+        largest_step = 0.0
+        for i in range(n):
+            a = cov[i][i]
+            b = cw[i] - a * w[i]
+            new = (-b + math.sqrt(b * b + 4 * a * budget)) / (2 * a)
+            delta = new - w[i]
+            if delta:
+                w[i] = new
+                # Cov is symmetric, so column i of Cov is row i.
+                cw = [c + x * delta for c, x in zip(cw, cov[i])]
+                largest_step = max(largest_step, abs(delta) / new)
+        if largest_step <= _RP_TOLERANCE:
+            break
+    total = sum(w)
+    return [x / total for x in w]
+
+
+def portfolio_vol(weights: Sequence[float], cov: Sequence[Sequence[float]]) -> float:
+    return math.sqrt(max(0.0, sum(wi * sum(map(mul, row, weights)) for wi, row in zip(weights, cov))))
+
+
+def _covariance(symbols: Sequence[str], vols: Sequence[float], correlation: Dict[str, Any]) -> List[List[float]]:
+    index = {s: i for i, s in enumerate(correlation.get("symbols", []))}
+    matrix = correlation.get("matrix", [])
+    for s in symbols:
+        if s not in index:
+            raise SizingError("NO_CORRELATION", s, f"No correlation data for {s}. Cannot size by risk parity.")
+    rows = [index[s] for s in symbols]
+    return [[vi * vj * matrix[ri][rj] for vj, rj in zip(vols, rows)] for vi, ri in zip(vols, rows)]
+
+
+def _vols(symbols: Sequence[str], facts_pack: Dict[str, Any]) -> List[float]:
+    by_symbol = facts_pack.get("computed", {}).get("realised_vol_annualised", {})
+    vols = []
+    for s in symbols:
+        v = by_symbol.get(s)
+        if not v or v <= 0:
+            raise SizingError("NO_VOLATILITY", s, f"No positive realised volatility for {s}. Cannot size by risk.")
+        vols.append(float(v))
+    return vols
+
+
+def target_weights(
+    symbols: Sequence[str],
+    facts_pack: Dict[str, Any],
+    mode: str,
+    max_gross_exposure: float = 1.0,
+    vol_target: Optional[float] = None,
+) -> Tuple[List[float], float]:
+    """
+    (weights summing to 1, gross) for `symbols`. Notional for symbol i is
+    budget * gross * weights[i]; gross is 1.0 for equal sizing.
+    """
+    n = len(symbols)
+    if mode == SIZING_EQUAL:
+        return [1.0 / n] * n, 1.0
+    vols = _vols(symbols, facts_pack)
+    if mode == SIZING_INVERSE_VOL:
+        weights = inverse_vol_weights(vols)
+        cov = None
+    elif mode == SIZING_RISK_PARITY:
+        cov = _covariance(symbols, vols, facts_pack.get("computed", {}).get("correlation", {}))
+        weights = risk_parity_weights(cov)
+    else:
+        raise ValueError(f"Unknown sizing mode: {mode} (expected one of {', '.join(SIZING_MODES)})")
+    gross = max_gross_exposure
+    if vol_target:
+        if cov is None:
+            # Inverse-vol ignores correlation when weighting, but not when measuring risk.
+            try:
+                cov = _covariance(symbols, vols, facts_pack.get("computed", {}).get("correlation", {}))
+            except SizingError:
+                cov = [[v * v if i == j else 0.0 for j in range(n)] for i, v in enumerate(vols)]
+        vol = portfolio_vol(weights, cov)
+        if vol > 0:
+            gross = min(gross, vol_target / vol)
+    return weights, gross
+
+
+def allocate_notional(
+    symbols: Sequence[str],
+    facts_pack: Dict[str, Any],
+    budget: float,
+    mode: str = SIZING_EQUAL,
+    max_gross_exposure: float = 1.0,
+    vol_target: Optional[float] = None,
+) -> Dict[str, float]:
+    """Quote notional per symbol, rounded to cents as in the equal split."""
+    if not symbols:
+        return {}
+    if mode == SIZING_EQUAL:
+        return {s: round(budget / len(symbols), 2) for s in symbols}
+    weights, gross = target_weights(symbols, facts_pack, mode, max_gross_exposure, vol_target)
+    return {s: round(budget * gross * w, 2) for s, w in zip(symbols, weights)}
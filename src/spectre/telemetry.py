@@ -0,0 +1,166 @@
+"""
+telemetry.py
+Opt-in timing and resource spans for the pipeline.
+
+Instrumented code wraps its work in named spans:
+
+    with span("http.binance.klines") as s:
+        resp = requests.get(...)
+        s.add_request(len(resp.content))
+
+Spans are only recorded inside collect(); elsewhere span() returns a shared
+no-op, so instrumented hot paths cost one global lookup when profiling is
+off. Each span name accumulates call count, wall time, CPU time (of the
+calling thread), request count and bytes downloaded. The summary adds the
+whole collection's wall and CPU time and the process's peak RSS, and is
+stored as the optional `telemetry` section of an artifact (scripts'
+--profile flag).
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far (None where unavailable, e.g. Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+    def add_request(self, nbytes: int = 0) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_telemetry", "_name", "_wall", "_cpu", "_requests", "_bytes")
+
+    def __init__(self, telemetry: "Telemetry", name: str):
+        self._telemetry = telemetry
+        self._name = name
+        self._requests = 0
+        self._bytes = 0
+
+    def __enter__(self) -> "_Span":
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        self._telemetry._record(
+            self._name, time.perf_counter() - self._wall, time.thread_time() - self._cpu, self._requests, self._bytes
+        )
+        return False
+
+    def add_request(self, nbytes: int = 0) -> None:
+        """Count one HTTP request that downloaded `nbytes` of body."""
+        self._requests += 1
+        self._bytes += nbytes
+
+
+class Telemetry:
+    """Span totals for one collect() block. Safe to record from several threads."""
+
+    def __init__(self) -> None:
+        self.spans: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self._elapsed: Optional[tuple] = None
+
+    def _record(self, name: str, wall: float, cpu: float, requests: int, nbytes: int) -> None:
+        with self._lock:
+            s = self.spans.get(name)
+            if s is None:
+                s = self.spans[name] = {"count": 0, "wall_s": 0.0, "cpu_s": 0.0, "requests": 0, "bytes": 0}
+            s["count"] += 1
+            s["wall_s"] += wall
+            s["cpu_s"] += cpu
+            s["requests"] += requests
+            s["bytes"] += nbytes
+
+    def finish(self) -> None:
+        self._elapsed = (time.perf_counter() - self._wall, time.process_time() - self._cpu)
+
+    def summary(self) -> Dict[str, Any]:
+        """The `telemetry` artifact section: totals plus per-span figures, spans sorted by name."""
+        wall, cpu = self._elapsed or (time.perf_counter() - self._wall, time.process_time() - self._cpu)
+        with self._lock:
+            spans = {name: dict(s) for name, s in sorted(self.spans.items())}
+        return {
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "requests": sum(s["requests"] for s in spans.values()),
+            "bytes_downloaded": sum(s["bytes"] for s in spans.values()),
+            "spans": {
+                name: {**s, "wall_s": round(s["wall_s"], 6), "cpu_s": round(s["cpu_s"], 6)}
+                for name, s in spans.items()
+            },
+        }
+
+
+_active: Optional[Telemetry] = None
+
+
+def span(name: str):
+    """Context manager timing `name` in the active collection (a no-op outside collect())."""
+    telemetry = _active
+    return _NULL_SPAN if telemetry is None else _Span(telemetry, name)
+
+
+@contextmanager
+def collect(enabled: bool = True) -> Iterator[Optional[Telemetry]]:
+    """Record spans for the duration of the block; yields None when not enabled."""
+    global _active
+    if not enabled:
+        yield None
+        return
+    previous, telemetry = _active, Telemetry()
+    _active = telemetry
+    try:
+        yield telemetry
+    finally:
+        _active = previous
+        telemetry.finish()
+
+
+def _mb(nbytes: Optional[int]) -> str:
+    return "n/a" if nbytes is None else f"{nbytes / 1e6:.1f} MB"
+
+
+def format_summary(summary: Dict[str, Any]) -> List[str]:
+    """Printable lines for --profile, slowest spans first."""
+    lines = [
+        f"Telemetry: wall {summary['wall_s']:.3f}s, cpu {summary['cpu_s']:.3f}s, "
+        f"peak RSS {_mb(summary['peak_rss_bytes'])}, {summary['requests']} request(s), "
+        f"{_mb(summary['bytes_downloaded'])} downloaded"
+    ]
+    spans = sorted(summary["spans"].items(), key=lambda item: -item[1]["wall_s"])
+    width = max((len(name) for name, _ in spans), default=0)
+    for name, s in spans:
+        line = f"  {name:<{width}}  x{s['count']:<5} wall {s['wall_s']:.3f}s  cpu {s['cpu_s']:.3f}s"
+        if s["requests"]:
+            line += f"  {s['requests']} req  {_mb(s['bytes'])}"
+        lines.append(line)
+    return lines
@@ -0,0 +1,139 @@
+"""
+universe.py
+Universe screening: pick the symbols the facts pass should fetch candles for.
+
+Two bulk calls (exchangeInfo for every symbol and the 24h ticker for every
+symbol) are enough to apply the cheap filters, quote asset, trading status and
+liquidity, to the whole exchange at once. The survivors are ranked by 24h
+quote volume, so the facts pass only downloads klines for a short list.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from spectre.artifact_io import load_json
+from spectre.binance_public import fetch_exchange_symbols, fetch_ticker_24hr
+
+
+
+@dataclass(frozen=True)
+class UniverseCriteria:
+    quote_asset: str = "USDT"
+    statuses: Tuple[str, ...] = ("TRADING",)
+    min_quote_volume: float = 10_000_000.0
+    min_trade_count: int = 0
+    # Maximum bid/ask spread in basis points (None = no spread filter).
+    max_spread_bps: Optional[float] = None
+    exclude_leveraged: bool = True
+    exclude: Tuple[str, ...] = ()
+    top_n: Optional[int] = 20
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _is_leveraged(entry: Dict[str, Any]) -> bool:
+    # Binance leveraged tokens (e.g. BTCUPUSDT) carry the LEVERAGED permission.
+    permissions = set(entry.get("permissions") or ())
+    for permission_set in entry.get("permissionSets") or ():
+        permissions.update(permission_set)
+    return "LEVERAGED" in permissions
+
+
+def _spread_bps(ticker: Dict[str, Any]) -> Optional[float]:
+    bid, ask = _float(ticker.get("bidPrice")), _float(ticker.get("askPrice"))
+    if bid <= 0 or ask <= 0:
+        return None
+    return (ask - bid) / ((ask + bid) / 2) * 10_000
+
+
+def screen_universe(
+    exchange_symbols: Sequence[Dict[str, Any]],
+    tickers: Sequence[Dict[str, Any]],
+    criteria: UniverseCriteria = UniverseCriteria(),
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Filter and rank symbols from raw exchangeInfo entries and 24h tickers.
+    Returns the ranked rows (highest quote volume first) and how many symbols
+    were left after each filter step.
+    """
+    excluded = set(criteria.exclude)
+    listed = [
+        s for s in exchange_symbols
+        if s.get("quoteAsset") == criteria.quote_asset
+        and s.get("status") in criteria.statuses
+        and s.get("isSpotTradingAllowed", True)
+        and s.get("symbol") not in excluded
+        and not (criteria.exclude_leveraged and _is_leveraged(s))
+    ]
+    ticker_by_symbol = {t.get("symbol"): t for t in tickers}
+
+    rows = []
+    for s in listed:
+        t = ticker_by_symbol.get(s["symbol"])
+        if t is None:
+            continue
+        quote_volume = _float(t.get("quoteVolume"))
+        trade_count = int(_float(t.get("count")))
+        spread = _spread_bps(t)
+        if quote_volume < criteria.min_quote_volume or trade_count < criteria.min_trade_count:
+            continue
+        if criteria.max_spread_bps is not None and (spread is None or spread > criteria.max_spread_bps):
+            continue
+        rows.append({
+            "symbol": s["symbol"],
+            "base_asset": s.get("baseAsset"),
+            "quote_volume": quote_volume,
+            "trade_count": trade_count,
+            "last_price": _float(t.get("lastPrice")),
+            "spread_bps": spread,
+        })
+
+    rows.sort(key=lambda r: (-r["quote_volume"], r["symbol"]))
+    liquid = len(rows)
+    if criteria.top_n is not None:
+        rows = rows[:criteria.top_n]
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+    counts = {"exchange": len(exchange_symbols), "listed": len(listed), "liquid": liquid, "selected": len(rows)}
+    return rows, counts
+
+
+def build_universe(criteria: UniverseCriteria = UniverseCriteria()) -> Dict[str, Any]:
+    """Run the screen against live Binance data (two bulk requests) and return the universe artifact."""
+    exchange_symbols = fetch_exchange_symbols()
+    tickers = fetch_ticker_24hr()
+    rows, counts = screen_universe(exchange_symbols, tickers, criteria)
+    return {
+        "as_of_utc": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+        "venue": "binance",
+        "criteria": asdict(criteria),
+        "counts": counts,
+        "symbols": rows,
+    }
+
+
+def universe_symbols(universe: Dict[str, Any]) -> List[str]:
+    return [row["symbol"] for row in universe.get("symbols", [])]
+
+
+def load_symbols_file(path: str) -> List[str]:
+    """
+    Symbols from a universe.json written by scripts/build_universe.py, or from
+    a plain text file with one symbol per line or comma-separated ("#" starts
+    a comment).
+    """
+    if path.endswith((".json", ".json.gz", ".json.zst")):
+        return universe_symbols(load_json(path))
+    symbols: List[str] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0]
+            symbols.extend(s.strip() for s in line.replace(",", " ").split())
+    return symbols
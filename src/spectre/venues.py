@@ -0,0 +1,210 @@
+"""
+venues.py
+Venue adapters: one interface for candles, exchange rules and prices.
+
+Every adapter returns the forms the pipeline already works in:
+
+- fetch_candles: a columnar CandleSeries (int ms open times, float columns).
+- fetch_rules: {symbol: {step_size, min_qty, min_notional, base_asset, quote_asset}},
+  as used for the execution plan's exchange_rules.
+- fetch_prices: {symbol: last price, or None when the venue has none}.
+
+BinanceVenue wraps spectre.binance_public. FileVenue serves a directory: a
+candle store (see spectre.candle_store) plus optional rules.json and
+prices.json, for tests, offline runs and comparisons. The pipeline's
+--venue option picks the adapter for the primary candles and for the
+execution plan's prices and rules.
+
+fetch_from_venues fetches the same symbols from several venues concurrently,
+one worker per venue, so each venue still sees its requests one at a time.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import spectre.binance_public as bp
+from spectre.candle_store import CandleStore
+from spectre.candles import CandleSeries
+from spectre.telemetry import span
+
+RULES_FILE = "rules.json"
+PRICES_FILE = "prices.json"
+
+
+class VenueAdapter(ABC):
+    """
+    Market data source for one venue. Subclasses implement the three fetches
+    and describe themselves for provenance: source_name (facts pack source),
+    candles_source (provenance note), price_source / rules_source (the
+    execution plan's pricing and exchange_rules sources).
+    """
+
+    name = "venue"
+    source_name = "venue"
+    candles_source = "venue"
+    price_source = "venue"
+    rules_source = "venue"
+
+    @abstractmethod
+    def fetch_candles(self, symbol: str, lookback_days: int, interval: str = "1d", fetch_interval: Optional[str] = None) -> CandleSeries:
+        ...
+
+    @abstractmethod
+    def fetch_rules(self, symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def fetch_prices(self, symbols: Sequence[str]) -> Dict[str, Optional[float]]:
+        ...
+
+    def data_fingerprint(self) -> Optional[str]:
+        """
+        Identity of the data the venue would serve now, for cache keys. None
+        for live venues, whose data the pipeline cache keys by UTC date.
+        """
+        return None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+def positive_or_none(prices: Dict[str, float], symbols: Sequence[str]) -> Dict[str, Optional[float]]:
+    """{symbol: price} for `symbols`, None where `prices` has no positive price."""
+    result: Dict[str, Optional[float]] = {}
+    for symbol in symbols:
+        price = prices.get(symbol)
+        result[symbol] = float(price) if price and price > 0 else None
+    return result
+
+
+class BinanceVenue(VenueAdapter):
+    """Binance spot public REST (honours SPECTRE_BINANCE_BASE_URL and the shared weight limiter)."""
+
+    source_name = "Binance Spot Public REST"
+    candles_source = "/api/v3/klines"
+    price_source = "binance_public"
+    rules_source = "binance_exchange_info"
+
+    def __init__(self, name: str = "binance"):
+        self.name = name
+
+    def fetch_candles(self, symbol, lookback_days, interval="1d", fetch_interval=None):
+        return bp.fetch_candle_series(symbol, lookback_days, interval, fetch_interval)
+
+    def fetch_rules(self, symbols):
+        return bp.fetch_exchange_info(list(symbols))
+
+    def fetch_prices(self, symbols):
+        return positive_or_none(bp.fetch_ticker_prices(), symbols)
+
+
+class FileVenue(VenueAdapter):
+    """
+    A venue served from disk: <root>/<SYMBOL>/<interval>/<YYYY-MM>.csv candles,
+    <root>/rules.json ({symbol: rule}) and <root>/prices.json ({symbol: price}).
+    Symbols missing from a file are left out of rules and priced as None.
+    """
+
+    def __init__(self, root: str | Path, name: Optional[str] = None):
+        self.root = Path(root)
+        self.name = name or self.root.name
+        self.source_name = f"Local files {self.root}"
+        self.candles_source = f"local candle store {self.root}"
+        self.price_source = self.rules_source = f"file:{self.root}"
+        self._store = CandleStore(self.root)
+
+    def _load(self, file_name: str) -> Dict[str, Any]:
+        path = self.root / file_name
+        if not path.exists():
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def fetch_candles(self, symbol, lookback_days, interval="1d", fetch_interval=None):
+        return self._store.load_series(symbol, lookback_days, interval, fetch_interval)
+
+    def fetch_rules(self, symbols):
+        rules = self._load(RULES_FILE)
+        return {s: rules[s] for s in symbols if s in rules}
+
+    def fetch_prices(self, symbols):
+        return positive_or_none(self._load(PRICES_FILE), symbols)
+
+    def data_fingerprint(self):
+        """Hash of the resolved root and every file's relative path, size and mtime under it."""
+        root = self.root.resolve()
+        digest = hashlib.sha256(str(root).encode("utf-8"))
+        if root.is_dir():
+            for path in sorted(p for p in root.rglob("*") if p.is_file()):
+                st = path.stat()
+                digest.update(f"\0{path.relative_to(root).as_posix()}\0{st.st_size}\0{st.st_mtime_ns}".encode("utf-8"))
+        return digest.hexdigest()
+
+
+def venue_from_spec(spec: str) -> VenueAdapter:
+    """
+    Adapter for a CLI venue spec: "binance" or "file:DIR", optionally named
+    with a "NAME=" prefix (e.g. "archive=file:data/candles").
+    """
+    name, sep, target = spec.partition("=")
+    if not sep:
+        name, target = "", spec
+    if target == "binance":
+        return BinanceVenue(name or "binance")
+    if target.startswith("file:") and target[len("file:"):]:
+        return FileVenue(target[len("file:"):], name or None)
+    raise ValueError(f"Unknown venue {spec!r} (expected binance or file:DIR, optionally prefixed with NAME=)")
+
+
+def venues_from_specs(specs: Sequence[str]) -> List[VenueAdapter]:
+    """Adapters for several specs; venue names must be unique."""
+    venues = [venue_from_spec(spec) for spec in specs]
+    names = [v.name for v in venues]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate venue name(s): {', '.join(duplicates)} (name them with NAME=)")
+    return venues
+
+
+def _fetch_venue(
+    venue: VenueAdapter, symbols: Sequence[str], lookback_days: int, interval: str, fetch_interval: Optional[str]
+) -> Tuple[Dict[str, CandleSeries], Dict[str, str]]:
+    candles: Dict[str, CandleSeries] = {}
+    failures: Dict[str, str] = {}
+    with span(f"venue.{venue.name}.candles"):
+        for symbol in symbols:
+            try:
+                series = venue.fetch_candles(symbol, lookback_days, interval, fetch_interval)
+            except Exception as e:  # noqa: BLE001 - one missing symbol should not lose the venue
+                failures[symbol] = str(e)
+                continue
+            if series:
+                candles[symbol] = series
+            else:
+                failures[symbol] = "no candles returned"
+    return candles, failures
+
+
+def fetch_from_venues(
+    venues: Sequence[VenueAdapter],
+    symbols: Sequence[str],
+    lookback_days: int,
+    interval: str = "1d",
+    fetch_interval: Optional[str] = None,
+) -> Dict[str, Tuple[Dict[str, CandleSeries], Dict[str, str]]]:
+    """
+    Fetch `symbols` from every venue concurrently. Returns, per venue name,
+    the candles that were fetched and {symbol: reason} for those that were not.
+    """
+    if not venues:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(venues)) as pool:
+        futures = {
+            v.name: pool.submit(_fetch_venue, v, symbols, lookback_days, interval, fetch_interval) for v in venues
+        }
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import spectre.binance_public as bp
+import spectre.pipeline as pipeline
+from spectre.archive_import import import_archives, read_archive
+from spectre.candle_store import CandleStore
+from spectre.resample import DAY_MS
+
+
+def _ms(y, m, d):
+    return int(datetime(y, m, d, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _write_archive(dir_: Path, name: str, rows, header=False, micros=False) -> Path:
+    lines = []
+    if header:
+        lines.append("open_time,open,high,low,close,volume,close_time,quote_volume,count,tbbav,tbqav,ignore")
+    for t, o, h, l, c, v in rows:
+        ts = t * 1000 if micros else t
+        lines.append(f"{ts},{o},{h},{l},{c},{v},{ts + DAY_MS - 1},0,0,0,0,0")
+    path = dir_ / name
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(name.replace(".zip", ".csv"), "\n".join(lines) + "\n")
+    return path
+
+
+def _daily_rows(y, m, days, base=100.0):
+    return [(_ms(y, m, d), base + d, base + d + 2, base + d - 2, base + d + 1, 10.0) for d in range(1, days + 1)]
+
+
+def test_import_monthly_archives_and_read_back(tmp_path: Path):
+    store = CandleStore(tmp_path / "store")
+    a = _write_archive(tmp_path, "BTCUSDT-1d-2024-01.zip", _daily_rows(2024, 1, 31))
+    b = _write_archive(tmp_path, "BTCUSDT-1d-2024-02.zip", _daily_rows(2024, 2, 29), header=True)
+
+    report = import_archives([b, a], store)
+
+    assert report.rejected == []
+    assert report.imported == [("BTCUSDT", "1d", "2024-01", 31), ("BTCUSDT", "1d", "2024-02", 29)]
+    candles = store.load_candles("BTCUSDT", 40, "1d")
+    assert len(candles) == 40
+    assert candles[-1]["t"] == "2024-02-29T00:00:00Z"
+    assert candles[-1]["c"] == 130.0
+
+
+def test_microsecond_timestamps_are_normalised(tmp_path: Path):
+    path = _write_archive(tmp_path, "ETHUSDT-1d-2025-01.zip", _daily_rows(2025, 1, 3), micros=True)
+    assert [r[0] for r in read_archive(path)] == [_ms(2025, 1, d) for d in (1, 2, 3)]
+
+
+def test_bad_month_is_rejected_and_not_committed(tmp_path: Path):
+    store = CandleStore(tmp_path / "store")
+    rows = _daily_rows(2024, 3, 5)
+    rows[2] = (rows[2][0], 100.0, 90.0, 95.0, 99.0, 1.0)  # high below open
+    path = _write_archive(tmp_path, "BTCUSDT-1d-2024-03.zip", rows)
+
+    report = import_archives([path], store)
+
+    assert report.imported == []
+    assert "inconsistent OHLCV" in report.rejected[0][1]
+    assert store.months("BTCUSDT", "1d") == []
+
+
+def test_undecodable_archive_is_rejected_and_batch_continues(tmp_path: Path):
+    store = CandleStore(tmp_path / "store")
+    bad = tmp_path / "BTCUSDT-1d-2024-03.zip"
+    with zipfile.ZipFile(bad, "w") as zf:
+        zf.writestr("BTCUSDT-1d-2024-03.csv", b"\xff\xfe" + "1709251200000,1,2,0.5,1.5,10\n".encode("utf-16-le"))
+    good = _write_archive(tmp_path, "ETHUSDT-1d-2024-03.zip", _daily_rows(2024, 3, 5))
+
+    report = import_archives([bad, good], store)
+
+    assert [r[0] for r in report.rejected] == [bad.name]
+    assert "unreadable CSV" in report.rejected[0][1]
+    assert report.imported == [("ETHUSDT", "1d", "2024-03", 5)]
+
+
+def test_daily_archives_merge_into_month(tmp_path: Path):
+    store = CandleStore(tmp_path / "store")
+    rows = _daily_rows(2024, 4, 2)
+    first = _write_archive(tmp_path, "BTCUSDT-1d-2024-04-01.zip", rows[:1])
+    second = _write_archive(tmp_path, "BTCUSDT-1d-2024-04-02.zip", rows[1:])
+
+    import_archives([first, second], store)
+
+    assert [r[0] for r in store.read_month("BTCUSDT", "1d", "2024-04")] == [rows[0][0], rows[1][0]]
+
+
+def test_facts_pass_reads_from_candle_store_without_network(monkeypatch, tmp_path: Path):
+    store_dir = tmp_path / "store"
+    archives = [
+        _write_archive(tmp_path, f"{s}-1d-2024-{m:02d}.zip", _daily_rows(2024, m, 28, base=base + m))
+        for s, base in (("BTCUSDT", 100.0), ("ETHUSDT", 50.0))
+        for m in (1, 2, 3)
+    ]
+    import_archives(archives, CandleStore(store_dir))
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("network used")
+
+    monkeypatch.setattr(bp, "fetch_candle_series", no_network)
+    facts, _ = pipeline.build_facts(["BTCUSDT", "ETHUSDT"], 60, pipeline.FactsOptions(candle_store=str(store_dir)))
+
+    assert len(facts["market_data"]["candles"]["BTCUSDT"]) == 60
+    assert facts["provenance"]["sources"][0]["name"] == "Binance Public Data Archive"
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import spectre.execution_plan as ep
+from benchmarks.run_benchmarks import bench_case, compare, offline_execution_plan, synthetic_universe
+
+
+def test_synthetic_universe_shape():
+    universe = synthetic_universe(3, 40)
+    assert list(universe) == ["S0000USDT", "S0001USDT", "S0002USDT"]
+    assert all(len(series) == 41 for series in universe.values())
+    assert synthetic_universe(3, 40)["S0001USDT"].c == universe["S0001USDT"].c
+
+
+def test_bench_case_times_every_pass_and_restores_network_hooks():
+    prices_before, rules_before = ep.fetch_ticker_prices, ep.fetch_exchange_info
+    rows = bench_case(4, 30, repeat=1)
+    assert [r["case"] for r in rows] == [
+        "compute_realised_vol_annualised",
+        "compute_correlation_matrix",
+        "build_facts_pack",
+        "build_decision_packet",
+        "build_execution_plan",
+        "simulate_execution_plan",
+    ]
+    assert all(r["best_s"] >= 0 and (r["symbols"], r["bars"]) == (4, 30) for r in rows)
+    assert (ep.fetch_ticker_prices, ep.fetch_exchange_info) == (prices_before, rules_before)
+
+
+def test_offline_plan_rebalances_every_symbol(monkeypatch):
+    universe = synthetic_universe(3, 30)
+    monkeypatch.setenv("SPECTRE_BUDGET_QUOTE", "30")
+    decision = {"strategy_mode": "trend", "allowed_symbols": list(universe), "max_gross_exposure": 1.0}
+    with offline_execution_plan({s: c.c[-1] for s, c in universe.items()}):
+        plan = ep.build_execution_plan({}, decision, "facts.json", "decision.json")
+    assert plan["plan"]["action"] == "rebalance"
+    assert len(plan["plan"]["orders"]) == 3
+
+
+def test_compare_flags_regressions():
+    row = {"case": "build_facts_pack", "symbols": 10, "bars": 30, "median_s": 1.0}
+    baseline = {"results": [dict(row, best_s=1.0)]}
+    assert not compare({"results": [dict(row, best_s=1.1)]}, baseline, 0.2)[0]["regressed"]
+    assert compare({"results": [dict(row, best_s=1.5)]}, baseline, 0.2)[0]["regressed"]
+    assert compare({"results": [dict(row, bars=300, best_s=9.0)]}, baseline) == []
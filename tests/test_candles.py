@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import io
+import json
+from datetime import datetime, timezone
+
+import spectre.binance_public as bp
+from spectre.candles import CandleSeries, iso_from_ms, ms_from_iso
+from spectre.facts_writer import FactsPackWriter
+from spectre.resample import DAY_MS
+from spectre.schema_registry import validate_candles
+from tests._helpers import FakeResponse
+
+
+def _daily_rows(n):
+    return [[i * DAY_MS, str(100.0 + i), str(101.0 + i), str(99.0 + i), str(100.5 + i), "12.5", i * DAY_MS + DAY_MS - 1] for i in range(n)]
+
+
+def test_iso_formatting_matches_datetime():
+    for ms in (0, 1_700_000_000_000, 1_735_689_600_000):
+        expected = datetime.utcfromtimestamp(ms / 1000).replace(tzinfo=timezone.utc).isoformat().replace("+00:00", "Z")
+        assert iso_from_ms(ms) == expected
+        assert ms_from_iso(expected) == ms
+
+
+def test_from_klines_parses_columns_in_bulk():
+    series = CandleSeries.from_klines(_daily_rows(3))
+    assert list(series.t) == [0, DAY_MS, 2 * DAY_MS]
+    assert list(series.c) == [100.5, 101.5, 102.5]
+    assert series.to_candles()[1] == {"t": "1970-01-02T00:00:00Z", "o": 101.0, "h": 102.0, "l": 100.0, "c": 101.5, "v": 12.5}
+    assert CandleSeries.from_candles(series.to_candles()).klines() == series.klines()
+
+
+def test_fetch_klines_joins_pages_without_sorting(monkeypatch):
+    all_rows = _daily_rows(2500)
+    calls = []
+
+    def fake_get(url, params=None, timeout=10):
+        calls.append(params)
+        end = params.get("endTime", all_rows[-1][0])
+        rows = [r for r in all_rows if r[0] <= end]
+        return FakeResponse(rows[-params["limit"]:])
+
+    monkeypatch.setattr(bp.requests, "get", fake_get)
+    series = bp.fetch_candle_series("BTCUSDT", 2200)
+
+    assert len(calls) == 3
+    assert len(series) == 2200
+    assert list(series.t) == [r[0] for r in all_rows[-2200:]]
+    assert bp.fetch_daily_candles("BTCUSDT", 2200) == series.to_candles()
+
+
+def test_writer_and_validation_accept_series():
+    series = CandleSeries.from_klines(_daily_rows(5))
+    from_series, from_dicts = io.StringIO(), io.StringIO()
+    for fp, candles in ((from_series, series), (from_dicts, series.to_candles())):
+        writer = FactsPackWriter(fp)
+        writer.write_header({"schema_version": "1.0"})
+        writer.write_candles("BTCUSDT", candles)
+        writer.write_footer({})
+    assert from_series.getvalue() == from_dicts.getvalue()
+    assert json.loads(from_series.getvalue())["market_data"]["candles"]["BTCUSDT"] == series.to_candles()
+
+    for mode in ("full", "structural", "sample"):
+        validate_candles({"BTCUSDT": series}, mode=mode)
+
+
+def test_structure_errors_reports_unordered_timestamps():
+    series = CandleSeries.from_klines(_daily_rows(3))
+    assert series.structure_errors() is None
+    series.t[2] = series.t[1]
+    assert series.structure_errors() == "timestamps not strictly increasing at index 2"
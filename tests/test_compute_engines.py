@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import math
+import random
+import statistics
+
+import pytest
+
+import spectre.pipeline as pipeline
+from spectre.compute import (
+    compute_correlation,
+    ewma_correlation,
+    ledoit_wolf_correlation,
+    sample_correlation,
+)
+from spectre.schema_registry import validate_facts_pack
+from tests.test_pipeline import _patch_network
+
+
+def _returns(n_symbols=4, length=120, seed=7):
+    rng = random.Random(seed)
+    market = [rng.gauss(0, 0.02) for _ in range(length)]
+    return [[m + rng.gauss(0, 0.01 * (k + 1)) for m in market] for k in range(n_symbols)]
+
+
+def _candles_from_returns(returns):
+    closes, price = [], 100.0
+    for r in [0.0] + returns:
+        price *= math.exp(r)
+        closes.append(price)
+    return [{"t": f"2025-01-01T{i:05d}", "o": c, "h": c, "l": c, "c": c, "v": 1.0} for i, c in enumerate(closes)]
+
+
+def test_sample_engine_matches_pearson():
+    returns = _returns()
+    matrix = sample_correlation(returns)
+    for i, x in enumerate(returns):
+        assert matrix[i][i] == 1.0
+        for j, y in enumerate(returns):
+            if i != j:
+                assert matrix[i][j] == pytest.approx(statistics.correlation(x, y))
+
+
+def test_ledoit_wolf_intensity_matches_direct_formula():
+    returns = _returns(n_symbols=5, length=60)
+    matrix, shrinkage = ledoit_wolf_correlation(returns)
+
+    # Direct Ledoit & Wolf (2004) estimate on returns standardised to unit variance (1/T).
+    n, t = len(returns), len(returns[0])
+    x = []
+    for r in returns:
+        mean = sum(r) / t
+        sd = math.sqrt(sum((v - mean) ** 2 for v in r) / t)
+        x.append([(v - mean) / sd for v in r])
+    s = [[sum(x[i][k] * x[j][k] for k in range(t)) / t for j in range(n)] for i in range(n)]
+    d2 = sum((s[i][j] - (i == j)) ** 2 for i in range(n) for j in range(n)) / n
+    b2 = sum(
+        sum((x[i][k] * x[j][k] - s[i][j]) ** 2 for i in range(n) for j in range(n)) / n for k in range(t)
+    ) / t ** 2
+    expected = min(b2, d2) / d2
+
+    assert 0 < shrinkage < 1
+    assert shrinkage == pytest.approx(expected)
+    assert matrix[0][1] == pytest.approx((1 - expected) * s[0][1])
+
+
+def test_ewma_weights_recent_returns():
+    rng = random.Random(3)
+    # Independent for most of the window, perfectly co-moving at the end.
+    a = [rng.gauss(0, 0.01) for _ in range(100)]
+    b = [rng.gauss(0, 0.01) for _ in range(80)] + a[80:]
+    assert ewma_correlation([a, b], 0.8)[0][1] > 0.95
+    assert sample_correlation([a, b])[0][1] < ewma_correlation([a, b], 0.8)[0][1]
+    with pytest.raises(ValueError):
+        ewma_correlation([a, b], 1.0)
+
+
+def test_compute_correlation_records_engine():
+    candles = {f"S{k}": _candles_from_returns(r) for k, r in enumerate(_returns())}
+    assert "shrinkage" not in compute_correlation(candles)
+    lw = compute_correlation(candles, "ledoit_wolf")
+    assert lw["engine"] == "ledoit_wolf" and 0 <= lw["shrinkage"] <= 1
+    assert compute_correlation(candles, "ewma", 0.9)["ewma_lambda"] == 0.9
+    with pytest.raises(ValueError):
+        compute_correlation(candles, "kendall")
+
+
+def test_facts_pack_records_engine(monkeypatch):
+    _patch_network(monkeypatch)
+    options = pipeline.FactsOptions(corr_engine="ledoit_wolf")
+    facts, _ = pipeline.build_facts(["BTCUSDT", "ETHUSDT"], 60, options)
+    validate_facts_pack(facts)
+    correlation = facts["computed"]["correlation"]
+    assert correlation["engine"] == "ledoit_wolf"
+    assert 0 <= correlation["shrinkage"] <= 1
+
+
+def test_pairwise_matches_sample_on_complete_data():
+    returns = _returns()
+    candles = {f"S{k}": _candles_from_returns(r) for k, r in enumerate(returns)}
+    pairwise = compute_correlation(candles, alignment="pairwise")
+    dense = compute_correlation(candles)
+    for row, dense_row in zip(pairwise["matrix"], dense["matrix"]):
+        assert row == pytest.approx(dense_row)
+    assert pairwise["sample_sizes"] == [[len(returns[0])] * len(returns)] * len(returns)
+
+
+def test_pairwise_keeps_full_overlap_for_established_symbols():
+    returns = _returns(n_symbols=3, length=120)
+    candles = {f"S{k}": _candles_from_returns(r) for k, r in enumerate(returns)}
+    # A newly listed symbol: only the last 40 bars.
+    candles["NEW"] = _candles_from_returns(_returns(n_symbols=1, seed=11)[0])[-40:]
+    candles["NEW"] = [dict(c, t=t["t"]) for c, t in zip(candles["NEW"], candles["S0"][-40:])]
+
+    assert compute_correlation(candles)["sample_size"] == 39
+    pairwise = compute_correlation(candles, alignment="pairwise")
+    sizes = pairwise["sample_sizes"]
+    assert sizes[0][1] == sizes[1][2] == 120
+    assert sizes[0][3] == 39 and pairwise["sample_size"] == 39
+    assert pairwise["matrix"][0][1] == pytest.approx(statistics.correlation(returns[0], returns[1]))
+
+    # Overlap below the minimum: the pair is reported as 0.0 instead of failing the universe.
+    candles["NEW"] = candles["NEW"][-10:]
+    pairwise = compute_correlation(candles, alignment="pairwise")
+    assert pairwise["matrix"][0][3] == 0.0
+    assert pairwise["matrix"][0][1] == pytest.approx(statistics.correlation(returns[0], returns[1]))
+
+
+def test_pairwise_alignment_in_facts_pack(monkeypatch):
+    _patch_network(monkeypatch)
+    options = pipeline.FactsOptions(corr_alignment="pairwise")
+    facts, _ = pipeline.build_facts(["BTCUSDT", "ETHUSDT"], 60, options)
+    validate_facts_pack(facts)
+    correlation = facts["computed"]["correlation"]
+    assert correlation["alignment"] == "pairwise"
+    assert correlation["sample_sizes"] == [[59, 59], [59, 59]]
+    assert "warnings" not in facts
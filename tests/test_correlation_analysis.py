@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import sys
+import types
+
+import pytest
+
+import spectre.pipeline as pipeline
+from spectre.correlation_analysis import (
+    analyse_correlation,
+    average_correlation,
+    hierarchical_clusters,
+    top_eigenvalues,
+)
+from spectre.decision_rules import build_decision_packet
+from spectre.schema_registry import validate_decision_packet
+from tests.test_pipeline import _patch_network
+
+
+def _block_matrix(sizes, within, between):
+    # Equicorrelated blocks: `within` inside a block, `between` across blocks.
+    block_of = [b for b, size in enumerate(sizes) for _ in range(size)]
+    n = len(block_of)
+    return [
+        [1.0 if i == j else (within if block_of[i] == block_of[j] else between) for j in range(n)]
+        for i in range(n)
+    ]
+
+
+def test_average_correlation_excludes_diagonal():
+    matrix = [[1.0, 0.5, 0.1], [0.5, 1.0, 0.3], [0.1, 0.3, 1.0]]
+    avg = average_correlation(["A", "B", "C"], matrix)
+    assert avg == pytest.approx({"A": 0.3, "B": 0.4, "C": 0.2})
+
+
+def test_lanczos_matches_known_spectrum():
+    # One block of n equicorrelated assets has eigenvalues 1 + (n - 1) * rho and 1 - rho.
+    matrix = _block_matrix([6], 0.6, 0.0)
+    values = top_eigenvalues(matrix, 2)
+    assert values == pytest.approx([1 + 5 * 0.6, 0.4], abs=1e-8)
+
+
+def test_lanczos_finds_repeated_eigenvalues():
+    # Three blocks of three: 1 + 2 * 0.8 + 6 * 0.2 once, 1 + 2 * 0.8 - 3 * 0.2 twice, 0.2 six times.
+    values = top_eigenvalues(_block_matrix([3, 3, 3], 0.8, 0.2), 4)
+    assert values == pytest.approx([3.8, 2.0, 2.0, 0.2], abs=1e-8)
+    assert top_eigenvalues([[1.0]], 3) == [1.0]
+
+
+def test_eigenvalues_do_not_depend_on_numpy(monkeypatch):
+    # One code path: an importable numpy must not change (or even be consulted for) the result.
+    matrix = _block_matrix([3, 3, 3], 0.8, 0.2)
+    expected = top_eigenvalues(matrix, 4)
+    broken = types.ModuleType("numpy")
+    broken.__getattr__ = lambda name: pytest.fail(f"numpy.{name} used")
+    monkeypatch.setitem(sys.modules, "numpy", broken)
+    assert top_eigenvalues(matrix, 4) == expected
+
+
+def test_clusters_follow_correlation_blocks():
+    matrix = _block_matrix([3, 2, 1], 0.8, 0.1)
+    symbols = ["A1", "A2", "A3", "B1", "B2", "C1"]
+    assert hierarchical_clusters(symbols, matrix, min_correlation=0.5) == [["A1", "A2", "A3"], ["B1", "B2"], ["C1"]]
+    assert hierarchical_clusters(symbols, matrix, min_correlation=0.05) == [symbols]
+
+
+def test_analysis_summary():
+    matrix = _block_matrix([2, 2], 0.9, 0.1)
+    analysis = analyse_correlation(["A", "B", "C", "D"], matrix, top_k=2)
+
+    assert analysis["mean_correlation"] == pytest.approx((0.9 + 0.1 + 0.1) / 3)
+    assert analysis["eigenvalues"] == pytest.approx([2.1, 1.7])
+    assert analysis["pc1_share"] == pytest.approx(2.1 / 4)
+    assert analysis["clusters"] == [
+        {"symbols": ["A", "B"], "mean_correlation": pytest.approx(0.9)},
+        {"symbols": ["C", "D"], "mean_correlation": pytest.approx(0.9)},
+    ]
+
+
+def test_decision_uses_precomputed_analysis(monkeypatch):
+    _patch_network(monkeypatch)
+    facts, _ = pipeline.build_facts(["BTCUSDT", "ETHUSDT"], 60)
+    analysis = facts["computed"]["correlation_analysis"]
+    assert set(analysis["average_correlation"]) == {"BTCUSDT", "ETHUSDT"}
+
+    decision = build_decision_packet(facts)
+    validate_decision_packet(decision)
+    risks = {r["risk"]: r["rationale"] for r in decision["top_risks"]}
+    assert risks["Correlation"] == f"Average pairwise correlation is {analysis['mean_correlation']:.2f}."
+    assert "Concentration" in risks
+
+    # Without the analysis section the same mean is recovered from the matrix.
+    del facts["computed"]["correlation_analysis"]
+    fallback = build_decision_packet(facts)
+    assert {r["risk"]: r["rationale"] for r in fallback["top_risks"]}["Correlation"] == risks["Correlation"]
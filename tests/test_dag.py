@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from spectre.dag import ArtifactCache, DagError, Stage, run_dag, stage_keys
+
+
+def test_independent_stages_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_peer():
+        barrier.wait()  # deadlocks (and times out) unless both run at once
+        return {"ok": True}
+
+    stages = [
+        Stage("a", wait_for_peer),
+        Stage("b", wait_for_peer),
+        Stage("c", lambda a, b: {"sum": int(a["ok"]) + int(b["ok"])}, deps=("a", "b")),
+    ]
+    result = run_dag(stages)
+    assert result.outputs["c"] == {"sum": 2}
+    assert result.ran[-1] == "c"
+
+
+def test_cached_stage_is_skipped_and_param_change_invalidates_downstream(tmp_path: Path):
+    cache = ArtifactCache(tmp_path)
+    calls: list[str] = []
+
+    def make(up_param, down_param):
+        def upstream():
+            calls.append("up")
+            return {"v": 1}
+
+        def downstream(up):
+            calls.append("down")
+            return {"v": up["v"] + 1}
+
+        return [
+            Stage("up", upstream, params={"p": up_param}),
+            Stage("down", downstream, deps=("up",), params={"p": down_param}),
+        ]
+
+    run_dag(make(1, 1), cache)
+    assert calls == ["up", "down"]
+
+    result = run_dag(make(1, 2), cache)
+    assert calls == ["up", "down", "down"]
+    assert result.cached == ["up"]
+
+    result = run_dag(make(2, 2), cache)
+    assert calls == ["up", "down", "down", "up", "down"]
+    assert result.ran == ["up", "down"]
+
+
+def test_keys_depend_on_upstream_params():
+    a = stage_keys([Stage("x", dict, params={"n": 1}), Stage("y", dict, deps=("x",))])
+    b = stage_keys([Stage("x", dict, params={"n": 2}), Stage("y", dict, deps=("x",))])
+    assert a["y"] != b["y"]
+
+
+def test_cycle_is_rejected():
+    with pytest.raises(DagError):
+        run_dag([Stage("a", dict, deps=("b",)), Stage("b", dict, deps=("a",))])
+
+
+def test_failure_propagates_and_is_not_cached(tmp_path: Path):
+    cache = ArtifactCache(tmp_path)
+
+    def boom():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        run_dag([Stage("a", boom)], cache)
+    assert not any(tmp_path.rglob("*.json"))
+
+
+def test_uncacheable_stage_always_runs(tmp_path: Path):
+    cache = ArtifactCache(tmp_path)
+    calls = []
+
+    def live(a):
+        calls.append(1)
+        return {"n": len(calls)}
+
+    stages = [Stage("a", lambda: {"x": 1}), Stage("live", live, deps=("a",), cacheable=False)]
+    run_dag(stages, cache)
+    result = run_dag(stages, cache)
+    assert result.cached == ["a"] and result.ran == ["live"]
+    assert result.outputs["live"] == {"n": 2}
+    assert not (tmp_path / "live").exists()
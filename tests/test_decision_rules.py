@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+
+from spectre.decision_rules import build_decision_packet
+from spectre.schema_registry import validate_decision_packet
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+
+
+def _example_facts():
+    return json.loads((EXAMPLES / "facts_pack.valid.json").read_text(encoding="utf-8"))
+
+
+def _outcome(packet):
+    keys = ("global_regime", "risk_score", "vol_target_annualised", "max_gross_exposure", "strategy_mode", "allowed_symbols", "blocked_symbols")
+    return {k: packet[k] for k in keys}
+
+
+def test_example_pack_regime_is_read_from_computed_stats():
+    # Vols 0.5 / 0.7 and correlation 0.8 in computed.*: neutral, not the risk_on / trend
+    # that rules reading missing top-level keys produced for every pack.
+    packet = build_decision_packet(_example_facts())
+    validate_decision_packet(packet)
+    assert _outcome(packet) == {
+        "global_regime": "neutral",
+        "risk_score": 70,
+        "vol_target_annualised": 0.20,
+        "max_gross_exposure": 0.50,
+        "strategy_mode": "do_nothing",
+        "allowed_symbols": ["BTC-USD", "ETH-USD"],
+        "blocked_symbols": [],
+    }
+    assert packet["top_risks"][:2] == [
+        {"risk": "Volatility", "rationale": "Max realised volatility is 0.70."},
+        {"risk": "Correlation", "rationale": "Average pairwise correlation is 0.80."},
+    ]
+
+
+def test_example_pack_high_vol_is_risk_off_and_blocked():
+    facts = _example_facts()
+    facts["computed"]["realised_vol_annualised"]["ETH-USD"] = 1.2
+    packet = build_decision_packet(facts)
+    assert _outcome(packet) == {
+        "global_regime": "risk_off",
+        "risk_score": 90,
+        "vol_target_annualised": 0.10,
+        "max_gross_exposure": 0.20,
+        "strategy_mode": "reduce_risk",
+        "allowed_symbols": ["BTC-USD"],
+        "blocked_symbols": ["ETH-USD"],
+    }
+    assert packet["kill_switch"]["max_daily_drawdown"] == 0.03
+
+
+def test_example_pack_calm_and_uncorrelated_is_risk_on():
+    facts = _example_facts()
+    facts["computed"]["realised_vol_annualised"] = {"BTC-USD": 0.3, "ETH-USD": 0.4}
+    facts["computed"]["correlation"]["matrix"] = [[1, 0.2], [0.2, 1]]
+    packet = build_decision_packet(facts)
+    assert (packet["global_regime"], packet["strategy_mode"], packet["risk_score"]) == ("risk_on", "trend", 40)
+
+
+def test_legacy_top_level_keys_give_the_same_outcome():
+    facts = _example_facts()
+    legacy = copy.deepcopy(facts)
+    computed = legacy.pop("computed")
+    legacy["symbol_stats"] = {s: {"realised_vol_annualised": v} for s, v in computed["realised_vol_annualised"].items()}
+    legacy["correlations"] = {"matrix": computed["correlation"]["matrix"]}
+    assert _outcome(build_decision_packet(legacy)) == _outcome(build_decision_packet(facts))
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+import spectre.binance_public as bp
+import spectre.pipeline as pipeline
+from spectre.artifact_io import load_json
+from spectre.facts_writer import FactsPackWriter
+from spectre.schema_registry import validate_facts_pack
+from tests.test_pipeline import _fake_candles
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+
+
+def test_writer_output_matches_compact_json_dump():
+    facts = json.loads((EXAMPLES / "facts_pack.valid.json").read_text(encoding="utf-8"))
+    facts["warnings"] = ["example warning"]
+
+    buf = io.StringIO()
+    writer = FactsPackWriter(buf)
+    writer.write_header(facts)
+    for symbol, candles in facts["market_data"]["candles"].items():
+        writer.write_candles(symbol, candles)
+    writer.write_footer(facts)
+
+    assert buf.getvalue() == json.dumps(facts, separators=(",", ":"))
+
+
+def test_writer_rejects_out_of_order_sections():
+    writer = FactsPackWriter(io.StringIO())
+    with pytest.raises(RuntimeError):
+        writer.write_candles("BTCUSDT", [])
+
+
+@pytest.mark.parametrize("name", ["facts_pack.json", "facts_pack.json.gz"])
+def test_stream_facts_matches_in_memory_pack(monkeypatch, tmp_path: Path, name):
+    monkeypatch.setattr(bp, "fetch_candle_series", _fake_candles)
+    out = tmp_path / name
+
+    counts, sample_size = pipeline.stream_facts(["BTCUSDT", "ETHUSDT"], 60, out)
+    streamed = load_json(out)
+    in_memory, expected_sample_size = pipeline.build_facts(["BTCUSDT", "ETHUSDT"], 60)
+
+    validate_facts_pack(streamed)
+    assert counts == {"BTCUSDT": 60, "ETHUSDT": 60}
+    assert sample_size == expected_sample_size
+    for key in ("as_of_utc",):
+        streamed.pop(key)
+        in_memory.pop(key)
+    for doc in (streamed, in_memory):
+        doc["provenance"]["sources"][0].pop("retrieved_at_utc")
+    assert streamed == in_memory
+    assert [p.name for p in tmp_path.iterdir()] == [name]
+
+
+def test_stream_facts_leaves_no_file_on_failure(monkeypatch, tmp_path: Path):
+    def short_history(symbol, lookback_days, interval="1d", fetch_interval=None):
+        return _fake_candles(symbol, 10 if symbol == "ETHUSDT" else lookback_days)
+
+    monkeypatch.setattr(bp, "fetch_candle_series", short_history)
+    out = tmp_path / "facts_pack.json"
+
+    with pytest.raises(pipeline.PipelineError):
+        pipeline.stream_facts(["BTCUSDT", "ETHUSDT"], 60, out)
+    assert list(tmp_path.iterdir()) == []
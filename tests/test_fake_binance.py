@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+import spectre.binance_public as bp
+from spectre.fake_binance import FakeBinance, FakeBinanceConfig, FakeBinanceServer
+from spectre.rate_limit import set_shared_limiter
+from spectre.universe import UniverseCriteria, build_universe
+
+NOW_MS = 1_735_689_600_000  # 2025-01-01T00:00:00Z
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    # Each test starts with a fresh process-wide limiter (429/418 blocks would otherwise leak).
+    set_shared_limiter(None, from_env=True)
+    servers = []
+
+    def _serve(**config):
+        server = FakeBinanceServer(FakeBinanceConfig(now_ms=NOW_MS, **config)).start()
+        servers.append(server)
+        monkeypatch.setenv("SPECTRE_BINANCE_BASE_URL", server.base_url)
+        return server
+
+    yield _serve
+    for server in servers:
+        server.stop()
+    set_shared_limiter(None, from_env=True)
+
+
+def test_klines_paginate_through_the_real_fetch_path(serve):
+    server = serve(history_bars=3000)
+    rows = bp.fetch_klines("BTCUSDT", "1d", 2500)
+    assert len(rows) == 2500
+    assert server.stats["requests"] == {"klines": 3}
+    opens = [r[0] for r in rows]
+    assert opens == sorted(opens) and len(set(opens)) == 2500
+    assert opens[-1] == NOW_MS
+    assert rows == FakeBinance(FakeBinanceConfig(now_ms=NOW_MS)).klines_for("BTCUSDT", "1d")[-2500:]
+
+
+def test_rules_prices_and_universe_are_served(serve):
+    serve(symbols=["BTCUSDT", "ETHUSDT"])
+    rules = bp.fetch_exchange_info(["BTCUSDT", "ETHUSDT"])
+    assert rules["ETHUSDT"] == {
+        "step_size": 1e-5, "min_qty": 1e-5, "min_notional": 5.0, "base_asset": "ETH", "quote_asset": "USDT",
+    }
+    universe = build_universe(UniverseCriteria(min_quote_volume=1_000_000, top_n=1))
+    assert universe["counts"]["listed"] == 2
+    assert len(universe["symbols"]) == 1
+    prices = requests.get(bp.api_url(bp.TICKER_PRICE_PATH), timeout=10).json()
+    assert {p["symbol"] for p in prices} == {"BTCUSDT", "ETHUSDT"}
+
+
+def test_weight_limit_returns_429_then_418(serve):
+    server = serve(weight_limit=25, ban_after_429s=1, window_s=3600)
+    ok = requests.get(bp.api_url(bp.EXCHANGE_INFO_PATH), timeout=10)
+    assert ok.status_code == 200 and ok.headers["X-MBX-USED-WEIGHT-1M"] == "20"
+    limited = requests.get(bp.api_url(bp.EXCHANGE_INFO_PATH), timeout=10)
+    assert limited.status_code == 429 and int(limited.headers["Retry-After"]) >= 1
+    assert requests.get(bp.api_url(bp.EXCHANGE_INFO_PATH), timeout=10).status_code == 418
+    with pytest.raises(requests.HTTPError):
+        bp.fetch_exchange_symbols()
+    assert server.stats["status"] == {200: 1, 429: 1, 418: 2}
+
+
+def test_requests_are_served_concurrently(serve):
+    server = serve(latency_s=0.05)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        series = list(pool.map(lambda s: bp.fetch_candle_series(s, 30), [f"S{i}USDT" for i in range(8)]))
+    assert all(len(s) == 30 for s in series)
+    assert server.stats["max_in_flight"] > 1
+
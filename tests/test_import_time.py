@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Generous enough for a cold, slow CI machine; the modules import in ~5-30ms warm.
+IMPORT_BUDGET_S = 0.25
+HEAVY = ("requests", "jsonschema", "dateutil", "http.server", "cProfile", "tracemalloc")
+
+LIGHT_ENTRY_POINTS = [
+    "spectre.executor_stub",
+    "spectre.simulator_stub",
+    "spectre.shadow_run",
+    "spectre.execution_plan",
+    "spectre.facts_pack",
+]
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env, check=True)
+
+
+def _cumulative_us(importtime_log: str, module: str) -> int:
+    for line in importtime_log.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1])
+    raise AssertionError(f"{module} not in -X importtime output")
+
+
+@pytest.mark.parametrize("module", LIGHT_ENTRY_POINTS)
+def test_entry_point_does_not_load_heavy_dependencies(module):
+    out = _run(f"import sys, {module}; print(','.join(m for m in {HEAVY!r} if m in sys.modules))")
+    assert out.stdout.strip() == ""
+    assert _cumulative_us(out.stderr, module) / 1e6 < IMPORT_BUDGET_S
+
+
+def test_requests_is_loaded_on_first_use():
+    out = _run(
+        "import sys, spectre.execution_plan as ep, spectre.binance_public as bp\n"
+        "assert 'requests' not in sys.modules\n"
+        "import requests\n"
+        "assert ep.requests is requests and bp.requests is requests\n"
+    )
+    assert out.returncode == 0
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from spectre import json_backend
+from spectre.artifact_io import load_json, write_json
+from spectre.models import DecisionPacket, FactsPack
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+DOC = {"b": [1, 2.5, None], "a": {"s": "x", "t": True}}
+
+
+@pytest.fixture
+def stdlib_only(monkeypatch):
+    monkeypatch.setattr(json_backend, "_available", lambda name: name == "json")
+
+
+def test_auto_falls_back_to_stdlib(stdlib_only, monkeypatch):
+    monkeypatch.delenv(json_backend.BACKEND_ENV, raising=False)
+    assert json_backend.backend_name() == "json"
+    assert json_backend.dumps(DOC, indent=True) == json.dumps(DOC, indent=2).encode("utf-8")
+    assert json_backend.dumps(DOC) == json.dumps(DOC, separators=(",", ":")).encode("utf-8")
+    assert json_backend.loads(json_backend.dumps(DOC)) == DOC
+
+
+def test_requested_backend_must_be_installed(stdlib_only, monkeypatch):
+    monkeypatch.setenv(json_backend.BACKEND_ENV, "orjson")
+    with pytest.raises(RuntimeError, match="pip install orjson"):
+        json_backend.backend_name()
+    monkeypatch.setenv(json_backend.BACKEND_ENV, "yaml")
+    with pytest.raises(RuntimeError, match="Unknown"):
+        json_backend.backend_name()
+
+
+def test_decode_errors_are_value_errors():
+    with pytest.raises(ValueError):
+        json_backend.loads(b"{not json")
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson", "msgspec"])
+def test_backends_round_trip_artifacts(monkeypatch, tmp_path: Path, backend):
+    if backend != "json":
+        pytest.importorskip(backend)
+    monkeypatch.setenv(json_backend.BACKEND_ENV, backend)
+    facts = load_json(EXAMPLES / "facts_pack.valid.json", FactsPack)
+
+    for name in ("facts.json", "facts.json.gz"):
+        write_json(tmp_path / name, facts)
+        assert load_json(tmp_path / name, FactsPack) == facts
+    assert json.loads((tmp_path / "facts.json").read_text(encoding="utf-8")) == facts
+
+
+def test_msgspec_decodes_into_typed_models(monkeypatch):
+    pytest.importorskip("msgspec")
+    monkeypatch.setenv(json_backend.BACKEND_ENV, "msgspec")
+    decision = json.loads((EXAMPLES / "decision_packet.valid.json").read_text(encoding="utf-8"))
+    decision["risk_score"] = "high"
+    with pytest.raises(ValueError):
+        json_backend.loads(json.dumps(decision).encode("utf-8"), DecisionPacket)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+import spectre.binance_public as bp
+import spectre.pipeline as pipeline
+from spectre import metrics
+from spectre.simulator_stub import simulate_execution_plan
+from tests._helpers import FakeResponse
+from tests.test_pipeline import _patch_network
+
+
+@pytest.fixture(autouse=True)
+def _fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_render_uses_the_text_exposition_format():
+    metrics.HTTP_REQUESTS.inc(endpoint="klines", status="200")
+    metrics.HTTP_REQUESTS.inc(endpoint="klines", status="200")
+    for seconds in (0.02, 0.3, 400.0):
+        metrics.HTTP_LATENCY.observe(seconds, endpoint="klines")
+    metrics.PLAN_REFUSALS.inc(code='ODD"CODE')
+    text = metrics.render()
+
+    assert "# TYPE spectre_http_requests_total counter" in text
+    assert 'spectre_http_requests_total{endpoint="klines",status="200"} 2' in text
+    assert 'spectre_http_request_duration_seconds_bucket{endpoint="klines",le="0.025"} 1' in text
+    assert 'spectre_http_request_duration_seconds_bucket{endpoint="klines",le="0.5"} 2' in text
+    assert 'spectre_http_request_duration_seconds_bucket{endpoint="klines",le="+Inf"} 3' in text
+    assert 'spectre_http_request_duration_seconds_count{endpoint="klines"} 3' in text
+    assert 'spectre_plan_refusals_total{code="ODD\\"CODE"} 1' in text
+    assert text.endswith("\n")
+
+
+def test_binance_requests_are_counted_by_endpoint_and_status(monkeypatch):
+    responses = iter([FakeResponse({"symbols": []}), FakeResponse({}, status_code=503)])
+    monkeypatch.setattr(bp.requests, "get", lambda url, timeout=10, **kw: next(responses))
+    bp._get("exchangeInfo", bp.BINANCE_EXCHANGE_INFO_API)
+    bp._get("exchangeInfo", bp.BINANCE_EXCHANGE_INFO_API)
+
+    def boom(url, timeout=10, **kw):
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(bp.requests, "get", boom)
+    with pytest.raises(ConnectionError):
+        bp._get("klines", bp.BINANCE_API)
+
+    assert metrics.HTTP_REQUESTS.value(endpoint="exchangeInfo", status="200") == 1
+    assert metrics.HTTP_REQUESTS.value(endpoint="exchangeInfo", status="503") == 1
+    assert metrics.HTTP_REQUESTS.value(endpoint="klines", status="error") == 1
+    assert metrics.HTTP_LATENCY.count(endpoint="exchangeInfo") == 2
+
+
+def test_simulator_counts_accepted_and_rejected_orders():
+    order = {"symbol": "BTCUSDT", "side": "BUY", "notional_quote": 10.0, "price_used": 100.0, "quantity_base": 0.1}
+    plan = {"plan": {"action": "rebalance", "orders": [order]}}
+    simulate_execution_plan(plan, {"balances": {"USDT": 100.0}})
+    simulate_execution_plan(plan, {"balances": {"USDT": 1.0}})
+
+    assert metrics.SIMULATOR_ORDERS.value(result="accepted") == 1
+    assert metrics.SIMULATOR_ORDERS.value(result="rejected") == 1
+    assert metrics.SIMULATOR_REJECTIONS.value(reason="INSUFFICIENT_BALANCE") == 1
+    assert metrics.SIMULATOR_REJECTIONS.value(reason="ALL_OR_NOTHING_ABORT") == 1
+
+
+def test_pipeline_writes_textfile_with_passes_and_refusals(monkeypatch, tmp_path: Path):
+    _patch_network(monkeypatch)
+    monkeypatch.setenv("SPECTRE_BUDGET_QUOTE", "abc")
+    prom = tmp_path / "textfile" / "spectre.prom"
+
+    rc = pipeline.main(["--symbols", "BTCUSDT,ETHUSDT", "--lookback-days", "60", "--no-write", "--metrics-textfile", str(prom)])
+    assert rc == 0
+
+    text = prom.read_text(encoding="utf-8")
+    for stage in ("validate_examples", "build_facts_pack", "build_decision_packet", "build_execution_plan"):
+        assert f'spectre_pass_duration_seconds_count{{pass="{stage}"}} 1' in text
+    assert 'spectre_plan_refusals_total{code="BAD_BUDGET_OVERRIDE"} 1' in text
+    assert 'spectre_runs_total{job="pipeline",outcome="ok"} 1' in text
+    assert 'spectre_last_success_timestamp_seconds{job="pipeline"}' in text
+    assert not prom.with_name("spectre.prom.tmp").exists()
+
+
+def test_failed_pipeline_run_is_exported(monkeypatch, tmp_path: Path):
+    prom = tmp_path / "spectre.prom"
+    rc = pipeline.main(["--symbols", " , ", "--no-write", "--metrics-textfile", str(prom)])
+    assert rc == 1
+    text = prom.read_text(encoding="utf-8")
+    assert 'spectre_runs_total{job="pipeline",outcome="error"} 1' in text
+    assert "spectre_last_success_timestamp_seconds{" not in text
+
+
+def test_textfile_carries_earlier_runs_forward(monkeypatch, tmp_path: Path):
+    _patch_network(monkeypatch)
+    prom = tmp_path / "spectre.prom"
+    assert pipeline.main(["--symbols", "BTCUSDT,ETHUSDT", "--lookback-days", "60", "--no-write", "--metrics-textfile", str(prom)]) == 0
+    last_success = [line for line in prom.read_text(encoding="utf-8").splitlines()
+                    if line.startswith('spectre_last_success_timestamp_seconds{job="pipeline"}')]
+
+    metrics.reset()  # as a new process would start
+    assert pipeline.main(["--symbols", " , ", "--no-write", "--metrics-textfile", str(prom)]) == 1
+    metrics.write_textfile(prom)  # a second write from the same process does not count the run twice
+    text = prom.read_text(encoding="utf-8")
+    assert 'spectre_runs_total{job="pipeline",outcome="ok"} 1' in text
+    assert 'spectre_runs_total{job="pipeline",outcome="error"} 1' in text
+    assert last_success and last_success[0] in text.splitlines()
+    assert 'spectre_pass_duration_seconds_count{pass="build_facts_pack"} 1' in text
+
+    metrics.reset()
+    assert pipeline.main(["--symbols", "BTCUSDT,ETHUSDT", "--lookback-days", "60", "--no-write", "--metrics-textfile", str(prom)]) == 0
+    text = prom.read_text(encoding="utf-8")
+    assert 'spectre_runs_total{job="pipeline",outcome="ok"} 2' in text
+    assert 'spectre_pass_duration_seconds_count{pass="build_facts_pack"} 2' in text
+    assert text.count("# TYPE spectre_runs_total counter") == 1
+
+
+def test_http_endpoint_serves_metrics():
+    metrics.PLAN_ORDERS.inc(side="BUY")
+    server = metrics.start_http_server(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            assert resp.headers["Content-Type"].startswith("text/plain")
+            body = resp.read().decode("utf-8")
+    finally:
+        server.shutdown()
+    assert 'spectre_plan_orders_total{side="BUY"} 1' in body
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+
+import pytest
+
+import spectre.binance_public as bp
+import spectre.pipeline as pipeline
+from benchmarks.run_benchmarks import synthetic_universe
+from spectre.compute import (
+    CORR_ENGINES,
+    InsufficientDataError,
+    _gram,
+    compute_correlation,
+    compute_realised_vol_annualised,
+)
+from spectre.parallel import GRAM_MIN_ROWS, _chunks, map_series, parallel_gram, resolve_workers
+from tests.test_pipeline import _fake_candles, _patch_network
+
+
+def test_chunks_cover_the_range_in_order():
+    for costs, n in (([1] * 10, 3), ([10, 1, 1, 1, 1, 1], 4), ([5], 8), (list(range(100, 0, -1)), 16)):
+        chunks = _chunks(costs, n)
+        assert chunks[0][0] == 0 and chunks[-1][1] == len(costs)
+        assert all(a < b for a, b in chunks)
+        assert all(chunks[k][1] == chunks[k + 1][0] for k in range(len(chunks) - 1))
+    assert _chunks([], 4) == []
+
+
+def test_map_series_matches_serial_and_returns_failures_in_place():
+    universe = synthetic_universe(6, 40)
+    universe["SHORTUSDT"] = universe["S0000USDT"].tail(10)
+    serial = map_series(compute_realised_vol_annualised, universe, 1)
+    pooled = map_series(compute_realised_vol_annualised, universe, 3, "1d")
+    assert list(pooled) == list(universe)
+    assert isinstance(pooled["SHORTUSDT"], InsufficientDataError)
+    assert {s: v for s, v in pooled.items() if s != "SHORTUSDT"} == {s: v for s, v in serial.items() if s != "SHORTUSDT"}
+
+
+def test_parallel_gram_is_bit_identical():
+    universe = synthetic_universe(GRAM_MIN_ROWS + 6, 35)
+    vectors = [list(series.c) for series in universe.values()]
+    assert parallel_gram(vectors, 3) == _gram(vectors)
+
+
+@pytest.mark.parametrize("engine", CORR_ENGINES)
+def test_correlation_is_identical_for_any_worker_count(engine):
+    universe = synthetic_universe(GRAM_MIN_ROWS + 2, 40)
+    serial = compute_correlation(universe, engine)
+    assert compute_correlation(universe, engine, workers=2) == serial
+    assert compute_correlation(universe, engine, workers=4) == serial
+
+
+def test_facts_pass_is_identical_with_workers(monkeypatch):
+    _patch_network(monkeypatch)
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    serial, _ = pipeline.build_facts(symbols, 60, pipeline.FactsOptions())
+    pooled, _ = pipeline.build_facts(symbols, 60, pipeline.FactsOptions(workers=2))
+    assert pooled["computed"] == serial["computed"]
+
+    def short_eth(symbol, lookback_days, interval="1d", fetch_interval=None):
+        return _fake_candles(symbol, 10 if symbol == "ETHUSDT" else lookback_days)
+
+    monkeypatch.setattr(bp, "fetch_candle_series", short_eth)
+    with pytest.raises(pipeline.PipelineError, match="^ETHUSDT: Insufficient data"):
+        pipeline.build_facts(symbols, 60, pipeline.FactsOptions(workers=2))
+
+
+def test_workers_option_and_cache_key():
+    assert resolve_workers(3) == 3 and resolve_workers(0) >= 1
+    parser = argparse.ArgumentParser()
+    pipeline.add_facts_arguments(parser)
+    with pytest.raises(pipeline.PipelineError, match="--workers"):
+        pipeline.facts_options_from_args(parser.parse_args(["--workers", "-1"]))
+    options = pipeline.facts_options_from_args(parser.parse_args(["--workers", "4"]))
+    assert options.workers == 4
+
+    def facts_params(opts):
+        stages = pipeline.pipeline_stages(["BTCUSDT"], 60, "f.json", "d.json", opts)
+        return next(s.params for s in stages if s.name == "build_facts_pack")
+
+    assert facts_params(options) == facts_params(pipeline.FactsOptions())
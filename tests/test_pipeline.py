@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from pathlib import Path
+
+import pytest
+
+import spectre.binance_public as bp
+import spectre.pipeline as pipeline
+from spectre.candles import CandleSeries
+from tests._helpers import FakeResponse, fake_ticker_payload
+
+
+def _fake_candles(symbol, lookback_days, interval="1d", fetch_interval=None):
+    # Deterministic, slightly different daily paths per symbol.
+    drift = 0.01 if symbol == "BTCUSDT" else -0.005
+    candles = []
+    price = 100.0
+    for i in range(lookback_days):
+        price *= math.exp(drift * math.sin(i))
+        candles.append({
+            "t": f"2025-{1 + i // 28:02d}-{1 + i % 28:02d}T00:00:00Z",
+            "o": price,
+            "h": price * 1.01,
+            "l": price * 0.99,
+            "c": price,
+            "v": 10.0,
+        })
+    return CandleSeries.from_candles(candles)
+
+
+def _patch_network(monkeypatch):
+    def fake_get(url, timeout=10):
+        return FakeResponse(fake_ticker_payload({"BTCUSDT": 90000.0, "ETHUSDT": 3000.0}))
+
+    def fake_fetch_exchange_info(symbols):
+        return {
+            s: {
+                "step_size": 1e-5 if s == "BTCUSDT" else 1e-4,
+                "min_qty": 1e-5 if s == "BTCUSDT" else 1e-4,
+                "min_notional": 5.0,
+                "base_asset": s.replace("USDT", ""),
+                "quote_asset": "USDT",
+            }
+            for s in symbols
+        }
+
+    monkeypatch.setattr(bp, "fetch_candle_series", _fake_candles)
+    monkeypatch.setattr(bp.requests, "get", fake_get)
+    monkeypatch.setattr(bp, "fetch_exchange_info", fake_fetch_exchange_info)
+
+
+def test_pipeline_runs_in_memory_without_writing(monkeypatch, tmp_path: Path):
+    _patch_network(monkeypatch)
+    monkeypatch.chdir(tmp_path)
+
+    artifacts = pipeline.run_pipeline(["BTCUSDT", "ETHUSDT"], 60, None, log=lambda *_: None)
+
+    assert set(artifacts) == {
+        pipeline.FACTS_PACK_FILE,
+        pipeline.DECISION_PACKET_FILE,
+        pipeline.EXECUTION_PLAN_FILE,
+    }
+    plan = artifacts[pipeline.EXECUTION_PLAN_FILE]
+    assert plan["inputs"]["facts_pack_path"] == "(in-memory)"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_pipeline_writes_artifacts_once_at_end(monkeypatch, tmp_path: Path):
+    _patch_network(monkeypatch)
+    out_dir = tmp_path / "artifacts"
+
+    rc = pipeline.main(["--symbols", "BTCUSDT,ETHUSDT", "--lookback-days", "60", "--out-dir", str(out_dir), "--no-cache"])
+    assert rc == 0
+
+    written = sorted(p.name for p in out_dir.iterdir())
+    assert written == sorted([pipeline.DECISION_PACKET_FILE, pipeline.EXECUTION_PLAN_FILE, pipeline.FACTS_PACK_FILE])
+    plan = json.loads((out_dir / pipeline.EXECUTION_PLAN_FILE).read_text(encoding="utf-8"))
+    assert plan["inputs"]["facts_pack_path"] == str(out_dir / pipeline.FACTS_PACK_FILE)
+
+
+def test_pipeline_writes_nothing_when_a_pass_fails(monkeypatch, tmp_path: Path):
+    _patch_network(monkeypatch)
+    monkeypatch.setattr(bp, "fetch_candle_series", lambda symbol, lookback_days, interval="1d", fetch_interval=None: CandleSeries())
+    out_dir = tmp_path / "artifacts"
+
+    rc = pipeline.main(["--symbols", "BTCUSDT", "--lookback-days", "60", "--out-dir", str(out_dir), "--no-cache"])
+    assert rc == 1
+    assert not out_dir.exists()
+
+
+def test_budget_change_skips_facts_and_decision(monkeypatch, tmp_path: Path):
+    _patch_network(monkeypatch)
+    calls = []
+
+    def counting_candles(symbol, lookback_days, interval="1d", fetch_interval=None):
+        calls.append(symbol)
+        return _fake_candles(symbol, lookback_days)
+
+    monkeypatch.setattr(bp, "fetch_candle_series", counting_candles)
+    cache_dir = tmp_path / "cache"
+    logs: list[str] = []
+
+    monkeypatch.setenv("SPECTRE_BUDGET_QUOTE", "50")
+    pipeline.run_pipeline(["BTCUSDT", "ETHUSDT"], 60, None, cache_dir=cache_dir, log=logs.append)
+    assert calls == ["BTCUSDT", "ETHUSDT"]
+
+    logs.clear()
+    monkeypatch.setenv("SPECTRE_BUDGET_QUOTE", "20")
+    artifacts = pipeline.run_pipeline(["BTCUSDT", "ETHUSDT"], 60, None, cache_dir=cache_dir, log=logs.append)
+
+    assert calls == ["BTCUSDT", "ETHUSDT"]  # no refetch
+    assert any(line.startswith("[build_facts_pack] cached") for line in logs)
+    assert any(line.startswith("[build_decision_packet] cached") for line in logs)
+    assert "[build_execution_plan] running..." in logs
+    assert artifacts[pipeline.EXECUTION_PLAN_FILE]["portfolio"]["notional_budget_quote"] == 20.0
+
+
+def test_validation_mode_is_recorded_in_provenance(monkeypatch):
+    _patch_network(monkeypatch)
+
+    facts, _ = pipeline.build_facts(["BTCUSDT", "ETHUSDT"], 60, pipeline.FactsOptions(validation_mode="sample", validation_sample_size=7))
+    assert facts["provenance"]["validation"] == {"mode": "sample", "sample_size": 7}
+
+    facts, _ = pipeline.build_facts(["BTCUSDT", "ETHUSDT"], 60)
+    assert facts["provenance"]["validation"] == {"mode": "full"}
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "x"])
+def test_validation_sample_must_be_positive(value, capsys):
+    parser = argparse.ArgumentParser()
+    pipeline.add_facts_arguments(parser)
+    with pytest.raises(SystemExit) as exc:
+        parser.parse_args(["--validation", "sample", "--validation-sample", value])
+    assert exc.value.code == 2
+    assert "--validation-sample" in capsys.readouterr().err
+    assert parser.parse_args(["--validation-sample", "1"]).validation_sample == 1
+
+
+def test_second_run_reprices_the_plan(monkeypatch, tmp_path: Path):
+    _patch_network(monkeypatch)
+    cache_dir = tmp_path / "cache"
+    logs: list[str] = []
+    first = pipeline.run_pipeline(["BTCUSDT", "ETHUSDT"], 60, None, cache_dir=cache_dir, log=logs.append)
+
+    def repriced(url, timeout=10, **kwargs):
+        return FakeResponse(fake_ticker_payload({"BTCUSDT": 45000.0, "ETHUSDT": 1500.0}))
+
+    monkeypatch.setattr(bp.requests, "get", repriced)
+    logs.clear()
+    second = pipeline.run_pipeline(["BTCUSDT", "ETHUSDT"], 60, None, cache_dir=cache_dir, log=logs.append)
+
+    assert any(line.startswith("[build_facts_pack] cached") for line in logs)
+    assert "[build_execution_plan] running..." in logs
+    assert first[pipeline.EXECUTION_PLAN_FILE]["pricing"]["prices"]["BTCUSDT"] == 90000.0
+    assert second[pipeline.EXECUTION_PLAN_FILE]["pricing"]["prices"]["BTCUSDT"] == 45000.0
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pstats
+import threading
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+import spectre.pipeline as pipeline
+from spectre.profiling import profile_pass
+from tests.test_pipeline import _patch_network
+
+
+def _busy() -> int:
+    return sum(i * i for i in range(20000))
+
+
+def test_profile_pass_is_a_no_op_without_env(monkeypatch, tmp_path: Path):
+    monkeypatch.delenv("SPECTRE_PROFILE", raising=False)
+    monkeypatch.setenv("SPECTRE_PROFILE_DIR", str(tmp_path))
+    with profile_pass("noop") as path:
+        _busy()
+    assert path is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profile_pass_writes_stats_allocations_and_logs_hot_functions(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("SPECTRE_PROFILE", "1")
+    monkeypatch.setenv("SPECTRE_PROFILE_DIR", str(tmp_path / "profiles"))
+    lines = []
+    with profile_pass("unit", log=lines.append) as path:
+        with profile_pass("nested") as inner:
+            data = [bytes(1000) for _ in range(100)]
+            _busy()
+    assert inner is None
+    assert path.exists() and path.suffix == ".prof"
+    assert any(func == "_busy" for _file, _line, func in pstats.Stats(str(path)).stats)
+    alloc = path.with_name(path.name.replace(".prof", ".alloc.txt")).read_text(encoding="utf-8")
+    assert alloc.startswith("# unit: peak traced memory")
+    assert lines[0].startswith("PROFILE unit: ")
+    assert any("_busy" in line for line in lines[1:])
+    assert len(data) == 100
+    assert sorted(p.name.split("-")[0] for p in path.parent.iterdir()) == ["unit", "unit"]
+
+
+def test_failed_pass_still_leaves_a_profile(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("SPECTRE_PROFILE", "1")
+    monkeypatch.setenv("SPECTRE_PROFILE_DIR", str(tmp_path))
+    with pytest.raises(RuntimeError):
+        with profile_pass("broken", log=lambda _line: None) as path:
+            raise RuntimeError("boom")
+    assert path.exists()
+
+
+def test_pipeline_profiles_every_pass(monkeypatch, tmp_path: Path, capsys):
+    _patch_network(monkeypatch)
+    monkeypatch.setenv("SPECTRE_PROFILE", "1")
+    monkeypatch.setenv("SPECTRE_PROFILE_DIR", str(tmp_path / "profiles"))
+
+    pipeline.run_pipeline(["BTCUSDT", "ETHUSDT"], 60, None, log=lambda *_: None)
+
+    passes = {p.name.split("-")[0] for p in (tmp_path / "profiles").glob("*.prof")}
+    assert passes == {"validate_examples", "build_facts_pack", "build_decision_packet", "build_execution_plan"}
+    assert "PROFILE build_execution_plan: " in capsys.readouterr().err
+
+
+def test_passes_on_other_threads_run_concurrently(monkeypatch, tmp_path: Path):
+    # Used to serialise on one global lock: a stage thread started inside a
+    # profiled pass blocked until the pass ended, and the pass waited on it.
+    monkeypatch.setenv("SPECTRE_PROFILE", "1")
+    monkeypatch.setenv("SPECTRE_PROFILE_DIR", str(tmp_path))
+    inside = threading.Barrier(2, timeout=10)
+
+    def stage(name):
+        with profile_pass(name, log=lambda _line: None) as path:
+            inside.wait()
+            _busy()
+        assert path is not None
+
+    with profile_pass("outer", log=lambda _line: None):
+        worker = threading.Thread(target=stage, args=("worker",))
+        worker.start()
+        inside.wait()
+        worker.join(timeout=10)
+    assert not worker.is_alive()
+    assert not tracemalloc.is_tracing()
+    reports = {p.name.split("-")[0] for p in tmp_path.glob("*.alloc.txt")}
+    assert reports == {"outer", "worker"}
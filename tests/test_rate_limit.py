@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import spectre.binance_public as bp
+import spectre.execution_plan as ep
+from spectre.fake_binance import FakeBinanceConfig, FakeBinanceServer
+from spectre.rate_limit import WeightLimiter, request_weight, set_shared_limiter
+from tests._helpers import minimal_decision, minimal_facts
+
+
+class FakeClock:
+    def __init__(self, t: float = 1_000.0):
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def test_request_weights():
+    assert request_weight("/api/v3/klines", {"limit": "99"}) == 1
+    assert request_weight("/api/v3/klines", {"limit": 365}) == 2
+    assert request_weight("/api/v3/klines", {"limit": "1000"}) == 5
+    assert request_weight("/api/v3/klines", {}) == 5
+    assert request_weight("/api/v3/exchangeInfo", {"symbols": '["BTCUSDT"]'}) == 20
+    assert request_weight("/api/v3/ticker/price", {"symbol": "BTCUSDT"}) == 2
+    assert request_weight("/api/v3/ticker/price") == 4
+    assert request_weight("/api/v3/ticker/24hr", {"symbols": '["A","B"]'}) == 2
+    assert request_weight("/api/v3/ticker/24hr") == 80
+
+
+def test_bucket_paces_after_burst():
+    clock = FakeClock()
+    limiter = WeightLimiter(limit=60, window_s=60.0, burst=6, clock=clock)
+    assert [limiter.reserve(1) for _ in range(6)] == [0.0] * 6
+    assert limiter.reserve(1) == pytest.approx(1.0)
+    assert limiter.reserve(1) == pytest.approx(2.0)
+    clock.t += 2.0
+    assert limiter.reserve(1) == pytest.approx(1.0)
+
+
+def test_window_budget_is_never_exceeded():
+    clock = FakeClock(30.0)  # halfway through window 0
+    limiter = WeightLimiter(limit=10, window_s=60.0, burst=10, clock=clock)
+    assert limiter.reserve(10) == 0.0
+    # The bucket would allow this after 6s, but the minute is spent: wait for the next one.
+    assert limiter.reserve(1) == pytest.approx(30.0)
+
+
+def test_used_weight_header_and_retry_after_correct_the_estimate():
+    clock = FakeClock(0.0)
+    limiter = WeightLimiter(limit=10, window_s=60.0, burst=10, clock=clock)
+    limiter.update(200, {"X-MBX-USED-WEIGHT-1M": "9"})  # another process on the same IP
+    assert limiter.used() == 9
+    assert limiter.reserve(2) == pytest.approx(60.0)
+
+    clock.t = 120.0
+    limiter.update(429, {"Retry-After": "7"})
+    assert limiter.reserve(1) == pytest.approx(7.0)
+
+
+def test_threads_and_tasks_share_one_budget():
+    limiter = WeightLimiter(limit=100, window_s=1.0, burst=20)
+    threads = [threading.Thread(target=limiter.acquire, args=(5,)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    async def run_tasks():
+        await asyncio.gather(*(limiter.acquire_async(10) for _ in range(3)))
+
+    start = time.perf_counter()
+    asyncio.run(run_tasks())
+    # The burst went to the threads, so the tasks are paced at 100 weight/s.
+    assert time.perf_counter() - start >= 0.25
+
+
+def test_fetches_stay_under_the_server_limit(monkeypatch):
+    # The server allows 40 per 1s window; the client budgets 30, leaving headroom.
+    set_shared_limiter(WeightLimiter(limit=30, window_s=1.0))
+    server = FakeBinanceServer(FakeBinanceConfig(weight_limit=40, window_s=1.0)).start()
+    monkeypatch.setenv("SPECTRE_BINANCE_BASE_URL", server.base_url)
+    try:
+        start = time.perf_counter()
+        for i in range(75):
+            assert len(bp.fetch_candle_series(f"S{i}USDT", 30)) == 30
+        elapsed = time.perf_counter() - start
+    finally:
+        server.stop()
+        set_shared_limiter(None, from_env=True)
+    assert server.stats["status"] == {200: 75}
+    assert elapsed >= 1.0
+
+
+def test_429_is_retried_after_retry_after(monkeypatch):
+    # Client budget far above the server's: the server's 429 and Retry-After do the pacing.
+    set_shared_limiter(WeightLimiter(limit=10_000, window_s=1.0))
+    server = FakeBinanceServer(FakeBinanceConfig(weight_limit=20, window_s=1.0)).start()
+    monkeypatch.setenv("SPECTRE_BINANCE_BASE_URL", server.base_url)
+    try:
+        rules = [bp.fetch_exchange_info(["BTCUSDT"]) for _ in range(3)]
+    finally:
+        server.stop()
+        set_shared_limiter(None, from_env=True)
+    assert all(r["BTCUSDT"]["min_notional"] == 5.0 for r in rules)
+    assert server.stats["status"][200] == 3
+    assert server.stats["status"].get(429, 0) >= 1
+
+
+def test_plan_pricing_retries_429(monkeypatch):
+    # Two full ticker snapshots (weight 4 each) do not fit a 6-weight window: the second is retried.
+    set_shared_limiter(WeightLimiter(limit=10_000, window_s=1.0))
+    server = FakeBinanceServer(FakeBinanceConfig(weight_limit=6, window_s=1.0)).start()
+    monkeypatch.setenv("SPECTRE_BINANCE_BASE_URL", server.base_url)
+    rule = {"step_size": 1e-5, "min_qty": 1e-5, "min_notional": 5.0, "base_asset": "BTC", "quote_asset": "USDT"}
+    monkeypatch.setattr(ep, "fetch_exchange_info", lambda symbols: {s: rule for s in symbols})
+    decision = minimal_decision(allowed_symbols=["BTCUSDT"])
+    try:
+        plans = [ep.build_execution_plan(minimal_facts(["BTCUSDT"]), decision, "f.json", "d.json") for _ in range(2)]
+    finally:
+        server.stop()
+        set_shared_limiter(None, from_env=True)
+    assert all(p["pricing"]["prices"]["BTCUSDT"] > 0 for p in plans)
+    assert server.stats["status"][200] == 2
+    assert server.stats["status"].get(429, 0) >= 1
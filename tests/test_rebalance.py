@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import pytest
+
+import spectre.execution_plan as ep
+from spectre.rebalance import rebalance_deltas, rebalance_symbols
+from spectre.schema_registry import validate_execution_plan
+from spectre.simulator_stub import simulate_execution_plan
+from tests._helpers import minimal_decision, minimal_facts
+from tests.test_execution_plan_invariants import _patch_prices_ok, _patch_rules_ok
+
+PRICES = {"BTCUSDT": 90000.0, "ETHUSDT": 3000.0}
+
+
+def _plan(monkeypatch, balances, **kwargs):
+    _patch_prices_ok(monkeypatch)
+    _patch_rules_ok(monkeypatch)
+    monkeypatch.setenv("SPECTRE_BUDGET_QUOTE", "100")
+    plan = ep.build_execution_plan(
+        minimal_facts(), minimal_decision(**kwargs), "facts.json", "decision.json",
+        portfolio_state={"balances": balances}, portfolio_state_path="state.json",
+    )
+    validate_execution_plan(plan)
+    return plan
+
+
+def test_rebalance_symbols_include_held_non_targets():
+    balances = {"USDT": 10.0, "ETH": 0.5, "SOL": 0.0, "ADA": 3.0}
+    assert rebalance_symbols(["BTCUSDT"], balances, "USDT") == ["BTCUSDT", "ADAUSDT", "ETHUSDT"]
+
+
+def test_deltas_suppress_small_trades():
+    deltas, current, suppressed = rebalance_deltas(
+        ["BTCUSDT", "ETHUSDT"], {"BTCUSDT": 50.0, "ETHUSDT": 50.0},
+        {"BTC": 0.0005, "ETH": 0.0}, PRICES, {}, "USDT", 100.0, 5.0, turnover_threshold=0.1,
+    )
+    assert current == {"BTCUSDT": 45.0, "ETHUSDT": 0.0}
+    assert deltas == {"ETHUSDT": ("BUY", 50.0)}
+    assert suppressed == [{"symbol": "BTCUSDT", "delta_quote": 5.0, "reason": "BELOW_TURNOVER_THRESHOLD"}]
+
+
+def test_fresh_portfolio_buys_full_target(monkeypatch):
+    plan = _plan(monkeypatch, {"USDT": 100.0})
+    assert plan["plan"]["action"] == "rebalance"
+    assert [(o["symbol"], o["side"], o["notional_quote"]) for o in plan["plan"]["orders"]] == [
+        ("BTCUSDT", "BUY", 50.0),
+        ("ETHUSDT", "BUY", 50.0),
+    ]
+    assert plan["inputs"]["portfolio_state_path"] == "state.json"
+
+
+def test_rerun_against_resulting_holdings_is_a_no_op(monkeypatch):
+    first = _plan(monkeypatch, {"USDT": 100.0})
+    report = simulate_execution_plan(first, {"balances": {"USDT": 100.0}})
+    assert report["action"] == "rebalance"
+
+    second = _plan(monkeypatch, report["resulting_balances"])
+    assert second["plan"] == {"action": "no_action", "orders": []}
+    assert second["refusals"] == []
+    assert {s["symbol"] for s in second["rebalance"]["suppressed"]} <= {"BTCUSDT", "ETHUSDT"}
+
+
+def test_dropped_symbol_is_sold_and_proceeds_fund_buys(monkeypatch):
+    # ETH is no longer allowed: sell all of it, buy BTC up to the full budget.
+    balances = {"USDT": 0.0, "ETH": 0.03}
+    plan = _plan(monkeypatch, balances, allowed_symbols=["BTCUSDT"])
+    orders = {o["symbol"]: o for o in plan["plan"]["orders"]}
+    assert orders["ETHUSDT"]["side"] == "SELL"
+    assert orders["ETHUSDT"]["quantity_base"] == pytest.approx(0.03)
+    assert orders["BTCUSDT"]["side"] == "BUY"
+    assert plan["rebalance"]["target_notional"] == {"BTCUSDT": 100.0, "ETHUSDT": 0.0}
+
+    # The BUY costs more than the sale raises, so all-or-nothing aborts; with enough quote it fills.
+    assert simulate_execution_plan(plan, {"balances": balances})["action"] == "no_action"
+    report = simulate_execution_plan(plan, {"balances": dict(balances, USDT=20.0)})
+    assert report["action"] == "rebalance"
+    assert [o["side"] for o in report["accepted_orders"]] == ["SELL", "BUY"]
+    assert report["resulting_balances"]["ETH"] == pytest.approx(0.0)
+
+
+def test_simulator_rejects_oversized_sell():
+    plan = {
+        "plan": {
+            "action": "rebalance",
+            "orders": [{"symbol": "ETHUSDT", "side": "SELL", "notional_quote": 30.0, "price_used": 3000.0, "quantity_base": 0.01}],
+        },
+    }
+    report = simulate_execution_plan(plan, {"balances": {"USDT": 0.0, "ETH": 0.005}})
+    assert report["action"] == "no_action"
+    assert report["rejected_orders"][0]["reason"] == "INSUFFICIENT_BALANCE"
+
+    report = simulate_execution_plan(plan, {"balances": {"USDT": 0.0, "ETH": 0.02}})
+    assert report["resulting_balances"] == {"USDT": pytest.approx(30.0), "ETH": pytest.approx(0.01)}
+
+
+def test_floored_sell_is_credited_at_its_quantity():
+    # The SELL's step-rounded quantity raises 49.5, not its 50 notional: the BUY cannot be funded.
+    plan = {"plan": {"action": "rebalance", "orders": [
+        {"symbol": "BTCUSDT", "side": "SELL", "notional_quote": 50.0, "quantity_base": 0.00099, "price_used": 50000.0},
+        {"symbol": "ETHUSDT", "side": "BUY", "notional_quote": 50.0, "price_used": 2500.0},
+    ]}}
+    state = {"balances": {"USDT": 0.0, "BTC": 0.001}}
+    report = simulate_execution_plan(plan, state)
+    assert report["action"] == "no_action" and report["accepted_orders"] == []
+    assert report["rejected_orders"][-1] == {"symbol": "*", "reason": "ALL_OR_NOTHING_ABORT"}
+    assert report["resulting_balances"] == {"USDT": 0.0, "BTC": 0.001}
+    assert report["resulting_balances"] is not state["balances"]
+
+    funded = simulate_execution_plan(plan, {"balances": {"USDT": 0.5, "BTC": 0.001}})
+    assert funded["action"] == "rebalance"
+    assert funded["resulting_balances"]["USDT"] == pytest.approx(0.0)
+    assert funded["resulting_balances"]["ETH"] == pytest.approx(0.02)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+
+import pytest
+
+import spectre.binance_public as bp
+from spectre.compute import compute_realised_vol_annualised
+from spectre.resample import DAY_MS, HOUR_MS, bucket_start, can_resample, resample_klines
+from tests._helpers import FakeResponse
+
+
+def _hourly_rows(start_ms, n):
+    # [open_ms, o, h, l, c, v] with string prices, as Binance returns them.
+    return [
+        [start_ms + i * HOUR_MS, str(100 + i), str(101 + i), str(99 + i), str(100.5 + i), "2"]
+        for i in range(n)
+    ]
+
+
+def test_weekly_buckets_open_on_monday():
+    thursday = int(datetime(2024, 1, 4, 15, tzinfo=timezone.utc).timestamp() * 1000)
+    monday = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+    assert bucket_start(thursday, "1w") == monday
+    assert bucket_start(thursday, "1d") == thursday - 15 * HOUR_MS
+
+
+def test_resample_hourly_to_4h_drops_partial_leading_bucket():
+    # Starts at 02:00, so the first 4h bucket only has two bars; the last one has one.
+    rows = _hourly_rows(2 * HOUR_MS, 11)
+    out = resample_klines(rows, "1h", "4h")
+
+    assert [r[0] for r in out] == [4 * HOUR_MS, 8 * HOUR_MS, 12 * HOUR_MS]
+    first = out[0]  # bars 2..5 (hours 4-7)
+    assert first[1:] == [102.0, 106.0, 101.0, 105.5, 8.0]
+    assert out[-1][5] == 2.0  # in-progress bucket kept
+
+
+def test_can_resample_rules():
+    assert can_resample("1m", "4h")
+    assert can_resample("1h", "1d")
+    assert not can_resample("1d", "1h")
+    assert not can_resample("3d", "1w")
+
+
+def test_one_fetch_builds_several_intervals(monkeypatch):
+    now = 30 * DAY_MS
+    calls = []
+
+    def fake_get(url, params=None, timeout=10):
+        calls.append(params)
+        end = params.get("endTime", now)
+        rows = [r for r in _hourly_rows(0, now // HOUR_MS) if r[0] <= end]
+        return FakeResponse(rows[-params["limit"]:])
+
+    monkeypatch.setattr(bp.requests, "get", fake_get)
+    out = bp.fetch_candles_by_interval("BTCUSDT", ["4h", "1d"], 10, "1h")
+
+    assert len(out["1d"]) == 10
+    assert len(out["4h"]) == 60
+    assert {p["interval"] for p in calls} == {"1h"}
+    assert out["1d"][-1]["t"] == "1970-01-30T00:00:00Z"
+    assert out["1d"][-1]["v"] == 48.0
+
+
+def test_vol_annualisation_scales_with_interval():
+    candles = [{"c": 100 * math.exp(0.01 * ((-1) ** i))} for i in range(40)]
+    daily = compute_realised_vol_annualised(candles, "1d")
+    hourly = compute_realised_vol_annualised(candles, "1h")
+    assert hourly == pytest.approx(daily * math.sqrt(24))
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import jsonschema
+import pytest
+
+from spectre import schema_registry as reg
+from spectre.execution_plan import SCHEMA_VERSION
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+
+
+def _example(name: str):
+    return json.loads((EXAMPLES / name).read_text(encoding="utf-8"))
+
+
+def test_validator_is_compiled_once():
+    assert reg.get_validator(reg.FACTS_PACK) is reg.get_validator(reg.FACTS_PACK)
+    assert reg.get_schema(reg.DECISION_PACKET) is reg.get_schema(reg.DECISION_PACKET)
+
+
+def test_examples_validate_through_registry():
+    reg.validate_facts_pack(_example("facts_pack.valid.json"))
+    reg.validate_decision_packet(_example("decision_packet.valid.json"))
+    with pytest.raises(jsonschema.ValidationError):
+        reg.validate_facts_pack(_example("facts_pack.invalid.json"))
+    with pytest.raises(jsonschema.ValidationError):
+        reg.validate_decision_packet(_example("decision_packet.invalid.json"))
+
+
+def test_execution_plan_validator_rejects_wrong_version():
+    with pytest.raises(jsonschema.ValidationError):
+        reg.validate_execution_plan({"schema_version": "0.0"})
+
+
+def test_packaged_execution_plan_schema_matches_registry_copy():
+    packaged = Path(reg.__file__).resolve().parent / "schemas"
+    for name in (reg.EXECUTION_PLAN, reg.TELEMETRY):
+        assert json.loads((packaged / f"{name}.schema.json").read_text(encoding="utf-8")) == reg.get_schema(name)
+    version = reg.get_schema(reg.EXECUTION_PLAN)["properties"]["schema_version"]["const"]
+    assert version == SCHEMA_VERSION
+
+
+def test_telemetry_is_one_shared_definition():
+    telemetry = {"wall_s": 1.0, "cpu_s": 0.5, "peak_rss_bytes": None, "requests": 2, "bytes_downloaded": 10,
+                 "spans": {"json.write": {"count": 1, "wall_s": 0.1, "cpu_s": 0.1, "requests": 0, "bytes": 0}}}
+    docs = {reg.FACTS_PACK: _example("facts_pack.valid.json"), reg.DECISION_PACKET: _example("decision_packet.valid.json")}
+    for name, doc in docs.items():
+        assert reg.get_schema(name)["properties"]["telemetry"] == {"$ref": "telemetry.schema.json"}
+        reg.validate(name, {**doc, "telemetry": telemetry})
+        with pytest.raises(jsonschema.ValidationError, match="requests"):
+            reg.validate(name, {**doc, "telemetry": {**telemetry, "requests": -1}})
+    assert reg.get_schema(reg.EXECUTION_PLAN)["properties"]["telemetry"] == {"$ref": "telemetry.schema.json"}
+
+
+def _pack_with_candles(n: int = 5):
+    pack = _example("facts_pack.valid.json")
+    pack["market_data"]["candles"] = {
+        "BTC-USD": [
+            {"t": f"2026-01-{d:02d}T00:00:00Z", "o": 1.0, "h": 2.0, "l": 0.5, "c": 1.5, "v": 10.0}
+            for d in range(1, n + 1)
+        ]
+    }
+    return pack
+
+
+@pytest.mark.parametrize("mode", [reg.VALIDATION_STRUCTURAL, reg.VALIDATION_SAMPLE])
+def test_tiered_modes_accept_valid_pack_and_still_check_header(mode):
+    reg.validate_facts_pack(_pack_with_candles(), mode=mode)
+
+    bad = _pack_with_candles()
+    bad["computed"]["realised_vol_annualised"]["BTC-USD"] = -1.0
+    with pytest.raises(jsonschema.ValidationError):
+        reg.validate_facts_pack(bad, mode=mode)
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda rows: rows[2].update(c=float("nan")),
+        lambda rows: rows[3].update(t=rows[1]["t"]),
+        lambda rows: rows[0].pop("v"),
+        lambda rows: rows[4].update(v=-1.0),
+        lambda rows: rows[1].update(o="1.0"),
+    ],
+)
+def test_structural_mode_rejects_bad_candles(mutate):
+    pack = _pack_with_candles()
+    mutate(pack["market_data"]["candles"]["BTC-USD"])
+    with pytest.raises(jsonschema.ValidationError):
+        reg.validate_facts_pack(pack, mode=reg.VALIDATION_STRUCTURAL)
+
+
+def test_sample_mode_checks_sampled_candles_against_schema():
+    pack = _pack_with_candles(5)
+    pack["market_data"]["candles"]["BTC-USD"][2]["v"] = -1.0
+    # Sample covers every row when the array is smaller than the sample size.
+    with pytest.raises(jsonschema.ValidationError):
+        reg.validate_facts_pack(pack, mode=reg.VALIDATION_SAMPLE, sample_size=10)
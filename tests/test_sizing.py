@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+import spectre.execution_plan as ep
+from spectre.sizing import allocate_notional, inverse_vol_weights, portfolio_vol, risk_parity_weights, target_weights
+from tests._helpers import minimal_decision, minimal_facts
+from tests.test_execution_plan_invariants import _patch_prices_ok, _patch_rules_ok
+
+
+def _facts(vols, matrix):
+    facts = minimal_facts(list(vols))
+    facts["computed"] = {
+        "realised_vol_annualised": dict(vols),
+        "correlation": {"symbols": list(vols), "matrix": matrix},
+    }
+    return facts
+
+
+def _risk_contributions(weights, cov):
+    return [w * sum(c * x for c, x in zip(row, weights)) for w, row in zip(weights, cov)]
+
+
+def test_inverse_vol_weights():
+    assert inverse_vol_weights([0.2, 0.4]) == pytest.approx([2 / 3, 1 / 3])
+
+
+def test_risk_parity_equalises_risk_contributions():
+    vols = [0.2, 0.5, 0.8, 0.3]
+    corr = [
+        [1.0, 0.7, 0.2, 0.1],
+        [0.7, 1.0, 0.4, 0.0],
+        [0.2, 0.4, 1.0, -0.3],
+        [0.1, 0.0, -0.3, 1.0],
+    ]
+    cov = [[vols[i] * vols[j] * corr[i][j] for j in range(4)] for i in range(4)]
+    weights = risk_parity_weights(cov)
+    assert sum(weights) == pytest.approx(1.0)
+    rc = _risk_contributions(weights, cov)
+    assert rc == pytest.approx([rc[0]] * 4)
+
+
+def test_risk_parity_is_inverse_vol_when_uncorrelated():
+    vols = [0.2, 0.5, 0.8]
+    cov = [[v * v if i == j else 0.0 for j, _ in enumerate(vols)] for i, v in enumerate(vols)]
+    assert risk_parity_weights(cov) == pytest.approx(inverse_vol_weights(vols))
+
+
+def test_vol_target_caps_gross_exposure():
+    facts = _facts({"BTCUSDT": 0.6, "ETHUSDT": 0.9}, [[1.0, 0.8], [0.8, 1.0]])
+    weights, gross = target_weights(["BTCUSDT", "ETHUSDT"], facts, "risk_parity", 1.0, 0.25)
+    cov = [[0.36, 0.6 * 0.9 * 0.8], [0.6 * 0.9 * 0.8, 0.81]]
+    assert gross == pytest.approx(0.25 / portfolio_vol(weights, cov))
+    assert gross < 1.0
+
+    notional = allocate_notional(["BTCUSDT", "ETHUSDT"], facts, 1000.0, "inverse_vol", 0.5)
+    assert notional == {"BTCUSDT": 300.0, "ETHUSDT": 200.0}
+
+
+def test_plan_sizes_orders_by_inverse_vol(monkeypatch):
+    _patch_prices_ok(monkeypatch)
+    _patch_rules_ok(monkeypatch)
+    monkeypatch.setenv("SPECTRE_BUDGET_QUOTE", "100")
+    facts = _facts({"BTCUSDT": 0.4, "ETHUSDT": 0.8}, [[1.0, 0.5], [0.5, 1.0]])
+
+    plan = ep.build_execution_plan(facts, minimal_decision(), "facts.json", "decision.json", sizing="inverse_vol")
+
+    assert plan["plan"]["action"] == "rebalance"
+    notional = {o["symbol"]: o["notional_quote"] for o in plan["plan"]["orders"]}
+    assert notional == {"BTCUSDT": pytest.approx(66.67), "ETHUSDT": pytest.approx(33.33)}
+    btc = next(o for o in plan["plan"]["orders"] if o["symbol"] == "BTCUSDT")
+    # Step-size rounding still applies: quantity is rounded down to 1e-5 BTC.
+    assert btc["quantity_base"] == pytest.approx(math.floor(66.67 / 90000.0 / 1e-5) * 1e-5)
+
+
+def test_plan_refuses_risk_sizing_without_vols(monkeypatch):
+    _patch_prices_ok(monkeypatch)
+    _patch_rules_ok(monkeypatch)
+    monkeypatch.setenv("SPECTRE_SIZING", "risk_parity")
+
+    plan = ep.build_execution_plan(minimal_facts(), minimal_decision(), "facts.json", "decision.json")
+
+    assert plan["plan"] == {"action": "no_action", "orders": []}
+    assert plan["refusals"][0]["code"] == "NO_VOLATILITY"
+
+
+def test_plan_refuses_unknown_sizing_mode(monkeypatch):
+    _patch_prices_ok(monkeypatch)
+    _patch_rules_ok(monkeypatch)
+    monkeypatch.setenv("SPECTRE_SIZING", "kelly")
+
+    plan = ep.build_execution_plan(minimal_facts(), minimal_decision(), "facts.json", "decision.json")
+
+    assert plan["plan"]["action"] == "no_action"
+    assert plan["refusals"][0]["code"] == "BAD_SIZING_MODE"
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+import math
+import random
+
+import pytest
+
+import spectre.pipeline as pipeline
+from spectre.candles import CandleSeries
+from spectre.compute import ATR_PERIOD, InsufficientDataError, compute_symbol_stats
+from tests.test_pipeline import _patch_network
+
+DAY_MS = 86_400_000
+
+
+def _series(n=120, seed=3):
+    rng = random.Random(seed)
+    closes, price = [], 50.0
+    for _ in range(n):
+        price *= math.exp(rng.gauss(0, 0.03))
+        closes.append(price)
+    opens = [closes[0]] + closes[:-1]
+    highs = [max(o, c) * (1 + rng.random() * 0.02) for o, c in zip(opens, closes)]
+    lows = [min(o, c) * (1 - rng.random() * 0.02) for o, c in zip(opens, closes)]
+    volumes = [100 + rng.random() * 900 for _ in range(n)]
+    return CandleSeries([i * DAY_MS for i in range(n)], opens, highs, lows, closes, volumes)
+
+
+def _reference(s: CandleSeries):
+    c, h, l, v = list(s.c), list(s.h), list(s.l), list(s.v)
+    tr = [max(h[i] - l[i], abs(h[i] - c[i - 1]), abs(l[i] - c[i - 1])) for i in range(1, len(c))]
+    atr = sum(tr[:ATR_PERIOD]) / ATR_PERIOD
+    for x in tr[ATR_PERIOD:]:
+        atr = (atr * (ATR_PERIOD - 1) + x) / ATR_PERIOD
+    drawdown = max(1 - c[i] / max(c[: i + 1]) for i in range(len(c)))
+    returns = [math.log(b / a) for a, b in zip(c, c[1:])]
+    downside = math.sqrt(sum(min(r, 0.0) ** 2 for r in returns) / len(returns) * 365)
+    return atr, drawdown, downside, sum(x * y for x, y in zip(c, v)) / len(c)
+
+
+def test_kernel_matches_reference_formulas():
+    series = _series()
+    stats = compute_symbol_stats(series)
+    atr, drawdown, downside, dollar_volume = _reference(series)
+    assert stats["atr"] == pytest.approx(atr)
+    assert stats["atr_pct"] == pytest.approx(atr / series.c[-1])
+    assert stats["max_drawdown"] == pytest.approx(drawdown)
+    assert stats["downside_vol_annualised"] == pytest.approx(downside)
+    assert stats["avg_dollar_volume"] == pytest.approx(dollar_volume)
+    assert stats["momentum"] == pytest.approx({
+        "7": series.c[-1] / series.c[-8] - 1, "30": series.c[-1] / series.c[-31] - 1, "90": series.c[-1] / series.c[-91] - 1,
+    })
+    assert compute_symbol_stats(series.to_candles()) == stats
+
+
+def test_short_series_leave_undefined_stats_empty():
+    series = _series(10)
+    stats = compute_symbol_stats(series, "4h")
+    assert stats["atr"] is None and stats["atr_pct"] is None
+    assert stats["momentum"] == {"7": pytest.approx(series.c[-1] / series.c[-8] - 1), "30": None, "90": None}
+    # Six 4h bars a day: the same returns annualise 6x the variance of daily bars.
+    assert stats["downside_vol_annualised"] == pytest.approx(compute_symbol_stats(series)["downside_vol_annualised"] * math.sqrt(6))
+    with pytest.raises(InsufficientDataError):
+        compute_symbol_stats(series.tail(1))
+
+
+def test_monotonic_rise_has_no_drawdown():
+    closes = [100.0 + i for i in range(40)]
+    series = CandleSeries(range(40), closes, closes, closes, closes, [1.0] * 40)
+    stats = compute_symbol_stats(series)
+    assert stats["max_drawdown"] == 0.0 and stats["downside_vol_annualised"] == 0.0
+
+
+def test_facts_pack_carries_symbol_stats(monkeypatch, tmp_path):
+    _patch_network(monkeypatch)
+    facts, _ = pipeline.build_facts(["BTCUSDT", "ETHUSDT"], 60)
+    section = facts["computed"]["symbol_stats"]
+    assert section["atr_period"] == ATR_PERIOD and section["momentum_horizons"] == [7, 30, 90]
+    assert list(section["symbols"]) == ["BTCUSDT", "ETHUSDT"]
+    assert section["symbols"]["BTCUSDT"]["momentum"]["90"] is None  # 60 bars
+
+    out = tmp_path / "facts.json"
+    pipeline.stream_facts(["BTCUSDT", "ETHUSDT"], 60, out)
+    assert json.loads(out.read_text(encoding="utf-8"))["computed"]["symbol_stats"] == section
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import spectre.binance_public as bp
+import spectre.pipeline as pipeline
+from spectre import telemetry
+from spectre.schema_registry import validate_decision_packet, validate_execution_plan, validate_facts_pack
+from tests._helpers import FakeResponse
+from tests.test_candles import _daily_rows
+from tests.test_pipeline import _patch_network
+
+
+def test_span_is_a_no_op_outside_collect():
+    with telemetry.span("anything") as s:
+        s.add_request(100)
+    with telemetry.collect(enabled=False) as profile:
+        assert profile is None
+        assert telemetry.span("x") is telemetry.span("y")
+
+
+def test_spans_accumulate_requests_and_bytes():
+    with telemetry.collect() as profile:
+        for nbytes in (10, 20):
+            with telemetry.span("http.test") as s:
+                s.add_request(nbytes)
+        with telemetry.span("compute.test"):
+            sum(range(1000))
+    summary = profile.summary()
+    assert summary["requests"] == 2
+    assert summary["bytes_downloaded"] == 30
+    assert summary["spans"]["http.test"] == {
+        "count": 2, "wall_s": summary["spans"]["http.test"]["wall_s"],
+        "cpu_s": summary["spans"]["http.test"]["cpu_s"], "requests": 2, "bytes": 30,
+    }
+    assert summary["spans"]["compute.test"]["count"] == 1
+    assert summary["wall_s"] >= summary["spans"]["compute.test"]["wall_s"]
+    assert telemetry.format_summary(summary)[0].startswith("Telemetry: wall ")
+
+
+def test_binance_requests_are_counted_per_endpoint(monkeypatch):
+    rows = _daily_rows(1500)
+
+    def fake_get(url, params=None, timeout=10):
+        page = [r for r in rows if r[0] <= params.get("endTime", rows[-1][0])][-params["limit"]:]
+        response = FakeResponse(page)
+        response.content = json.dumps(page).encode()
+        return response
+
+    monkeypatch.setattr(bp.requests, "get", fake_get)
+    with telemetry.collect() as profile:
+        bp.fetch_candle_series("BTCUSDT", 1200)
+    span = profile.summary()["spans"]["http.binance.klines"]
+    assert span["requests"] == 2
+    assert span["bytes"] > 0
+
+
+def test_pipeline_profile_adds_valid_telemetry_sections(monkeypatch, tmp_path: Path):
+    _patch_network(monkeypatch)
+    with telemetry.collect() as profile:
+        artifacts = pipeline.run_pipeline(["BTCUSDT", "ETHUSDT"], 60, tmp_path, log=lambda *_: None, profile=profile)
+
+    facts = artifacts[pipeline.FACTS_PACK_FILE]
+    validate_facts_pack(facts)
+    validate_decision_packet(artifacts[pipeline.DECISION_PACKET_FILE])
+    validate_execution_plan(artifacts[pipeline.EXECUTION_PLAN_FILE])
+    spans = facts["telemetry"]["spans"]
+    assert {"compute.realised_vol", "compute.correlation", "schema.facts_pack"} <= set(spans)
+    assert spans["compute.realised_vol"]["count"] == 2
+    assert "telemetry" in json.loads((tmp_path / pipeline.EXECUTION_PLAN_FILE).read_text())
+
+
+def test_stream_facts_writes_telemetry_footer(monkeypatch, tmp_path: Path):
+    _patch_network(monkeypatch)
+    out = tmp_path / "facts.json"
+    with telemetry.collect() as profile:
+        pipeline.stream_facts(["BTCUSDT", "ETHUSDT"], 60, out, profile=profile)
+    facts = json.loads(out.read_text())
+    validate_facts_pack(facts)
+    assert facts["telemetry"]["spans"]["compute.correlation"]["count"] == 1
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import spectre.binance_public as bp
+import spectre.pipeline as pipeline
+from spectre.artifact_io import write_json
+from spectre.universe import UniverseCriteria, build_universe, load_symbols_file, screen_universe
+from tests._helpers import FakeResponse
+from tests.test_pipeline import _patch_network
+
+
+def _entry(symbol, quote="USDT", status="TRADING", permissions=("SPOT",)):
+    return {"symbol": symbol, "baseAsset": symbol[: -len(quote)], "quoteAsset": quote, "status": status,
+            "isSpotTradingAllowed": True, "permissions": list(permissions)}
+
+
+def _ticker(symbol, quote_volume, count=1000, bid="99.9", ask="100.1"):
+    return {"symbol": symbol, "quoteVolume": str(quote_volume), "count": count, "lastPrice": "100",
+            "bidPrice": bid, "askPrice": ask}
+
+
+EXCHANGE = [
+    _entry("BTCUSDT"),
+    _entry("ETHUSDT"),
+    _entry("SOLUSDT"),
+    _entry("DOGEUSDT"),
+    _entry("ETHBTC", quote="BTC"),
+    _entry("LUNAUSDT", status="BREAK"),
+    _entry("BTCUPUSDT", permissions=("SPOT", "LEVERAGED")),
+]
+TICKERS = [
+    _ticker("BTCUSDT", 9e9),
+    _ticker("ETHUSDT", 5e9),
+    _ticker("SOLUSDT", 5e9, ask="101"),
+    _ticker("DOGEUSDT", 1e6),
+    _ticker("ETHBTC", 9e9),
+    _ticker("LUNAUSDT", 9e9),
+    _ticker("BTCUPUSDT", 9e9),
+]
+
+
+def test_screen_filters_and_ranks_by_quote_volume():
+    rows, counts = screen_universe(EXCHANGE, TICKERS)
+
+    assert [(r["rank"], r["symbol"]) for r in rows] == [(1, "BTCUSDT"), (2, "ETHUSDT"), (3, "SOLUSDT")]
+    assert counts == {"exchange": 7, "listed": 4, "liquid": 3, "selected": 3}
+    assert rows[0]["spread_bps"] == pytest.approx(20.0)
+
+
+def test_screen_applies_spread_and_top_n():
+    rows, counts = screen_universe(EXCHANGE, TICKERS, UniverseCriteria(max_spread_bps=50, top_n=1))
+    assert [r["symbol"] for r in rows] == ["BTCUSDT"]
+    assert counts["liquid"] == 2
+
+
+def test_build_universe_uses_two_bulk_calls(monkeypatch):
+    calls = []
+
+    def fake_get(url, params=None, timeout=10):
+        calls.append((url, params))
+        if url == bp.BINANCE_EXCHANGE_INFO_API:
+            return FakeResponse({"symbols": EXCHANGE})
+        return FakeResponse(TICKERS)
+
+    monkeypatch.setattr(bp.requests, "get", fake_get)
+    universe = build_universe()
+
+    assert calls == [(bp.BINANCE_EXCHANGE_INFO_API, None), (bp.BINANCE_TICKER_24HR_API, None)]
+    assert [r["symbol"] for r in universe["symbols"]] == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+
+
+def test_symbols_file_feeds_pipeline(monkeypatch, tmp_path: Path):
+    _patch_network(monkeypatch)
+    rows, counts = screen_universe(EXCHANGE, TICKERS, UniverseCriteria(top_n=2))
+    universe_path = tmp_path / "universe.json"
+    write_json(universe_path, {"symbols": rows, "counts": counts})
+    text_path = tmp_path / "symbols.txt"
+    text_path.write_text("# majors\nBTCUSDT, ETHUSDT\n", encoding="utf-8")
+
+    assert load_symbols_file(str(universe_path)) == ["BTCUSDT", "ETHUSDT"]
+    assert load_symbols_file(str(text_path)) == ["BTCUSDT", "ETHUSDT"]
+
+    rc = pipeline.main(["--symbols-file", str(universe_path), "--lookback-days", "60", "--no-write", "--no-cache"])
+    assert rc == 0
+
+
+@pytest.mark.parametrize("value", ["0", "-3"])
+def test_screen_top_must_be_positive(value, capsys):
+    with pytest.raises(SystemExit) as exc:
+        pipeline.main(["--screen-top", value, "--no-write", "--no-cache"])
+    assert exc.value.code == 2
+    assert "--screen-top" in capsys.readouterr().err
+
+
+def test_facts_script_reports_unreadable_symbols_file(tmp_path: Path):
+    root = Path(__file__).resolve().parents[1]
+    env = {**os.environ, "PYTHONPATH": str(root / "src")}
+    result = subprocess.run(
+        [sys.executable, str(root / "scripts" / "build_facts_pack.py"), "--symbols-file", str(tmp_path / "missing.json"),
+         "--lookback-days", "60", "--out", str(tmp_path / "facts.json")],
+        capture_output=True, text=True, env=env,
+    )
+    assert result.returncode == 1
+    assert result.stdout.startswith("ERROR: Failed to read symbols file:")
+    assert "Traceback" not in result.stderr
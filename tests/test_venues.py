@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import spectre.binance_public as bp
+import spectre.execution_plan as ep
+import spectre.pipeline as pipeline
+from spectre.candle_store import CandleStore
+from spectre.candles import CandleSeries
+from spectre.fake_binance import FakeBinanceConfig, FakeBinanceServer
+from spectre.rate_limit import set_shared_limiter
+from spectre.schema_registry import validate_execution_plan
+from tests._helpers import minimal_decision, minimal_facts
+from spectre.venues import BinanceVenue, FileVenue, VenueAdapter, fetch_from_venues, venue_from_spec, venues_from_specs
+
+DAY_MS = 86_400_000
+START_MS = 1_735_689_600_000  # 2025-01-01T00:00:00Z
+
+
+def _klines(n, scale=1.0, start_ms=START_MS):
+    return [
+        [start_ms + i * DAY_MS, 100.0 * scale, 102.0 * scale, 99.0 * scale, (100.0 + (i % 7)) * scale, 10.0]
+        for i in range(n)
+    ]
+
+
+def _file_venue(root: Path, symbols, n=60, scale=1.0, **files):
+    store = CandleStore(root)
+    for symbol in symbols:
+        store.write_month(symbol, "1d", "2025-01", _klines(n, scale))
+    for name, doc in files.items():
+        (root / f"{name}.json").write_text(json.dumps(doc), encoding="utf-8")
+    return FileVenue(root)
+
+
+def test_file_venue_serves_candles_rules_and_prices(tmp_path):
+    rule = {"step_size": 1e-5, "min_qty": 1e-5, "min_notional": 5.0, "base_asset": "BTC", "quote_asset": "USDT"}
+    venue = _file_venue(tmp_path / "archive", ["BTCUSDT"], rules={"BTCUSDT": rule}, prices={"BTCUSDT": 90000.0, "ETHUSDT": 0})
+    assert venue.name == "archive"
+
+    candles = venue.fetch_candles("BTCUSDT", 30)
+    assert isinstance(candles, CandleSeries)
+    assert len(candles) == 30 and candles.t[-1] == START_MS + 59 * DAY_MS
+    assert venue.fetch_rules(["BTCUSDT", "ETHUSDT"]) == {"BTCUSDT": rule}
+    assert venue.fetch_prices(["BTCUSDT", "ETHUSDT", "XRPUSDT"]) == {"BTCUSDT": 90000.0, "ETHUSDT": None, "XRPUSDT": None}
+    assert len(venue.fetch_candles("ETHUSDT", 30)) == 0
+
+
+def test_binance_venue_uses_the_public_api(monkeypatch):
+    set_shared_limiter(None, from_env=True)
+    server = FakeBinanceServer(FakeBinanceConfig(symbols=["BTCUSDT", "ETHUSDT"], now_ms=START_MS)).start()
+    monkeypatch.setenv("SPECTRE_BINANCE_BASE_URL", server.base_url)
+    try:
+        venue = BinanceVenue()
+        candles = venue.fetch_candles("BTCUSDT", 30)
+        rules = venue.fetch_rules(["BTCUSDT"])
+        prices = venue.fetch_prices(["BTCUSDT", "XRPUSDT"])
+    finally:
+        server.stop()
+        set_shared_limiter(None, from_env=True)
+    assert len(candles) == 30 and candles.t[-1] == START_MS
+    assert rules["BTCUSDT"]["base_asset"] == "BTC"
+    assert prices["BTCUSDT"] > 0 and prices["XRPUSDT"] is None
+    assert server.stats["requests"] == {"klines": 1, "exchangeInfo": 1, "ticker/price": 1}
+
+
+def test_venue_specs():
+    assert isinstance(venue_from_spec("binance"), BinanceVenue)
+    named = venue_from_spec("archive=file:data/candles")
+    assert isinstance(named, FileVenue) and named.name == "archive" and named.root == Path("data/candles")
+    assert venue_from_spec("file:data/candles").name == "candles"
+    for bad in ("kraken", "file:", "x=ftp://host"):
+        with pytest.raises(ValueError):
+            venue_from_spec(bad)
+    with pytest.raises(ValueError, match="Duplicate"):
+        venues_from_specs(["file:a/x", "file:b/x"])
+
+
+class SlowVenue(VenueAdapter):
+    source_name = "test"
+
+    def __init__(self, name, delay_s):
+        self.name = name
+        self.delay_s = delay_s
+        self.threads = set()
+
+    def fetch_candles(self, symbol, lookback_days, interval="1d", fetch_interval=None):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay_s)
+        if symbol == "MISSING":
+            raise LookupError("unknown symbol")
+        return CandleSeries.from_klines(_klines(lookback_days))
+
+    def fetch_rules(self, symbols):
+        return {}
+
+    def fetch_prices(self, symbols):
+        return dict.fromkeys(symbols)
+
+
+def test_adapters_must_implement_every_fetch():
+    class CandlesOnly(VenueAdapter):
+        def fetch_candles(self, symbol, lookback_days, interval="1d", fetch_interval=None):
+            return CandleSeries()
+
+    with pytest.raises(TypeError, match="fetch_prices, fetch_rules"):
+        CandlesOnly()
+
+
+def test_venues_are_fetched_concurrently():
+    venues = [SlowVenue("a", 0.1), SlowVenue("b", 0.1), SlowVenue("c", 0.1)]
+    start = time.perf_counter()
+    fetched = fetch_from_venues(venues, ["BTCUSDT", "MISSING"], 10)
+    elapsed = time.perf_counter() - start
+    # Three venues x two symbols x 0.1s run as three sequences of 0.2s.
+    assert elapsed < 0.45
+    assert len({t for v in venues for t in v.threads}) == 3
+    for name in ("a", "b", "c"):
+        candles, failures = fetched[name]
+        assert list(candles) == ["BTCUSDT"] and len(candles["BTCUSDT"]) == 10
+        assert failures == {"MISSING": "unknown symbol"}
+
+
+def _primary_candles(symbol, lookback_days, interval="1d", fetch_interval=None):
+    return CandleSeries.from_klines(_klines(90)).tail(lookback_days)
+
+
+def test_facts_pack_compares_venues(monkeypatch, tmp_path):
+    monkeypatch.setattr(bp, "fetch_candle_series", _primary_candles)
+    _file_venue(tmp_path / "cheap", ["BTCUSDT", "ETHUSDT"], n=90, scale=0.999)
+    _file_venue(tmp_path / "thin", ["BTCUSDT"], n=90)
+    options = pipeline.FactsOptions(compare_venues=(f"file:{tmp_path / 'cheap'}", f"file:{tmp_path / 'thin'}"))
+
+    facts, _ = pipeline.build_facts(["BTCUSDT", "ETHUSDT"], 60, options)
+
+    comparison = facts["computed"]["venue_comparison"]
+    assert set(comparison) == {"cheap", "thin"}
+    cheap = comparison["cheap"]
+    assert cheap["symbols"] == ["BTCUSDT", "ETHUSDT"]
+    assert cheap["last_close_diff_bps"]["BTCUSDT"] == pytest.approx(-10.0)
+    assert cheap["realised_vol_annualised"] == pytest.approx(facts["computed"]["realised_vol_annualised"])
+    assert comparison["thin"]["symbols"] == ["BTCUSDT"]
+    assert any("Venue thin: ETHUSDT not compared" in w for w in facts["warnings"])
+    notes = [s.get("note") for s in facts["provenance"]["sources"]]
+    assert notes[1:] == ["venue comparison: cheap", "venue comparison: thin"]
+
+    out = tmp_path / "facts.json"
+    pipeline.stream_facts(["BTCUSDT", "ETHUSDT"], 60, out, options)
+    streamed = json.loads(out.read_text(encoding="utf-8"))
+    assert streamed["computed"]["venue_comparison"] == comparison
+
+
+def test_bad_venue_spec_is_a_pipeline_error():
+    with pytest.raises(pipeline.PipelineError, match="Unknown venue"):
+        pipeline.FactsOptions(compare_venues=("kraken",)).venues()
+
+
+def test_venue_option_routes_candles_and_plan(monkeypatch, tmp_path):
+    def no_network(*args, **kwargs):
+        raise AssertionError("Binance must not be called with --venue file:DIR")
+
+    for name in ("fetch_candle_series", "fetch_exchange_info", "fetch_ticker_prices"):
+        monkeypatch.setattr(bp, name, no_network)
+    rules = {
+        s: {"step_size": 1e-5, "min_qty": 1e-5, "min_notional": 5.0, "base_asset": s[:-4], "quote_asset": "USDT"}
+        for s in ("BTCUSDT", "ETHUSDT")
+    }
+    root = tmp_path / "offline"
+    _file_venue(root, ["BTCUSDT", "ETHUSDT"], n=90, rules=rules, prices={"BTCUSDT": 90000.0, "ETHUSDT": 3000.0})
+    parser = argparse.ArgumentParser()
+    pipeline.add_facts_arguments(parser)
+    options = pipeline.facts_options_from_args(parser.parse_args(["--venue", f"file:{root}"]))
+    assert isinstance(options.primary_venue(), FileVenue) and options.venue == f"file:{root}"
+
+    artifacts = pipeline.run_pipeline(["BTCUSDT", "ETHUSDT"], 60, None, options=options, log=lambda *_: None)
+
+    facts = artifacts[pipeline.FACTS_PACK_FILE]
+    assert facts["provenance"]["sources"][0]["name"] == f"Local files {root}"
+    assert facts["provenance"]["sources"][0]["note"] == f"local candle store {root}"
+    plan = artifacts[pipeline.EXECUTION_PLAN_FILE]
+    assert plan["venue"] == "offline"
+    assert plan["pricing"]["source"] == plan["exchange_rules"]["source"] == f"file:{root}"
+    assert plan["pricing"]["prices"] == {"BTCUSDT": 90000.0, "ETHUSDT": 3000.0}
+    assert plan["exchange_rules"]["symbols"] == rules
+    with pytest.raises(pipeline.PipelineError, match="Unknown venue"):
+        pipeline.facts_options_from_args(parser.parse_args(["--venue", "kraken"]))
+
+
+def test_plan_built_on_a_file_venue_names_it(tmp_path):
+    rule = {"step_size": 1e-5, "min_qty": 1e-5, "min_notional": 5.0, "base_asset": "BTC", "quote_asset": "USDT"}
+    venue = _file_venue(tmp_path / "snapshot", ["BTCUSDT"], rules={"BTCUSDT": rule}, prices={"BTCUSDT": 50000.0})
+    decision = minimal_decision(allowed_symbols=["BTCUSDT"])
+    plan = ep.build_execution_plan(minimal_facts(["BTCUSDT"]), decision, "f.json", "d.json", venue=venue)
+    validate_execution_plan(plan)
+    assert plan["venue"] == "snapshot"
+    assert plan["plan"]["orders"][0]["price_used"] == 50000.0
+
+
+def test_changed_file_venue_invalidates_cached_facts(monkeypatch, tmp_path):
+    # The facts key used to cover only the venue spec and the UTC date, so rewriting
+    # the store's files kept serving the old facts for the rest of the day.
+    root = tmp_path / "offline"
+    _file_venue(root, ["BTCUSDT", "ETHUSDT"], n=90)
+    options = pipeline.FactsOptions(venue=f"file:{root}")
+    cache_dir = tmp_path / "cache"
+
+    def run():
+        logs = []
+        facts = pipeline.run_pipeline(
+            ["BTCUSDT", "ETHUSDT"], 60, None, cache_dir=cache_dir, options=options, log=logs.append
+        )[pipeline.FACTS_PACK_FILE]
+        return facts, "[build_facts_pack] cached" in " ".join(map(str, logs))
+
+    first, _ = run()
+    again, cached = run()
+    assert cached and again == first
+
+    month = CandleStore(root).write_month("BTCUSDT", "1d", "2025-01", _klines(90, scale=2.0))
+    stat = Path(month).stat()
+    os.utime(month, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    refreshed, cached = run()
+    assert not cached
+    assert refreshed["market_data"]["candles"]["BTCUSDT"] != first["market_data"]["candles"]["BTCUSDT"]